@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import TypeVar
+import bisect
+from typing import Callable, Sequence, TypeVar
 
 T = TypeVar("T")
 
@@ -15,23 +16,71 @@ def binary_search(l: list[T], item: T) -> int:
     Best Case Complexity: O(1), when middle index contains item.
     Worst Case Complexity: O(log(N)), where N is the length of l.
     """
-    return _binary_search_aux(l, item, 0, len(l))
-
-def _binary_search_aux(l: list[T], item: T, lo: int, hi: int) -> int:
-    """
-    Auxilliary method used by binary search.
-    lo: smallest index where the return value could be.
-    hi: largest index where the return value could be.
-    """
-    if lo == hi:
-        return lo
-    mid = (hi + lo) // 2
-    if l[mid] > item:
-        # Item would be before mid
-        return _binary_search_aux(l, item, lo, mid)
-    elif l[mid] < item:
-        # Item would be after mid
-        return _binary_search_aux(l, item, mid+1, hi)
-    elif l[mid] == item:
-        return mid
-    raise ValueError(f"Comparison operator poorly implemented {item} and {l[mid]} cannot be compared.")
+    lo, hi = 0, len(l)
+    # lo: smallest index where the return value could be.
+    # hi: largest index where the return value could be.
+    while lo < hi:
+        mid = (hi + lo) // 2
+        if l[mid] > item:
+            # Item would be before mid
+            hi = mid
+        elif l[mid] < item:
+            # Item would be after mid
+            lo = mid + 1
+        elif l[mid] == item:
+            return mid
+        else:
+            raise ValueError(f"Comparison operator poorly implemented {item} and {l[mid]} cannot be compared.")
+    return lo
+
+def bisect_left(l: list[T], item, lo: int = 0, hi: int | None = None, key: Callable[[T], object] = None) -> int:
+    """
+    Returns the first index in [lo, hi) where item could be inserted while keeping l sorted,
+    so before any elements equal to it.
+
+    When key is given, l is sorted by key(element), item is a key, and key is only
+    called on the elements probed. Nothing is copied or decorated.
+
+    :complexity: O(log(N) * (comp + key)), where N is hi - lo.
+    """
+    if hi is None:
+        hi = len(l)
+    return bisect.bisect_left(l, item, lo, hi, key=key)
+
+def bisect_right(l: list[T], item, lo: int = 0, hi: int | None = None, key: Callable[[T], object] = None) -> int:
+    """
+    Same as bisect_left, but returns the index after any elements equal to item.
+
+    :complexity: O(log(N) * (comp + key)), where N is hi - lo.
+    """
+    if hi is None:
+        hi = len(l)
+    return bisect.bisect_right(l, item, lo, hi, key=key)
+
+def search_many(l: list[T], sorted_queries: Sequence, key: Callable[[T], object] = None) -> list[int]:
+    """
+    Returns bisect_left(l, query, key=key) for every query, in order.
+
+    The queries being sorted, each search starts where the previous one ended. It
+    first checks the element one expected gap (2 * len(l) / len(sorted_queries)) further
+    on, and when the query is no greater, bisects just that window instead of the rest of l.
+
+    :pre: sorted_queries is sorted in the same order as l, not checked.
+    :complexity: O(M * log(N / M) * (comp + key)) when the queries are spread like l,
+                 never more than O(M * log(N) * (comp + key)), where M is the number
+                 of queries and N is len(l).
+    """
+    n = len(l)
+    step = max(1, 2 * n // max(1, len(sorted_queries)))
+    positions = []
+    lo = 0
+    for query in sorted_queries:
+        hi = lo + step
+        if hi >= n:
+            lo = bisect.bisect_left(l, query, lo, n, key=key)
+        elif not (l[hi] if key is None else key(l[hi])) < query:
+            lo = bisect.bisect_left(l, query, lo, hi, key=key)
+        else:
+            lo = bisect.bisect_left(l, query, hi + 1, n, key=key)
+        positions.append(lo)
+    return positions
@@ -1,8 +1,12 @@
 from __future__ import annotations
-from typing import TypeVar
+from bisect import bisect_right
+from typing import Callable, TypeVar
 
 T = TypeVar("T")
 
+# Natural runs shorter than this are extended by insertion, see natural_mergesort.
+MIN_RUN = 32
+
 def merge(l1: list[T], l2: list[T], key=lambda x:x) -> list[T]:
     """
     Merges two sorted lists into one larger sorted list,
@@ -17,13 +21,21 @@ def merge(l1: list[T], l2: list[T], key=lambda x:x) -> list[T]:
     new_list = []
     cur_left = 0
     cur_right = 0
+    if l1 and l2:
+        # Each element's key is computed once, when it reaches the front.
+        key_left = key(l1[0])
+        key_right = key(l2[0])
     while cur_left < len(l1) and cur_right < len(l2):
-        if key(l1[cur_left]) <= key(l2[cur_right]):
+        if key_left <= key_right:
             new_list.append(l1[cur_left])
             cur_left += 1
+            if cur_left < len(l1):
+                key_left = key(l1[cur_left])
         else:
             new_list.append(l2[cur_right])
             cur_right += 1
+            if cur_right < len(l2):
+                key_right = key(l2[cur_right])
     new_list += l1[cur_left:]
     new_list += l2[cur_right:]
     return new_list
@@ -39,3 +51,136 @@ def mergesort(l: list[T]) -> list[T]:
     l1 = mergesort(l[:break_index])
     l2 = mergesort(l[break_index:])
     return merge(l1, l2)
+
+
+def natural_mergesort(l: list[T], key: Callable[[T], object] = None) -> list[T]:
+    """
+    Sort a list with a bottom-up, iterative mergesort. Returns a new sorted list, l is not changed.
+
+    Keys are computed once per element (decorate, sort, undecorate) and kept in a
+    list parallel to the elements. The input is split into its natural runs: maximal
+    ascending runs, and strictly descending runs which are reversed in place. Runs
+    shorter than MIN_RUN are extended by binary insertion. Adjacent runs are then
+    merged pairwise, pass after pass, between the lists and one auxiliary buffer.
+
+    Like `sorted`, the sort is stable and only uses `<` on keys.
+
+    :complexity: Best Case O(N * comp(T)), when l is already sorted or reverse sorted.
+                 Worst Case O(NlogN * comp(T)), where N is len(l).
+    """
+    items = list(l)
+    keys = items if key is None else [key(item) for item in items]
+    n = len(items)
+
+    runs = []
+    start = 0
+    while start < n:
+        end = _run_end(keys, items, start, n)
+        if end - start < MIN_RUN and end < n:
+            stop = min(start + MIN_RUN, n)
+            _insertion_extend(keys, items, start, end, stop)
+            end = stop
+        runs.append(start)
+        start = end
+    runs.append(n)
+
+    # The buffer only needs to be separate lists, its contents are overwritten.
+    buffer_keys = [None] * n
+    buffer_items = buffer_keys if key is None else [None] * n
+    while len(runs) > 2:
+        merged = []
+        for index in range(0, len(runs) - 1, 2):
+            lo = runs[index]
+            merged.append(lo)
+            if index + 2 < len(runs):
+                _merge_runs(keys, items, buffer_keys, buffer_items, lo, runs[index + 1], runs[index + 2])
+            else:
+                # An odd run out is carried over to the next pass.
+                buffer_keys[lo:n] = keys[lo:n]
+                if key is not None:
+                    buffer_items[lo:n] = items[lo:n]
+        merged.append(n)
+        runs = merged
+        keys, buffer_keys = buffer_keys, keys
+        items, buffer_items = buffer_items, items
+    return items
+
+def _run_end(keys: list, items: list[T], start: int, n: int) -> int:
+    """
+    Returns the end of the natural run starting at start. A strictly descending
+    run is reversed in place first, which keeps the sort stable.
+    :complexity: O(run length * comp(T))
+    """
+    end = start + 1
+    if end == n:
+        return end
+    if keys[end] < keys[start]:
+        while end + 1 < n and keys[end + 1] < keys[end]:
+            end += 1
+        end += 1
+        keys[start:end] = keys[start:end][::-1]
+        if items is not keys:
+            items[start:end] = items[start:end][::-1]
+        return end
+    while end + 1 < n and not keys[end + 1] < keys[end]:
+        end += 1
+    return end + 1
+
+def _insertion_extend(keys: list, items: list[T], start: int, end: int, stop: int) -> None:
+    """
+    Extends the sorted run keys[start:end] to keys[start:stop] by binary insertion.
+    :complexity: O((stop - start) * log(stop - start) * comp(T)) comparisons,
+                 plus O((stop - start)^2) element moves done by slice assignment.
+    """
+    for index in range(end, stop):
+        item_key = keys[index]
+        position = bisect_right(keys, item_key, start, index)
+        if position == index:
+            continue
+        keys[position + 1:index + 1] = keys[position:index]
+        keys[position] = item_key
+        if items is not keys:
+            item = items[index]
+            items[position + 1:index + 1] = items[position:index]
+            items[position] = item
+
+def _merge_runs(keys: list, items: list[T], out_keys: list, out_items: list[T], lo: int, mid: int, hi: int) -> None:
+    """
+    Merges the sorted runs [lo, mid) and [mid, hi) of keys/items into the
+    same positions of out_keys/out_items. Elements of the left run go first on ties.
+    :complexity: Best Case O(hi - lo), when the runs are already in order.
+                 Worst Case O((hi - lo) * comp(T)).
+    """
+    decorated = items is not keys
+    if not keys[mid] < keys[mid - 1]:
+        out_keys[lo:hi] = keys[lo:hi]
+        if decorated:
+            out_items[lo:hi] = items[lo:hi]
+        return
+    left, right, out = lo, mid, lo
+    key_left, key_right = keys[left], keys[right]
+    while True:
+        if key_right < key_left:
+            out_keys[out] = key_right
+            if decorated:
+                out_items[out] = items[right]
+            out += 1
+            right += 1
+            if right == hi:
+                break
+            key_right = keys[right]
+        else:
+            out_keys[out] = key_left
+            if decorated:
+                out_items[out] = items[left]
+            out += 1
+            left += 1
+            if left == mid:
+                break
+            key_left = keys[left]
+    # Only one run has anything left, and it is already in place relative to out.
+    out_keys[out:out + mid - left] = keys[left:mid]
+    out_keys[out + mid - left:hi] = keys[right:hi]
+    if decorated:
+        out_items[out:out + mid - left] = items[left:mid]
+        out_items[out + mid - left:hi] = items[right:hi]
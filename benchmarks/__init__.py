@@ -0,0 +1,6 @@
+"""
+Micro benchmarks for the data structures in this repository.
+
+Each module can be run on its own from the repository root, e.g.
+`python -m benchmarks.bench_deletion`.
+"""
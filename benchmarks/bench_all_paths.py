@@ -0,0 +1,46 @@
+"""
+Trail.get_all_paths time and peak memory, against walking the paths one at a time with iter_paths,
+and against summing each path's length with an iter_paths visitor, when iter_paths exists.
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+from benchmarks.bench_paths import branchy_trail
+from benchmarks.keys import timed
+
+
+def peak_bytes(func, *args) -> int:
+    """ Peak memory allocated while running func(*args). """
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def walk(paths) -> None:
+    for _ in paths:
+        pass
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-s", "--splits", type=int, default=8)
+    args = p.parse_args()
+
+    trail = branchy_trail(args.splits)
+    cases = [("get_all_paths", trail.get_all_paths)]
+    if hasattr(trail, "iter_paths"):
+        cases += [
+            ("walk iter_paths", lambda: walk(trail.iter_paths())),
+            ("sum lengths", lambda: max(trail.iter_paths(lambda total, mountain: total + mountain.length, 0))),
+        ]
+    print(f"{len(trail.get_all_paths())} paths")
+    for label, func in cases:
+        print(f"{label:>16}: {timed(func) * 1000:8.1f}ms, peak {peak_bytes(func) / 2 ** 20:7.2f}MiB")
+
+
+if __name__ == "__main__":
+    main()
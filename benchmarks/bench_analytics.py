@@ -0,0 +1,51 @@
+"""
+Path statistics: enumerating every path with get_all_paths and totalling them, against
+TrailAnalytics the first time, on a repeated query, and after an edit deep in the trail.
+"""
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.bench_paths import branchy_trail
+from benchmarks.keys import timed
+from mountain import Mountain
+from trail import Trail, TrailSeries
+from trail_analytics import TrailAnalytics
+
+
+def by_enumeration(trail) -> tuple:
+    paths = trail.get_all_paths()
+    difficulties = [sum(mountain.difficulty_level for mountain in path) for path in paths]
+    histogram = [0] * (max(map(len, paths)) + 1)
+    for path in paths:
+        histogram[len(path)] += 1
+    return len(paths), min(difficulties), max(difficulties), sum(difficulties), histogram
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-s", "--splits", type=int, default=8)
+    args = p.parse_args()
+
+    trail = branchy_trail(args.splits)
+
+    def analyse(analytics: TrailAnalytics) -> tuple:
+        return analytics.stats(trail), analytics.length_histogram(trail)
+
+    analytics = TrailAnalytics()
+    analyse(analytics)
+    print(f"{analytics.path_count(trail)} paths")
+    print(f"enumerate:        {timed(by_enumeration, trail) * 1000:9.3f}ms")
+    print(f"analytics first:  {timed(lambda: analyse(TrailAnalytics())) * 1000:9.3f}ms")
+    print(f"analytics repeat: {timed(analyse, analytics) * 1000:9.3f}ms")
+
+    # The empty trail at the very end, after every split.
+    last = trail
+    while last.store is not None:
+        last = last.store.path_follow
+    last.store = TrailSeries(Mountain("edit", 1, 1), Trail(None))
+    print(f"analytics edited: {timed(analyse, analytics) * 1000:9.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+ArrayR microbenchmarks at the largest table size: allocation, scans, fill and copy.
+"""
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.keys import timed
+from data_structures.referential_array import ArrayR
+
+
+def scan_by_index(array: ArrayR) -> None:
+    for index in range(len(array)):
+        array[index]
+
+
+def scan_by_iter(array: ArrayR) -> None:
+    for _ in array:
+        pass
+
+
+def fill_by_index(array: ArrayR, value) -> None:
+    for index in range(len(array)):
+        array[index] = value
+
+
+def copy_by_index(target: ArrayR, source: ArrayR) -> None:
+    for index in range(len(source)):
+        target[index] = source[index]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--slots", type=int, default=1572869)
+    p.add_argument("-r", "--repeats", type=int, default=3)
+    args = p.parse_args()
+    n = args.slots
+
+    def best(func, *func_args) -> float:
+        return min(timed(func, *func_args) for _ in range(args.repeats)) * 1000
+
+    print(f"{n} slots")
+    print(f"allocate          {best(ArrayR, n):8.1f}ms")
+    print(f"allocate 27 x1000 {best(lambda: [ArrayR(27) for _ in range(1000)]):8.1f}ms")
+    array = ArrayR(n)
+    source = ArrayR(n)
+    fill_by_index(source, 1)
+    print(f"scan by index     {best(scan_by_index, array):8.1f}ms")
+    print(f"fill by index     {best(fill_by_index, array, 0):8.1f}ms")
+    print(f"copy by index     {best(copy_by_index, array, source):8.1f}ms")
+    if hasattr(ArrayR, "fill"):
+        print(f"scan by iter      {best(scan_by_iter, array):8.1f}ms")
+        print(f"fill              {best(array.fill, 0):8.1f}ms")
+        print(f"fill None         {best(array.fill, None):8.1f}ms")
+        print(f"copy_from         {best(array.copy_from, source):8.1f}ms")
+        print(f"view + scan half  {best(lambda: scan_by_iter(array.view(0, n // 2))):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
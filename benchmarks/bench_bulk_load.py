@@ -0,0 +1,35 @@
+"""
+Compare filling a LinearProbeTable one key at a time with LinearProbeTable.from_items.
+"""
+from __future__ import annotations
+
+import argparse
+
+from benchmarks.keys import mountain_names, timed
+from data_structures.hash_table import LinearProbeTable
+
+
+def one_by_one(pairs: list[tuple[str, int]], options: dict) -> None:
+    table = LinearProbeTable(**options)
+    for key, value in pairs:
+        table[key] = value
+
+
+def bulk(pairs: list[tuple[str, int]], options: dict) -> None:
+    LinearProbeTable.from_items(pairs, **options)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=200000)
+    args = p.parse_args()
+
+    pairs = [(name, i) for i, name in enumerate(mountain_names(args.keys))]
+    for options in (dict(), dict(cache_hashes=True), dict(storage="columnar")):
+        grown = timed(one_by_one, pairs, options)
+        bulked = timed(bulk, pairs, options)
+        print(f"{str(options):>24}: one by one {grown:.3f}s, from_items {bulked:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compare shift and tombstone deletion in LinearProbeTable
+under a mixed insert/delete workload.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+
+from benchmarks.keys import mountain_names, timed
+from data_structures.hash_table import LinearProbeTable
+
+
+def churn(table: LinearProbeTable, keys: list[str], ops: int, seed: int) -> None:
+    """ Keep roughly len(keys) / 2 keys alive, randomly inserting and deleting. """
+    rng = random.Random(seed)
+    live = []
+    for _ in range(ops):
+        if live and rng.random() < 0.5:
+            i = rng.randrange(len(live))
+            live[i], live[-1] = live[-1], live[i]
+            del table[live.pop()]
+        else:
+            key = rng.choice(keys)
+            if key not in table:
+                live.append(key)
+            table[key] = 0
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=20000)
+    p.add_argument("-o", "--ops", type=int, default=200000)
+    args = p.parse_args()
+
+    keys = mountain_names(args.keys)
+    for mode in LinearProbeTable.DELETION_MODES:
+        table = LinearProbeTable(deletion=mode)
+        # Pre-fill so the deletes hit real clusters.
+        for key in keys[:args.keys // 2]:
+            table[key] = 0
+        seconds = timed(churn, table, keys, args.ops, 1)
+        print(f"{mode:>10}: {seconds:.3f}s for {args.ops} ops ({args.ops / seconds:,.0f} ops/s)")
+
+
+if __name__ == "__main__":
+    main()
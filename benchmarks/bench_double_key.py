@@ -0,0 +1,64 @@
+"""
+DoubleKeyTable operation latency: lookups, membership tests, updates and inserts,
+and the batch get_many/set_many against looping over pairs.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from data_structures.hashers import BytesHasher
+from double_key_table import DoubleKeyTable
+
+CONFIGS = [
+    ("default", dict()),
+    ("bytes hashers", dict(hasher1=BytesHasher(), hasher2=BytesHasher())),
+]
+
+
+def per_op(func, items) -> float:
+    """ Mean nanoseconds per call of func over items. """
+    start = perf_counter()
+    for item in items:
+        func(item)
+    return (perf_counter() - start) / len(items) * 1e9
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=50000)
+    args = p.parse_args()
+
+    names = mountain_names(args.keys)
+    pairs = [(name.rsplit(" ", 2)[0], name) for name in names]
+    missing = [(top, name + "?") for top, name in pairs]
+    for label, options in CONFIGS:
+        table = DoubleKeyTable(**options)
+
+        def insert(pair):
+            table[pair] = 0
+
+        inserts = per_op(insert, pairs)
+        updates = per_op(insert, pairs)
+        lookups = per_op(table.__getitem__, pairs)
+        hits = per_op(table.__contains__, pairs)
+        misses = per_op(table.__contains__, missing)
+        print(f"{label:>14}: insert {inserts:7.0f}ns, update {updates:7.0f}ns, get {lookups:7.0f}ns, "
+              f"in (hit) {hits:7.0f}ns, in (miss) {misses:7.0f}ns")
+
+    # Batch jobs arrive in no particular order.
+    shuffled = pairs[:]
+    random.Random(1).shuffle(shuffled)
+    for label, options in CONFIGS:
+        table = DoubleKeyTable(**options)
+        set_many = per_op(lambda batch: table.set_many(batch, [0] * len(batch)), [shuffled]) / len(shuffled)
+        get_many = per_op(table.get_many, [shuffled]) / len(shuffled)
+        looped = per_op(table.__getitem__, shuffled)
+        print(f"{label:>14}: set_many {set_many:7.0f}ns, get_many {get_many:7.0f}ns, "
+              f"get loop {looped:7.0f}ns per pair")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Compare LinearProbeTable with and without cached key hashes.
+Reports total build time and the longest single insert, which is a growth pause.
+"""
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from data_structures.hash_table import LinearProbeTable
+
+
+def build(table: LinearProbeTable, keys: list[str]) -> tuple[float, float]:
+    """ Returns (total seconds, worst single insert seconds). """
+    worst = 0.0
+    start = perf_counter()
+    for i, key in enumerate(keys):
+        before = perf_counter()
+        table[key] = i
+        worst = max(worst, perf_counter() - before)
+    return perf_counter() - start, worst
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=100000)
+    p.add_argument("--prefix", type=int, default=40, help="Extra characters prepended to every name.")
+    args = p.parse_args()
+
+    keys = [("x" * args.prefix) + name for name in mountain_names(args.keys)]
+    for cache_hashes in (False, True):
+        table = LinearProbeTable(cache_hashes=cache_hashes)
+        total, worst = build(table, keys)
+        start = perf_counter()
+        for key in keys:
+            table[key]
+        lookups = perf_counter() - start
+        print(f"cache_hashes={cache_hashes!s:>5}: build {total:.3f}s, worst insert {worst * 1000:.1f}ms, "
+              f"lookups {lookups:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
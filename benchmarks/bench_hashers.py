@@ -0,0 +1,51 @@
+"""
+Compare the hashers in data_structures/hashers.py on mountain names:
+hashing speed, spread over a prime table size, and the resulting probe lengths.
+"""
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from data_structures.hash_table import LinearProbeTable
+from data_structures.hashers import HASHERS
+
+
+def chi_squared(positions: list[int], size: int) -> float:
+    """ Chi-squared statistic of positions against a uniform spread; about size when uniform. """
+    counts = [0] * size
+    for position in positions:
+        counts[position] += 1
+    expected = len(positions) / size
+    return sum((count - expected) ** 2 for count in counts) / expected
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=200000)
+    p.add_argument("-s", "--size", type=int, default=12289, help="Prime table size for the spread test.")
+    args = p.parse_args()
+
+    names = mountain_names(args.keys)
+    legacy = LinearProbeTable(sizes=[args.size])
+    start = perf_counter()
+    positions = [legacy.hash(name) for name in names]
+    seconds = perf_counter() - start
+    print(f"{'legacy hash':>12}: {seconds / args.keys * 1e9:6.0f}ns/key, chi2 {chi_squared(positions, args.size):9.0f}")
+
+    for name, hasher_type in HASHERS.items():
+        hasher = hasher_type()
+        start = perf_counter()
+        hashes = [hasher(key) for key in names]
+        seconds = perf_counter() - start
+        chi2 = chi_squared([h % args.size for h in hashes], args.size)
+        table = LinearProbeTable.from_items(((key, None) for key in names), hasher=hasher)
+        mean, longest = table.probe_stats()
+        print(f"{name:>12}: {seconds / args.keys * 1e9:6.0f}ns/key, chi2 {chi2:9.0f}, "
+              f"probe mean {mean:.2f} max {longest}")
+    print(f"(chi2 close to {args.size - 1} means a uniform spread)")
+
+
+if __name__ == "__main__":
+    main()
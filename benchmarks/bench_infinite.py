@@ -0,0 +1,81 @@
+"""
+InfiniteHashTable operation latency, memory and prefix queries on long keys sharing regional prefixes.
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from infinite_hash_table import InfiniteHashTable
+
+
+def per_op(func, items) -> float:
+    """ Mean nanoseconds per call of func over items. """
+    start = perf_counter()
+    for item in items:
+        func(item)
+    return (perf_counter() - start) / len(items) * 1e9
+
+
+def fill(pairs) -> InfiniteHashTable:
+    table = InfiniteHashTable()
+    for key, value in pairs:
+        table[key] = value
+    return table
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=50000)
+    args = p.parse_args()
+
+    names = mountain_names(args.keys)
+    missing = [name + "?" for name in names]
+
+    tracemalloc.start()
+    table = InfiniteHashTable()
+    for name in names:
+        table[name] = 0
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del table
+    print(f"memory {memory / 2 ** 20:.1f}MiB, {memory / len(names):.0f}B per key")
+
+    pairs = [(name, 0) for name in names]
+    one_by_one = per_op(fill, [pairs]) / 1e6
+    bulk = per_op(InfiniteHashTable.from_items, [pairs]) / 1e6
+    bulk_sorted = per_op(InfiniteHashTable.from_items, [sorted(pairs)]) / 1e6
+    print(f"build {len(names)} keys: one by one {one_by_one:.0f}ms, from_items {bulk:.0f}ms, "
+          f"from_items (sorted input) {bulk_sorted:.0f}ms")
+
+    table = InfiniteHashTable()
+
+    def insert(name):
+        table[name] = 0
+
+    def contains(name):
+        return name in table
+
+    inserts = per_op(insert, names)
+    updates = per_op(insert, names)
+    lookups = per_op(table.__getitem__, names)
+    hits = per_op(contains, names)
+    misses = per_op(contains, missing)
+    locations = per_op(table.get_location, names)
+    prefixes = ["Grampians Tor 12", "Snowy Mountains Dome 4", "Flinders Ranges"]
+    for prefix in prefixes:
+        trie = per_op(lambda p: list(table.items_with_prefix(p)), [prefix] * 20)
+        scan = per_op(lambda p: sorted(name for name in names if name.startswith(p)), [prefix] * 20)
+        found = len(list(table.items_with_prefix(prefix)))
+        print(f"prefix {prefix!r} ({found} keys): items_with_prefix {trie / 1000:8.1f}us, list scan {scan / 1000:8.1f}us")
+    print(f"sort_keys {per_op(lambda _: table.sort_keys(), [None]) / 1e6:.1f}ms, "
+          f"sorted(names) {per_op(lambda _: sorted(names), [None]) / 1e6:.1f}ms")
+    deletes = per_op(table.__delitem__, names)
+    print(f"insert {inserts:6.0f}ns, update {updates:6.0f}ns, get {lookups:6.0f}ns, in (hit) {hits:6.0f}ns, "
+          f"in (miss) {misses:6.0f}ns, get_location {locations:6.0f}ns, delete {deletes:6.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+A route library of trails built from a few repeated branch patterns: memory held and time to
+deserialize it, plainly and through a TrailInterner, and the time to analyse every trail with one
+TrailAnalytics.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tracemalloc
+
+from benchmarks.bench_paths import series
+from benchmarks.keys import timed
+from mountain import Mountain
+from serialize import deserialize, serialize
+from trail import Trail, TrailSplit
+from trail_analytics import TrailAnalytics
+from trail_interner import TrailInterner
+
+
+def library(trails: int, patterns: int, seed: int = 0) -> list[dict]:
+    """ Serialised trails, each a sequence of 6 splits drawn from a pool of branch patterns. """
+    rng = random.Random(seed)
+    peaks = [Mountain(f"peak {i}", rng.randrange(10), rng.randrange(1, 20)) for i in range(40)]
+    pool = [series(rng.sample(peaks, rng.randint(1, 4)), Trail(None)) for _ in range(patterns)]
+    objs = []
+    for _ in range(trails):
+        trail = series(rng.sample(peaks, 2), Trail(None))
+        for _ in range(6):
+            trail = Trail(TrailSplit(rng.choice(pool), rng.choice(pool), trail))
+        objs.append(json.loads(serialize(trail)))
+    return objs
+
+
+def held_bytes(func, *args) -> int:
+    """ Memory still allocated by func(*args) once it has returned its result. """
+    tracemalloc.start()
+    result = func(*args)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--trails", type=int, default=5000)
+    p.add_argument("-p", "--patterns", type=int, default=12)
+    args = p.parse_args()
+
+    objs = library(args.trails, args.patterns)
+
+    def plain():
+        return [deserialize(obj) for obj in objs]
+
+    def interned():
+        interner = TrailInterner()
+        return [deserialize(obj, interner) for obj in objs], interner
+
+    def analyse(trails):
+        analytics = TrailAnalytics()
+        for trail in trails:
+            analytics.stats(trail)
+
+    plain_trails = plain()
+    interned_trails = interned()[0]
+    print(f"{args.trails} trails")
+    print(f"deserialize plain:    {timed(plain) * 1000:7.1f}ms, held {held_bytes(plain) / 2 ** 20:6.2f}MiB")
+    print(f"deserialize interned: {timed(interned) * 1000:7.1f}ms, held {held_bytes(interned) / 2 ** 20:6.2f}MiB")
+    print(f"analyse plain:        {timed(analyse, plain_trails) * 1000:7.1f}ms")
+    print(f"analyse interned:     {timed(analyse, interned_trails) * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Cost of walking a LinearProbeTable (keys, iteration and rebuilding) on sparse and dense tables,
+and of InfiniteHashTable.get_first_pair.
+"""
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from data_structures.hash_table import LinearProbeTable
+from infinite_hash_table import InfiniteHashTable
+
+LAYOUTS = [("tuple", dict()), ("columnar", dict(storage="columnar"))]
+
+
+def per_call_ms(func, repeats: int) -> float:
+    start = perf_counter()
+    for _ in range(repeats):
+        func()
+    return (perf_counter() - start) / repeats * 1000
+
+
+def walk(table: LinearProbeTable) -> None:
+    for _ in table.iter_items():
+        pass
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--slots", type=int, default=100000)
+    p.add_argument("-r", "--repeats", type=int, default=5)
+    args = p.parse_args()
+
+    for density, fraction in (("sparse", 0.01), ("dense", 0.45)):
+        for label, options in LAYOUTS:
+            table = LinearProbeTable(size_hint=args.slots, **options)
+            names = mountain_names(int(table.table_size * fraction))
+            for i, name in enumerate(names):
+                table[name] = i
+            keys = per_call_ms(table.keys, args.repeats)
+            walked = per_call_ms(lambda: walk(table), args.repeats)
+            rebuilt = per_call_ms(table._rebuild, args.repeats)
+            print(f"{density:>6} {label:>8} ({len(table)}/{table.table_size}): keys {keys:8.2f}ms, "
+                  f"iterate {walked:8.2f}ms, rebuild {rebuilt:8.2f}ms")
+
+    table = InfiniteHashTable()
+    table["z"] = 0
+    repeats = 200000
+    print(f"get_first_pair: {per_call_ms(table.get_first_pair, repeats) * 1e6:.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
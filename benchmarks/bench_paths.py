@@ -0,0 +1,55 @@
+"""
+Trail.length_k_paths on a trail of splits in sequence, each branch a short series with a nested split,
+against counting the paths when count_length_k_paths exists.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+
+from benchmarks.keys import timed
+from mountain import Mountain
+from trail import Trail, TrailSeries, TrailSplit
+
+
+def series(mountains: list[Mountain], following: Trail) -> Trail:
+    for mountain in reversed(mountains):
+        following = Trail(TrailSeries(mountain, following))
+    return following
+
+
+def branchy_trail(splits: int, seed: int = 0) -> Trail:
+    """ splits splits in sequence. Each branch has 1-3 mountains, then a split of two 0-2 mountain branches. """
+    rng = random.Random(seed)
+    names = iter(range(10 ** 9))
+
+    def mountains(low: int, high: int) -> list[Mountain]:
+        return [Mountain(f"m{next(names)}", 1, 1) for _ in range(rng.randint(low, high))]
+
+    def branch() -> Trail:
+        inner = Trail(TrailSplit(series(mountains(0, 2), Trail(None)), series(mountains(0, 2), Trail(None)), Trail(None)))
+        return series(mountains(1, 3), inner)
+
+    trail = Trail(None)
+    for _ in range(splits):
+        trail = Trail(TrailSplit(branch(), branch(), trail))
+    return trail
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-s", "--splits", type=int, default=8)
+    args = p.parse_args()
+
+    trail = branchy_trail(args.splits)
+    lengths = [len(path) for path in trail.get_all_paths()]
+    print(f"{len(lengths)} paths of {min(lengths)} to {max(lengths)} mountains")
+    for k in (min(lengths) + 2, (min(lengths) + max(lengths)) // 2, max(lengths) - 2):
+        line = f"k={k:>3} ({lengths.count(k):>6} paths): length_k_paths {timed(trail.length_k_paths, k) * 1000:8.1f}ms"
+        if hasattr(trail, "count_length_k_paths"):
+            line += f", count_length_k_paths {timed(trail.count_length_k_paths, k) * 1000:6.2f}ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
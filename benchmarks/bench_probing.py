@@ -0,0 +1,45 @@
+"""
+Compare linear and Robin Hood probing in LinearProbeTable on mountain names,
+in a table held just under half full. Reports probe lengths and lookup times
+for present and missing keys.
+"""
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from data_structures.hash_table import LinearProbeTable
+
+
+def lookups(table: LinearProbeTable, keys: list[str]) -> float:
+    start = perf_counter()
+    for key in keys:
+        key in table
+    return perf_counter() - start
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-s", "--size", type=int, default=98317, help="Fixed table size, should be prime.")
+    p.add_argument("-l", "--load", type=float, default=0.49)
+    args = p.parse_args()
+
+    count = int(args.size * args.load)
+    names = mountain_names(2 * count)
+    present, missing = names[:count], names[count:]
+    for storage in ("tuple", "columnar"):
+        for probing in LinearProbeTable.PROBING_MODES:
+            table = LinearProbeTable(sizes=[args.size], storage=storage, probing=probing, cache_hashes=True)
+            start = perf_counter()
+            for i, key in enumerate(present):
+                table[key] = i
+            inserts = perf_counter() - start
+            mean, longest = table.probe_stats()
+            print(f"{storage:>8} {probing:>10}: probe mean {mean:5.2f} max {longest:4d}, "
+                  f"insert {inserts:.3f}s, hits {lookups(table, present):.3f}s, "
+                  f"misses {lookups(table, missing):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
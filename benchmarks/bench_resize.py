@@ -0,0 +1,47 @@
+"""
+Per-operation latency of LinearProbeTable and DoubleKeyTable inserts,
+with stop-the-world and incremental resizing.
+"""
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from data_structures.hash_table import LinearProbeTable
+from double_key_table import DoubleKeyTable
+
+
+def latencies(table, keys: list) -> list[float]:
+    """ Seconds taken by each insert, in insert order. """
+    result = []
+    for i, key in enumerate(keys):
+        start = perf_counter()
+        table[key] = i
+        result.append(perf_counter() - start)
+    return result
+
+
+def report(name: str, times: list[float]) -> None:
+    ordered = sorted(times)
+    p99 = ordered[int(len(ordered) * 0.99)]
+    print(f"{name:>28}: total {sum(times):.3f}s, p99 {p99 * 1e6:7.1f}us, worst {ordered[-1] * 1000:8.2f}ms")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=200000)
+    args = p.parse_args()
+
+    names = mountain_names(args.keys)
+    for incremental in (False, True):
+        table = LinearProbeTable(cache_hashes=True, incremental_resize=incremental)
+        report(f"LinearProbeTable incremental={incremental}", latencies(table, names))
+    pairs = [(name.rsplit(" ", 1)[0], name) for name in names]
+    for incremental in (False, True):
+        table = DoubleKeyTable(incremental_resize=incremental)
+        report(f"DoubleKeyTable incremental={incremental}", latencies(table, pairs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+MountainOrganiser lookups: adding mountains in groups, then finding every mountain with cur_position.
+With the search module's search_many, also compares it to a bisect_left per query, on sorted queries.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+
+from benchmarks.keys import mountain_names, timed
+from mountain import Mountain
+from mountain_organiser import MountainOrganiser
+
+try:
+    from algorithms.binary_search import bisect_left, search_many
+except ImportError:
+    search_many = None
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--mountains", type=int, default=100000)
+    p.add_argument("-g", "--groups", type=int, default=10)
+    args = p.parse_args()
+
+    rng = random.Random(0)
+    # Few distinct lengths, so ties are broken by the (long, shared prefix) names.
+    mountains = [Mountain(name, rng.randrange(10), rng.randrange(50)) for name in mountain_names(args.mountains)]
+    size = len(mountains) // args.groups
+    groups = [mountains[start:start + size] for start in range(0, len(mountains), size)]
+
+    def add():
+        organiser = MountainOrganiser()
+        for group in groups:
+            organiser.add_mountains(group)
+        return organiser
+
+    organiser = add()
+    print(f"add {args.groups} groups:  {timed(add) * 1000:8.1f}ms")
+    print(f"cur_position each: {timed(lambda: [organiser.cur_position(m) for m in mountains]) * 1000:8.1f}ms")
+    if search_many is None:
+        return
+
+    keys = sorted(rng.randrange(10 * args.mountains) for _ in range(args.mountains))
+    for count in (100, 10000, args.mountains):
+        queries = sorted(rng.sample(keys, count))
+        each = timed(lambda: [bisect_left(keys, query) for query in queries])
+        many = timed(search_many, keys, queries)
+        print(f"{count:>7} sorted queries: bisect_left each {each * 1000:7.2f}ms, search_many {many * 1000:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+DoubleKeyTable cold start: rebuilding by reinsertion against loading a snapshot.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+
+from benchmarks.keys import mountain_names, timed
+from data_structures.hashers import BytesHasher
+from double_key_table import DoubleKeyTable
+
+
+def lookups(table: DoubleKeyTable, pairs: list) -> None:
+    for pair in pairs:
+        table[pair]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=300000)
+    p.add_argument("-l", "--lookups", type=int, default=10000)
+    args = p.parse_args()
+
+    names = mountain_names(args.keys)
+    pairs = [(name.rsplit(" ", 2)[0], name) for name in names]
+    values = [[i] for i in range(len(names))]
+    sample = random.Random(1).sample(pairs, args.lookups)
+
+    def rebuild() -> DoubleKeyTable:
+        table = DoubleKeyTable(hasher1=BytesHasher(), hasher2=BytesHasher())
+        table.set_many(pairs, values)
+        return table
+
+    rebuilt = timed(rebuild)
+    table = rebuild()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table.snap")
+        saved = timed(table.save, path)
+        loaded = timed(DoubleKeyTable.load, path)
+        snapshot = DoubleKeyTable.load(path)
+        print(f"{len(pairs)} pairs, snapshot {os.path.getsize(path) / 2 ** 20:.1f}MiB")
+        print(f"rebuild {rebuilt * 1000:9.1f}ms   save {saved * 1000:9.1f}ms   load {loaded * 1000:9.3f}ms")
+        print(f"{args.lookups} lookups: rebuilt table {timed(lookups, table, sample) * 1000:.1f}ms, "
+              f"snapshot first touch {timed(lookups, snapshot, sample) * 1000:.1f}ms, "
+              f"snapshot again {timed(lookups, snapshot, sample) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Sorting: the recursive mergesort against natural_mergesort and sorted, on random,
+nearly sorted and reversed inputs, with and without a key.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+
+from algorithms.mergesort import mergesort
+from benchmarks.keys import timed
+
+try:
+    from algorithms.mergesort import natural_mergesort
+except ImportError:
+    natural_mergesort = None
+
+
+def inputs(n: int, seed: int = 0) -> dict[str, list[int]]:
+    rng = random.Random(seed)
+    nearly = list(range(n))
+    # One element in a hundred swapped with a random other.
+    for _ in range(n // 100):
+        i, j = rng.randrange(n), rng.randrange(n)
+        nearly[i], nearly[j] = nearly[j], nearly[i]
+    return {
+        "random": [rng.randrange(n) for _ in range(n)],
+        "nearly sorted": nearly,
+        "reversed": list(range(n, 0, -1)),
+    }
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--items", type=int, default=100000)
+    args = p.parse_args()
+
+    def key(x):
+        return -x
+
+    sorts = [("mergesort", lambda l: mergesort(l)), ("sorted", lambda l: sorted(l)),
+             ("sorted key", lambda l: sorted(l, key=key))]
+    if natural_mergesort is not None:
+        sorts += [("natural", lambda l: natural_mergesort(l)),
+                  ("natural key", lambda l: natural_mergesort(l, key=key))]
+    for name, data in inputs(args.items).items():
+        print(name)
+        for label, func in sorts:
+            print(f"  {label:>12}: {timed(func, data) * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Stack push/pop throughput and memory: n pushes then n pops, and the peak memory allocated holding n elements.
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+from benchmarks.keys import timed
+from data_structures.linked_stack import LinkedStack
+
+try:
+    from data_structures.array_stack import ArrayStack
+except ImportError:
+    ArrayStack = None
+
+
+class ListStack(list):
+    """ A plain list, as a baseline. """
+    push = list.append
+
+
+def push_pop(stack_type, n: int) -> None:
+    stack = stack_type()
+    push, pop = stack.push, stack.pop
+    for item in range(n):
+        push(item)
+    for _ in range(n):
+        pop()
+
+
+def peak_bytes(stack_type, n: int) -> int:
+    """ Peak memory allocated while building a stack of n references to None. """
+    tracemalloc.start()
+    stack = stack_type()
+    for _ in range(n):
+        stack.push(None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--operations", type=int, default=10 ** 6)
+    args = p.parse_args()
+
+    stacks = [ListStack, LinkedStack]
+    if ArrayStack is not None:
+        stacks.append(ArrayStack)
+    for stack_type in stacks:
+        seconds = timed(push_pop, stack_type, args.operations)
+        peak = peak_bytes(stack_type, args.operations)
+        print(f"{stack_type.__name__:>12}: push+pop {seconds * 1000:8.1f}ms, peak {peak / 2 ** 20:6.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
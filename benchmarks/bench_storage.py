@@ -0,0 +1,65 @@
+"""
+Compare the tuple and columnar storage layouts of LinearProbeTable.
+Reports memory held by a populated table, and insert, lookup and keys() throughput.
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.keys import mountain_names
+from data_structures.hash_table import LinearProbeTable
+
+LAYOUTS = [
+    ("tuple", dict(storage="tuple")),
+    ("tuple+cache", dict(storage="tuple", cache_hashes=True)),
+    ("columnar", dict(storage="columnar")),
+]
+
+
+def build(options: dict, keys: list[str], values: list[int]) -> LinearProbeTable:
+    table = LinearProbeTable(**options)
+    for key, value in zip(keys, values):
+        table[key] = value
+    return table
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=100000)
+    args = p.parse_args()
+
+    keys = mountain_names(args.keys)
+    values = list(range(args.keys))
+    for name, options in LAYOUTS:
+        # Memory is traced on its own build, as tracing slows everything down.
+        tracemalloc.start()
+        table = build(options, keys, values)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del table
+
+        start = perf_counter()
+        table = build(options, keys, values)
+        inserts = perf_counter() - start
+        start = perf_counter()
+        for key in keys:
+            table[key] = 0
+        updates = perf_counter() - start
+        start = perf_counter()
+        for key in keys:
+            table[key]
+        lookups = perf_counter() - start
+        start = perf_counter()
+        for _ in range(10):
+            table.keys()
+            table.values()
+        scans = perf_counter() - start
+        print(f"{name:>12}: {memory / args.keys:6.1f} B/entry, insert {args.keys / inserts:9,.0f}/s, "
+              f"update {args.keys / updates:9,.0f}/s, lookup {args.keys / lookups:9,.0f}/s, "
+              f"keys+values {scans / 10 * 1000:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
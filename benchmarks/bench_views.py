@@ -0,0 +1,50 @@
+"""
+DoubleKeyTable keys()/values() cost: time to get and walk them, and the peak memory allocated doing so.
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+from benchmarks.keys import mountain_names, timed
+from data_structures.hashers import BytesHasher
+from double_key_table import DoubleKeyTable
+
+
+def walk(collection) -> None:
+    for _ in collection:
+        pass
+
+
+def peak_bytes(func, *args) -> int:
+    """ Peak memory allocated while running func(*args). """
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("-n", "--keys", type=int, default=200000)
+    args = p.parse_args()
+
+    names = mountain_names(args.keys)
+    table = DoubleKeyTable(hasher1=BytesHasher(), hasher2=BytesHasher())
+    table.set_many([(name.rsplit(" ", 2)[0], name) for name in names], range(len(names)))
+    top = next(iter(table.keys()))
+
+    cases = [
+        ("len(values())", lambda: len(table.values())),
+        ("walk values()", lambda: walk(table.values())),
+        ("walk keys(k)", lambda: walk(table.keys(top))),
+        ("walk keys()", lambda: walk(table.keys())),
+    ]
+    for label, func in cases:
+        seconds = timed(func)
+        print(f"{label:>14}: {seconds * 1000:8.2f}ms, peak {peak_bytes(func) / 1024:9.1f}KiB")
+
+
+if __name__ == "__main__":
+    main()
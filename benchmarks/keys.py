@@ -0,0 +1,32 @@
+""" Realistic key generators shared by the benchmarks. """
+from __future__ import annotations
+
+import random
+
+REGIONS = [
+    "Southern Alps", "Blue Mountains", "Snowy Mountains", "Great Dividing Range",
+    "Flinders Ranges", "Grampians", "Cradle Mountain Lake St Clair", "Victorian Alps",
+]
+PEAKS = ["Mount", "Peak", "Spire", "Bluff", "Tor", "Crag", "Knob", "Dome"]
+
+
+def mountain_names(n: int, seed: int = 0) -> list[str]:
+    """
+    Return n distinct mountain names.
+    Names share long regional prefixes, like the names in our saved trails.
+    """
+    rng = random.Random(seed)
+    names = []
+    for i in range(n):
+        region = rng.choice(REGIONS)
+        peak = rng.choice(PEAKS)
+        names.append(f"{region} {peak} {i}")
+    return names
+
+
+def timed(func, *args) -> float:
+    """ Returns the wall-clock seconds taken by func(*args). """
+    from time import perf_counter
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
@@ -0,0 +1,89 @@
+""" Stack ADT based on a growable array of references.
+
+The slots are a Python list used as a fixed-size array: it is allocated
+full of None and only grows by doubling, as an ArrayR would. ArrayR itself
+is not used because every store into a ctypes array also records a
+keep-alive entry in the array's `_objects` dict, which makes a store about
+seven times slower than a list store, and slower than allocating a Node.
+"""
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from data_structures.stack_adt import *
+
+
+class ArrayStack(Stack[T]):
+    """ Implementation of a stack with an array that doubles when full.
+
+        Pushing never allocates a node, so pushes and pops are cheaper than
+        LinkedStack's, and the stack costs one pointer per slot.
+
+        Attributes:
+            length (int): number of elements in the stack (inherited)
+            array (list[T]): the elements, bottom first, in positions 0 to length - 1
+    """
+
+    MIN_CAPACITY = 16
+
+    def __init__(self, capacity: int | None = None) -> None:
+        """ Object initializer. capacity is only the starting size, the stack grows past it.
+            :complexity: O(capacity)
+        """
+        Stack.__init__(self)
+        self.array = [None] * max(self.MIN_CAPACITY, capacity or 0)
+
+    def clear(self) -> None:
+        """ Resets the stack, releasing its elements.
+            :complexity: O(capacity)
+        """
+        super().clear()
+        self.array = [None] * len(self.array)
+
+    def is_full(self) -> bool:
+        """ Returns whether the stack is full. It never is, since it grows.
+            :complexity: O(1)
+        """
+        return False
+
+    def _grow(self) -> None:
+        """ Doubles the size of the array.
+            :complexity: O(capacity)
+        """
+        self.array.extend([None] * len(self.array))
+
+    def push(self, item: T) -> None:
+        """ Pushes an element to the top of the stack.
+            :complexity: O(1) amortised, O(capacity) when the array grows
+        """
+        length = self.length
+        if length == len(self.array):
+            self._grow()
+        self.array[length] = item
+        self.length = length + 1
+
+    def pop(self) -> T:
+        """ Pops the element at the top of the stack.
+            :pre: stack is not empty
+            :complexity: O(1)
+            :raises Exception: if the stack is empty
+        """
+        if self.length == 0:
+            raise Exception('Stack is empty')
+
+        self.length = length = self.length - 1
+        array = self.array
+        item = array[length]
+        # Drop the reference, so popped elements can be freed.
+        array[length] = None
+        return item
+
+    def peek(self) -> T:
+        """ Returns the element at the top, without popping it from stack.
+            :pre: stack is not empty
+            :complexity: O(1)
+            :raises Exception: if the stack is empty
+        """
+        if self.length == 0:
+            raise Exception('Stack is empty')
+        return self.array[self.length - 1]
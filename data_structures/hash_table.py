@@ -7,15 +7,14 @@ __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
-from typing import TypeVar, Generic
+from typing import Callable, TypeVar, Generic, Iterable, Iterator, Sized
 from data_structures.referential_array import ArrayR
+from data_structures.hashers import Hasher, PolynomialHasher
+from data_structures.table_storage import FullError, TOMBSTONE, TupleStorage, ColumnarStorage
 
 K = TypeVar('K')
 V = TypeVar('V')
 
-class FullError(Exception):
-    pass
-
 
 class LinearProbeTable(Generic[K, V]):
     """
@@ -26,6 +25,36 @@ class LinearProbeTable(Generic[K, V]):
                 Otherwise `hash` should be overwritten.
         - V:    Value Type.
 
+    Deletion Modes:
+        - "shift":      Reinsert the rest of the cluster after a delete (default).
+        - "tombstone":  Mark the slot as deleted and reuse it on a later insert.
+                        Once tombstones exceed `tombstone_fraction` of the table,
+                        the table is rehashed in place to clear them.
+
+    With cache_hashes=True each entry is stored as (key, value, key_hash(key)).
+    Positions become key_hash(key) % table_size, so a rehash only needs a modulo,
+    and probes compare the cached hashes before comparing keys.
+    key_hash is computed by `hasher` (see data_structures/hashers.py), which
+    defaults to a polynomial hash. Passing a hasher turns cache_hashes on.
+
+    Storage Layouts (see data_structures/table_storage.py):
+        - "tuple":      A (key, value) tuple per slot (default).
+        - "columnar":   Parallel key, value and hash arrays. Always caches hashes.
+
+    Probing Modes:
+        - "linear":     Plain linear probing (default).
+        - "robin_hood": Linear probing where an insert takes the slot of any entry
+                        closer to its home, so clusters stay ordered by home
+                        position. Lookups for missing keys stop early, and
+                        deletes shift the cluster back rather than rehashing it.
+                        Needs cached hashes and "shift" deletion.
+
+    With incremental_resize=True a resize only allocates the new array. The old
+    one is kept alongside it, and every later probe first moves the key it is
+    looking for plus the next `migrate_batch` old slots across. No single
+    operation pays for the whole table. This mode always caches hashes, which
+    is how keys are found in the old array.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
@@ -34,15 +63,73 @@ class LinearProbeTable(Generic[K, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes=None) -> None:
+    DELETION_MODES = ("shift", "tombstone")
+
+    STORAGE_TYPES = {"tuple": TupleStorage, "columnar": ColumnarStorage}
+
+    PROBING_MODES = ("linear", "robin_hood")
+
+    def __init__(self, sizes=None, deletion: str = "shift", tombstone_fraction: float = 0.25,
+                 cache_hashes: bool = False, storage: str = "tuple",
+                 incremental_resize: bool = False, migrate_batch: int = 8,
+                 size_hint: int | None = None, probing: str = "linear",
+                 hasher: Hasher[K] | None = None) -> None:
         """
         Initialise the Hash Table.
+        size_hint starts the table at a size which holds that many entries without resizing.
+
+        :raises ValueError: when the deletion mode, storage layout or probing mode
+                            is unknown or Robin Hood probing is combined with tombstones,
+                            or tombstone_fraction is not strictly between 0 and 0.5,
+                            or migrate_batch is less than 2.
         """
         if sizes is not None:
             self.TABLE_SIZES = sizes
-        self.size_index = 0
-        self.array:ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
+        if deletion not in self.DELETION_MODES:
+            raise ValueError(f"Unknown deletion mode {deletion!r}.")
+        if storage not in self.STORAGE_TYPES:
+            raise ValueError(f"Unknown storage layout {storage!r}.")
+        if probing not in self.PROBING_MODES:
+            raise ValueError(f"Unknown probing mode {probing!r}.")
+        if probing == "robin_hood" and deletion == "tombstone":
+            raise ValueError("Robin Hood probing deletes by shifting, not with tombstones.")
+        # Keeping tombstones below half the table guarantees an empty slot to end every probe.
+        if not 0 < tombstone_fraction < 0.5:
+            raise ValueError("tombstone_fraction should be between 0 and 0.5.")
+        # Tables roughly double, so moving 2 slots per operation always empties
+        # the old array before the new one fills up.
+        if migrate_batch < 2:
+            raise ValueError("migrate_batch should be at least 2.")
+        self.deletion = deletion
+        self.tombstone_fraction = tombstone_fraction
+        self.robin_hood = probing == "robin_hood"
+        self.cache_hashes = (cache_hashes or hasher is not None or storage == "columnar"
+                             or incremental_resize or self.robin_hood)
+        self.hasher = hasher if hasher is not None else PolynomialHasher(self.HASH_BASE)
+        self.incremental_resize = incremental_resize
+        self.migrate_batch = migrate_batch
+        self.storage_type = self.STORAGE_TYPES[storage]
+        self.size_index = 0 if size_hint is None else self._size_index_for(size_hint)
+        self.storage = self.storage_type(self.TABLE_SIZES[self.size_index], self.cache_hashes)
         self.count = 0
+        self.tombstones = 0
+        # Array being emptied by an incremental resize, and how far through it we are.
+        self.old_storage = None
+        self.migrated = 0
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]], **kwargs) -> LinearProbeTable[K, V]:
+        """
+        Build a table from (key, value) pairs, sized for all of them up front.
+        kwargs are passed on to the constructor.
+
+        :complexity: O(N*hash(K)) with no rehashing, where N is the number of pairs.
+        """
+        if not isinstance(items, Sized):
+            items = list(items)
+        table = cls(size_hint=len(items), **kwargs)
+        table.update(items)
+        return table
 
     def hash(self, key: K) -> int:
         """
@@ -50,17 +137,46 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity: O(len(key))
         """
+        if self.cache_hashes:
+            return self.hasher(key) % self.table_size
 
         value = 0
         a = 31415
+        size = self.table_size
         for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
+            value = (ord(char) + a * value) % size
+            a = a * self.HASH_BASE % (size - 1)
         return value
 
+    def key_hash(self, key: K) -> int:
+        """
+        Full-width hash of a key from the table's hasher, independent of the table size.
+        Only used when cache_hashes is set.
+
+        :complexity: O(len(key)) for the provided string hashers.
+        """
+        return self.hasher(key)
+
     @property
     def table_size(self) -> int:
-        return len(self.array)
+        return len(self.storage)
+
+    @property
+    def array(self) -> ArrayR[tuple[K, V]]:
+        """
+        The slot array of the tuple storage layout.
+        """
+        return self.storage.array
+
+    def _home(self, key: K, key_hash: int | None) -> int:
+        """
+        First position probed for a key.
+
+        :complexity: O(1) with a cached hash, otherwise O(hash(key)).
+        """
+        if key_hash is None:
+            return self.hash(key)
+        return key_hash % self.table_size
 
     def __len__(self) -> int:
         """
@@ -77,37 +193,119 @@ class LinearProbeTable(Generic[K, V]):
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
-        # Initial position
-        position = self.hash(key)
-        for _ in range(self.table_size):
-            if self.array[position] is None:
-                # Empty spot. Am I upserting or retrieving?
-                if is_insert:
-                    return position
-                else:
-                    raise KeyError(key)
-            elif self.array[position][0] == key:
-                return position
-            else:
-                # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
+        return self._probe(key, self.hasher(key) if self.cache_hashes else None, is_insert)
 
+    def _probe(self, key: K, key_hash: int | None, is_insert: bool) -> int:
+        """
+        Linear probe for a key whose full-width hash has already been computed.
+        key_hash is None when hashes are not cached.
+
+        :complexity: See linear probe.
+        """
+        position = self._locate(key, key_hash, is_insert)
+        if position != -1:
+            return position
         if is_insert:
             raise FullError("Table is full!")
         else:
             raise KeyError(key)
 
+    def _locate(self, key: K, key_hash: int | None, is_insert: bool) -> int:
+        """
+        Probe for a key as _probe does, but return -1 instead of raising.
+
+        :complexity: See linear probe.
+        """
+        if self.old_storage is not None:
+            self._migrate(key, key_hash)
+        if self.robin_hood:
+            return self.storage.find_robin_hood(key, key_hash, self._home(key, key_hash), is_insert)
+        return self.storage.find(key, key_hash, self._home(key, key_hash), is_insert)
+
+    def _find(self, key: K) -> int:
+        """
+        Position of key, or -1 when it is not in the table.
+
+        :complexity: See linear probe.
+        """
+        return self._locate(key, self.hasher(key) if self.cache_hashes else None, False)
+
+    def _claim(self, key: K, key_hash: int | None) -> tuple[int, bool]:
+        """
+        Single insert probe for key.
+        Returns (position, found). When the key is absent the slot is made ready
+        for it and counted, and the caller must store the key there with storage.put,
+        then call _grow_if_needed.
+
+        :complexity: See linear probe. O(N) to make room in Robin Hood mode.
+        :raises FullError: when the table is full.
+        """
+        position = self._probe(key, key_hash, True)
+        current = self.storage.key_at(position)
+        if current is None:
+            self.count += 1
+        elif current is TOMBSTONE:
+            self.count += 1
+            self.tombstones -= 1
+        elif self.robin_hood and current != key:
+            # Robin Hood insertion point, taken by a richer entry.
+            if self.count == self.table_size:
+                # No empty slot to shift the cluster into.
+                raise FullError("Table is full!")
+            self.storage.shift_right(position)
+            self.count += 1
+        else:
+            return position, True
+        return position, False
+
+    def _grow_if_needed(self) -> None:
+        """
+        Resize once the table is more than half full.
+        """
+        if len(self) > self.table_size / 2:
+            self._rehash()
+
+    def _upsert(self, key: K, data: V) -> bool:
+        """
+        Set key to data with a single probe.
+        Returns True when the key was not in the table before.
+
+        :complexity: See linear probe.
+        :raises FullError: when the table cannot be resized further.
+        """
+        key_hash = self.hasher(key) if self.cache_hashes else None
+        position, found = self._claim(key, key_hash)
+        self.storage.put(position, key, data, key_hash)
+        if not found:
+            self._grow_if_needed()
+        return not found
+
+    def _get_or_insert(self, key: K, factory: Callable[[], V]) -> V:
+        """
+        Returns the value at key. When the key is absent, factory() is stored
+        there first and returned. Only one probe is made either way.
+
+        :complexity: See linear probe, plus the cost of factory when inserting.
+        :raises FullError: when the table cannot be resized further.
+        """
+        key_hash = self.hasher(key) if self.cache_hashes else None
+        position, found = self._claim(key, key_hash)
+        if found:
+            return self.storage.value_at(position)
+        value = factory()
+        self.storage.put(position, key, value, key_hash)
+        self._grow_if_needed()
+        return value
+
     def keys(self) -> list[K]:
         """
         Returns all keys in the hash table.
 
         :complexity: O(N) where N is self.table_size.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][0])
-        return res
+        if self.old_storage is None:
+            return self.storage.keys()
+        return self.storage.keys() + self.old_storage.keys()
 
     def values(self) -> list[V]:
         """
@@ -115,11 +313,41 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity: O(N) where N is self.table_size.
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][1])
-        return res
+        if self.old_storage is None:
+            return self.storage.values()
+        return self.storage.values() + self.old_storage.values()
+
+    def __iter__(self) -> Iterator[K]:
+        """
+        Iterates over all keys in the hash table.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        return iter(self.keys())
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Iterates over all (key, value) pairs, reading the table as it goes.
+        Stops as soon as len(self) pairs have been yielded, so the empty slots
+        after the last entry are never scanned.
+
+        :complexity: O(N) where N is self.table_size.
+        """
+        if self.count == 0:
+            return
+        seen = 0
+        old_storage = self.old_storage
+        for key, value, _ in self.storage.items():
+            yield key, value
+            seen += 1
+            if seen >= self.count:
+                return
+        if old_storage is not None:
+            for key, value, _ in old_storage.items():
+                yield key, value
+                seen += 1
+                if seen >= self.count:
+                    return
 
     def __contains__(self, key: K) -> bool:
         """
@@ -127,12 +355,7 @@ class LinearProbeTable(Generic[K, V]):
 
         :complexity: See linear probe.
         """
-        try:
-            _ = self[key]
-        except KeyError:
-            return False
-        else:
-            return True
+        return self._find(key) != -1
 
     def __getitem__(self, key: K) -> V:
         """
@@ -142,7 +365,18 @@ class LinearProbeTable(Generic[K, V]):
         :raises KeyError: when the key doesn't exist.
         """
         position = self._linear_probe(key, False)
-        return self.array[position][1]
+        return self.storage.value_at(position)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Returns the value at key, or default when the key doesn't exist.
+
+        :complexity: See linear probe.
+        """
+        position = self._find(key)
+        if position == -1:
+            return default
+        return self.storage.value_at(position)
 
     def __setitem__(self, key: K, data: V) -> None:
         """
@@ -151,64 +385,191 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: See linear probe.
         :raises FullError: when the table cannot be resized further.
         """
-
-        position = self._linear_probe(key, True)
-
-        if self.array[position] is None:
-            self.count += 1
-
-        self.array[position] = (key, data)
-
-        if len(self) > self.table_size / 2:
-            self._rehash()
+        self._upsert(key, data)
 
     def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
 
+        In tombstone mode the slot is only marked as deleted, unless the next
+        slot is empty and so no probe chain runs through it.
+
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
         :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+                           O(hash(key) + N*comp(K)) in tombstone mode.
         :raises KeyError: when the key doesn't exist.
         """
         position = self._linear_probe(key, False)
-        # Remove the element
-        self.array[position] = None
+        storage = self.storage
         self.count -= 1
+        if self.deletion == "tombstone":
+            if storage.key_at((position + 1) % self.table_size) is None:
+                storage.clear(position)
+            else:
+                storage.mark_deleted(position)
+                self.tombstones += 1
+                if self.tombstones > self.tombstone_fraction * self.table_size:
+                    self._rehash(grow=False)
+            return
+        # Remove the element
+        storage.clear(position)
+        if self.robin_hood:
+            storage.backward_shift(position)
+            return
         # Start moving over the cluster
         position = (position + 1) % self.table_size
-        while self.array[position] is not None:
-            key2, value = self.array[position]
-            self.array[position] = None
+        while storage.key_at(position) is not None:
+            key2, value, key_hash = storage.take(position)
             # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
+            self._place(key2, value, key_hash)
             position = (position + 1) % self.table_size
 
+    def update(self, items: Iterable[tuple[K, V]]) -> None:
+        """
+        Insert many (key, value) pairs.
+        The table is resized at most once, before inserting, to fit every pair.
+
+        :complexity: O(M + N*hash(K)) where M is the new table size and N the number of pairs.
+        """
+        if not isinstance(items, Sized):
+            items = list(items)
+        target = self._size_index_for(len(self) + len(items))
+        if target > self.size_index:
+            self.size_index = target
+            self._rebuild()
+        for key, value in items:
+            self[key] = value
+
+    def _size_index_for(self, count: int) -> int:
+        """
+        Smallest index into TABLE_SIZES whose table holds count entries without a resize.
+        :complexity: O(len(TABLE_SIZES))
+        """
+        for index, size in enumerate(self.TABLE_SIZES):
+            if count <= size / 2:
+                return index
+        return len(self.TABLE_SIZES) - 1
+
+    def probe_stats(self) -> tuple[float, int]:
+        """
+        Returns the mean and the longest probe length of a successful lookup,
+        over the keys in the current array. A key in its home slot has probe length 1.
+
+        :complexity: O(N) where N is self.table_size, plus hashing when hashes are not cached.
+        """
+        storage = self.storage
+        size = self.table_size
+        total = longest = entries = 0
+        for position in storage.occupied_positions():
+            key = storage.key_at(position)
+            length = (position - self._home(key, storage.hash_at(position))) % size + 1
+            total += length
+            longest = max(longest, length)
+            entries += 1
+        return (total / entries if entries else 0.0), longest
+
     def is_empty(self) -> bool:
         return self.count == 0
 
     def is_full(self) -> bool:
         return self.count == self.table_size
 
-    def _rehash(self) -> None:
+    def _rehash(self, grow: bool = True) -> None:
         """
-        Need to resize table and reinsert all values
+        Need to resize table and reinsert all values.
+        With grow=False the table keeps its size, which just clears tombstones.
 
         :complexity best: O(N*hash(K)) No probing.
         :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
         Where N is len(self)
+        In incremental mode this is O(N) where N is the new table size, as the
+        entries are moved over by later operations.
         """
-        old_array = self.array
-        self.size_index += 1
-        if self.size_index == len(self.TABLE_SIZES):
-            # Cannot be resized further.
+        if grow:
+            if self.size_index + 1 == len(self.TABLE_SIZES):
+                # Cannot be resized further. size_index stays on the last size,
+                # which a later same-size rehash still has to index.
+                return
+            self.size_index += 1
+        if self.incremental_resize:
+            self._finish_migration()
+            self.old_storage = self.storage
+            self.migrated = 0
+            self.storage = self.storage_type(self.TABLE_SIZES[self.size_index], self.cache_hashes)
+            self.tombstones = 0
             return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """
+        Reinsert every entry into a new array of size TABLE_SIZES[size_index],
+        finishing any incremental resize first.
+
+        :complexity: See rehash.
+        """
+        self._finish_migration()
+        old_storage = self.storage
+        self.storage = self.storage_type(self.TABLE_SIZES[self.size_index], self.cache_hashes)
         self.count = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+        self.tombstones = 0
+        for key, value, key_hash in old_storage.items():
+            self._place(key, value, key_hash)
+            self.count += 1
+
+    def _place(self, key: K, value: V, key_hash: int | None) -> None:
+        """
+        Store a key known to be absent from the current array, without resizing.
+        :complexity: O(hash(K) + N) worst case, O(N) with cached hashes.
+        """
+        home = self._home(key, key_hash)
+        if self.robin_hood:
+            position = self.storage.find_robin_hood(key, key_hash, home, True)
+            if self.storage.key_at(position) is not None:
+                self.storage.shift_right(position)
+            self.storage.put(position, key, value, key_hash)
+        else:
+            self.storage.place(key, value, key_hash, home)
+
+    def _migrate(self, key: K, key_hash: int) -> None:
+        """
+        One step of an incremental resize: moves key across if it is still in
+        the old array, then the next migrate_batch slots.
+
+        :complexity: O(migrate_batch + P) where P is the probe length of key in the old array.
+        """
+        old_storage = self.old_storage
+        position = old_storage.find(key, key_hash, key_hash % len(old_storage), False)
+        if position != -1:
+            self._move_from_old(position)
+        end = min(self.migrated + self.migrate_batch, len(old_storage))
+        for position in range(self.migrated, end):
+            self._move_from_old(position)
+        self.migrated = end
+        if end == len(old_storage):
+            self.old_storage = None
+
+    def _move_from_old(self, position: int) -> None:
+        """
+        Moves an old array slot into the current array.
+        The old slot becomes a tombstone, so probes for the keys still left
+        in the old array carry on past it.
+        """
+        current = self.old_storage.key_at(position)
+        if current is not None and current is not TOMBSTONE:
+            key, value, key_hash = self.old_storage.take(position)
+            self.old_storage.mark_deleted(position)
+            self._place(key, value, key_hash)
+
+    def _finish_migration(self) -> None:
+        """
+        Moves everything left in the old array.
+        :complexity: O(N) where N is the old table size.
+        """
+        if self.old_storage is None:
+            return
+        for position in self.old_storage.occupied_positions(self.migrated):
+            self._move_from_old(position)
+        self.old_storage = None
 
     def __str__(self) -> str:
         """
@@ -217,8 +578,6 @@ class LinearProbeTable(Generic[K, V]):
         :complexity: O(N * (str(key) + str(value))) where N is the table size
         """
         result = ""
-        for item in self.array:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for key, value in self.iter_items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
         return result
@@ -0,0 +1,110 @@
+""" Hash functions for string keys.
+
+A hasher maps a key to a full-width hash in [0, 2**61), which does not depend
+on the size of the table it is stored in. Tables take the hash modulo their
+size to get a position. That lets them cache it with the entry (see
+LinearProbeTable's cache_hashes).
+
+Available hashers:
+    - PolynomialHasher: The per-character polynomial hash the tables have always used,
+                        modulo a Mersenne prime. Stable across runs.
+    - BuiltinHasher:    Python's builtin `hash`. Fastest, but string hashes are salted
+                        per process unless PYTHONHASHSEED is set.
+    - BytesHasher:      Reads the UTF-8 encoded key as one integer and reduces it
+                        modulo the Mersenne prime, all inside int.from_bytes and %.
+                        Stable across runs.
+    - Crc32Hasher:      zlib.crc32 of the UTF-8 encoded key. Stable across runs, but only
+                        32 bits wide.
+
+`python -m benchmarks.bench_hashers` compares their speed and distribution.
+"""
+from __future__ import annotations
+
+import zlib
+from abc import ABC, abstractmethod
+from typing import Generic, TypeVar
+
+K = TypeVar('K')
+
+# Mersenne prime bounding every full-width hash.
+HASH_MODULUS = (1 << 61) - 1
+
+
+class Hasher(ABC, Generic[K]):
+    """ Abstract hasher. Subclasses set `name` and implement __call__. """
+
+    name = "abstract"
+
+    # Whether the same key hashes the same way in every process.
+    stable = True
+
+    @abstractmethod
+    def __call__(self, key: K) -> int:
+        """ Returns the full-width hash of key, in [0, HASH_MODULUS]. """
+        pass
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class PolynomialHasher(Hasher[str]):
+    """
+    Horner's rule over the characters of the key, modulo HASH_MODULUS.
+    """
+
+    name = "polynomial"
+
+    def __init__(self, base: int = 31) -> None:
+        self.base = base
+
+    def __call__(self, key: str) -> int:
+        """ :complexity: O(len(key)) """
+        value = 0
+        base = self.base
+        for char in key:
+            value = (value * base + ord(char)) % HASH_MODULUS
+        return value
+
+    def __repr__(self) -> str:
+        return f"PolynomialHasher({self.base})"
+
+
+class BuiltinHasher(Hasher[K]):
+    """
+    Python's builtin hash, truncated to 61 bits. Works for any hashable key.
+    """
+
+    name = "builtin"
+    stable = False
+
+    def __call__(self, key: K) -> int:
+        """ :complexity: O(len(key)) the first time a string is hashed, O(1) after. """
+        return hash(key) & HASH_MODULUS
+
+
+class BytesHasher(Hasher[str]):
+    """
+    The UTF-8 bytes of the key read as one little-endian integer, modulo HASH_MODULUS.
+    This is a base 256 polynomial hash, evaluated by the int implementation.
+    """
+
+    name = "bytes"
+
+    def __call__(self, key: str) -> int:
+        """ :complexity: O(len(key)) """
+        return int.from_bytes(key.encode(), "little") % HASH_MODULUS
+
+
+class Crc32Hasher(Hasher[str]):
+    """
+    CRC-32 of the UTF-8 bytes of the key.
+    """
+
+    name = "crc32"
+
+    def __call__(self, key: str) -> int:
+        """ :complexity: O(len(key)) """
+        return zlib.crc32(key.encode())
+
+
+HASHERS = {hasher.name: hasher for hasher in (PolynomialHasher, BuiltinHasher, BytesHasher, Crc32Hasher)}
@@ -13,6 +13,9 @@ class Node(Generic[T]):
             link (Node[T]): reference to the next node
     """
 
+    # No per-node __dict__: a stack of a million nodes is a million of these.
+    __slots__ = ('item', 'link')
+
     def __init__(self, item: T = None) -> None:
         """ Object initializer. """
         self.item = item
@@ -12,15 +12,42 @@ space to hold the references.
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
+
+A ctypes py_object array does not own the references in its buffer: every
+object stored through it is kept alive by an entry in the array's private
+`_objects` dict. None is never freed, so a buffer of pointers to None needs
+no such entry. __init__ therefore copies a ready-made buffer of None
+pointers (built with a single bytes multiplication) instead of assigning
+None to every slot, and fill(None) does the same and drops the old entries.
 """
+from __future__ import annotations
+
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
-from ctypes import py_object
-from typing import TypeVar, Generic
+import sys
+from ctypes import memmove, py_object, sizeof
+from itertools import chain
+from typing import TypeVar, Generic, Iterator
 
 T = TypeVar('T')
 
+# One pointer to None, as raw bytes.
+_NONE_POINTER = id(None).to_bytes(sizeof(py_object), sys.byteorder)
+
+# Slots read at a time by iteration. Reading a ctypes slice builds the list
+# in C, where reading one slot at a time goes through the generic item getter.
+ITER_CHUNK = 1024
+
+
+def _iter_slots(array, start: int, stop: int) -> Iterator:
+    """ Iterates over array[start:stop] one chunk at a time.
+    Writes to slots in a chunk that has already been read are not seen.
+    :complexity: O(stop - start)
+    """
+    return chain.from_iterable(array[chunk:min(chunk + ITER_CHUNK, stop)]
+                               for chunk in range(start, stop, ITER_CHUNK))
+
 
 class ArrayR(Generic[T]):
     def __init__(self, length: int) -> None:
@@ -30,8 +57,8 @@ class ArrayR(Generic[T]):
         """
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
-        self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        # initialises the space, with every slot pointing at None
+        self.array = (length * py_object).from_buffer_copy(_NONE_POINTER * length)
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -53,3 +80,90 @@ class ArrayR(Generic[T]):
         """
         self.array[index] = value
 
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the objects in order, ITER_CHUNK slots at a time.
+        Each chunk is read when iteration reaches it, so a write made during
+        iteration is only seen if it lands in a chunk not read yet.
+        :complexity: O(length)
+        """
+        return _iter_slots(self.array, 0, len(self.array))
+
+    def fill(self, value: T) -> None:
+        """ Sets every position to value.
+        :complexity: O(length), as a memory copy when value is None
+        """
+        if value is None:
+            memmove(self.array, _NONE_POINTER * len(self.array), sizeof(self.array))
+            if self.array._objects:
+                self.array._objects.clear()
+        else:
+            self.array[:] = [value] * len(self.array)
+
+    def copy_from(self, source: ArrayR[T] | ArrayView[T], start: int = 0) -> None:
+        """ Copies every object of source into this array, from position start on.
+        :complexity: O(len(source))
+        :raises IndexError: when source does not fit from start on
+        """
+        if start + len(source) > len(self.array):
+            raise IndexError("Source does not fit in the array.")
+        self.array[start:start + len(source)] = source.to_list()
+
+    def to_list(self) -> list[T]:
+        """ Returns the objects as a list.
+        :complexity: O(length)
+        """
+        return self.array[:]
+
+    def view(self, start: int, stop: int) -> ArrayView[T]:
+        """ Returns a view of positions start to stop - 1, sharing this array's slots.
+        :complexity: O(1)
+        :pre: 0 <= start <= stop <= length
+        """
+        if not 0 <= start <= stop <= len(self.array):
+            raise IndexError("View out of range.")
+        return ArrayView(self, start, stop)
+
+
+class ArrayView(Generic[T]):
+    """ A window onto part of an ArrayR. Nothing is copied: reads and
+    writes go straight to the underlying array.
+    """
+
+    def __init__(self, array: ArrayR[T], start: int, stop: int) -> None:
+        self.base = array
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        """ :complexity: O(1) """
+        return self.stop - self.start
+
+    def _position(self, index: int) -> int:
+        if not 0 <= index < self.stop - self.start:
+            raise IndexError("View index out of range.")
+        return self.start + index
+
+    def __getitem__(self, index: int) -> T:
+        """ :complexity: O(1) """
+        return self.base.array[self._position(index)]
+
+    def __setitem__(self, index: int, value: T) -> None:
+        """ :complexity: O(1) """
+        self.base.array[self._position(index)] = value
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the view's objects in order. Writes made during iteration
+        are seen as in ArrayR.__iter__, one chunk at a time.
+        :complexity: O(len(self))
+        """
+        return _iter_slots(self.base.array, self.start, self.stop)
+
+    def to_list(self) -> list[T]:
+        """ :complexity: O(len(self)) """
+        return self.base.array[self.start:self.stop]
+
+    def view(self, start: int, stop: int) -> ArrayView[T]:
+        """ :complexity: O(1) """
+        if not 0 <= start <= stop <= len(self):
+            raise IndexError("View out of range.")
+        return ArrayView(self.base, self.start + start, self.start + stop)
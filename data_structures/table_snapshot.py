@@ -0,0 +1,285 @@
+""" Binary snapshots of LinearProbeTables that load through mmap.
+
+A snapshot section stores one table exactly as it sits in memory: its size,
+where it is in TABLE_SIZES, and every slot at its current position. Loading
+a section does not rehash or even read the slots. MappedStorage answers
+probes straight from the mapped file. Keys are decoded only when they are
+compared, and values only the first time they are read.
+
+Section layout, all integers native 64-bit:
+    - header:   size, size_index, count, tombstones, cache_hashes
+    - states:   one byte per slot, EMPTY_SLOT, LIVE_SLOT or DELETED_SLOT,
+                padded to a multiple of 8 bytes
+    - hashes:   one int per slot, only when cache_hashes is set
+    - spans:    three absolute file offsets per slot, where its key starts,
+                where its value starts and where its value ends
+    - blobs:    every slot's UTF-8 key followed by its encoded value
+
+Only string keys are supported, and values are encoded by the caller.
+Snapshots are only as trustworthy as the file they are read from, since
+decoding may unpickle values.
+"""
+from __future__ import annotations
+
+from array import array
+from mmap import mmap
+from typing import BinaryIO, Callable, Iterator, TypeVar
+
+from data_structures.table_storage import SlotStorage, TOMBSTONE
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+EMPTY_SLOT = 0
+LIVE_SLOT = 1
+DELETED_SLOT = 2
+
+# Turns the state bytes into an occupancy map.
+_OCCUPANCY = bytes([0, 1, 0]) + bytes(253)
+
+HEADER_FIELDS = 5
+WORD = 8
+
+
+def _pad(file: BinaryIO) -> None:
+    """ Pads the file with zeros to the next multiple of WORD. """
+    file.write(bytes(-file.tell() % WORD))
+
+
+def write_table(file: BinaryIO, table, encode_value: Callable[[V], bytes]) -> int:
+    """
+    Writes a LinearProbeTable as a section at the end of file.
+    Returns the file offset of the section.
+
+    :raises ValueError: when a key is not a string or the table uses Robin Hood probing.
+    :complexity: O(N + sum of encoded sizes) where N is the table size.
+    """
+    if table.robin_hood:
+        raise ValueError("Robin Hood tables cannot be snapshotted.")
+    table._finish_migration()
+    storage = table.storage
+    size = len(storage)
+
+    states = bytearray(size)
+    hashes = array('q', bytes(size * WORD)) if table.cache_hashes else None
+    blobs = []
+    for position in range(size):
+        key = storage.key_at(position)
+        if key is None:
+            continue
+        if key is TOMBSTONE:
+            states[position] = DELETED_SLOT
+            continue
+        if not isinstance(key, str):
+            raise ValueError(f"Snapshots need string keys, not {type(key).__name__}.")
+        states[position] = LIVE_SLOT
+        if hashes is not None:
+            hashes[position] = storage.hash_at(position)
+        blobs.append((position, key.encode(), encode_value(storage.value_at(position))))
+
+    _pad(file)
+    offset = file.tell()
+    array('q', [size, table.size_index, table.count, table.tombstones, int(table.cache_hashes)]).tofile(file)
+    file.write(states)
+    _pad(file)
+    if hashes is not None:
+        hashes.tofile(file)
+    spans = array('q', bytes(3 * size * WORD))
+    cursor = file.tell() + len(spans) * WORD
+    for position, key, value in blobs:
+        spans[3 * position] = cursor
+        spans[3 * position + 1] = cursor + len(key)
+        spans[3 * position + 2] = cursor = cursor + len(key) + len(value)
+    spans.tofile(file)
+    for _, key, value in blobs:
+        file.write(key)
+        file.write(value)
+    return offset
+
+
+def map_table(table, mapped: mmap, offset: int, decode_value: Callable[[memoryview], V]) -> None:
+    """
+    Points an empty LinearProbeTable at the section starting at offset.
+    table must hash keys the same way as the table that was written.
+
+    :raises ValueError: when the section does not match the table's sizes or hash caching.
+    :complexity: O(N) to build the occupancy map, where N is the table size.
+    """
+    view = memoryview(mapped)
+    size, size_index, count, tombstones, cache_hashes = view[offset:offset + HEADER_FIELDS * WORD].cast('q')
+    if size_index >= len(table.TABLE_SIZES) or table.TABLE_SIZES[size_index] != size:
+        raise ValueError("Snapshot table size does not match the table sizes.")
+    if bool(cache_hashes) != table.cache_hashes:
+        raise ValueError("Snapshot hash caching does not match the table.")
+    table.size_index = size_index
+    table.count = count
+    table.tombstones = tombstones
+    table.old_storage = None
+    table.storage = MappedStorage(table, view, offset + HEADER_FIELDS * WORD, size, bool(cache_hashes),
+                                  decode_value)
+
+
+class MappedStorage(SlotStorage[K, V]):
+    """
+    Read-only slot storage over a snapshot section.
+
+    The first write copies every slot into a storage of the table's own
+    layout, at the same positions, and points the table at it. Any later
+    call on this object is passed on to that copy.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, table, view: memoryview, offset: int, size: int, cache_hashes: bool,
+                 decode_value: Callable[[memoryview], V]) -> None:
+        self.table = table
+        self.view = view
+        self.size = size
+        self.cache_hashes = cache_hashes
+        self.decode_value = decode_value
+        self.states = view[offset:offset + size]
+        self.occupied = bytearray(self.states.tobytes().translate(_OCCUPANCY))
+        offset += size + (-size % WORD)
+        self.hashes = None
+        if cache_hashes:
+            self.hashes = view[offset:offset + size * WORD].cast('q')
+            offset += size * WORD
+        self.spans = view[offset:offset + 3 * size * WORD].cast('q')
+        # Decoded values, so mutable values keep their changes.
+        self.decoded: dict[int, V] = {}
+        self.materialised = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _key_bytes(self, position: int) -> memoryview:
+        start = 3 * position
+        return self.view[self.spans[start]:self.spans[start + 1]]
+
+    def find(self, key: K, key_hash: int | None, position: int, is_insert: bool) -> int:
+        """
+        Linear probe from position. See TupleStorage.find.
+        Keys are compared as UTF-8 bytes, after their cached hashes when there are any.
+
+        :complexity best: O(len(key)) first position is empty or the key.
+        :complexity worst: O(len(key) + N*len(key)) where N is the table size.
+        """
+        if self.materialised is not None:
+            return self.materialised.find(key, key_hash, position, is_insert)
+        states, hashes, size = self.states, self.hashes, self.size
+        encoded = key.encode() if isinstance(key, str) else None
+        first_free = -1
+        for _ in range(size):
+            state = states[position]
+            if state == EMPTY_SLOT:
+                if is_insert and first_free == -1:
+                    return position
+                return first_free if is_insert else -1
+            elif state == DELETED_SLOT:
+                if first_free == -1:
+                    first_free = position
+            elif (encoded is not None and (hashes is None or hashes[position] == key_hash)
+                  and self._key_bytes(position) == encoded):
+                return position
+            position += 1
+            if position == size:
+                position = 0
+        return first_free if is_insert else -1
+
+    def key_at(self, position: int) -> K | None:
+        if self.materialised is not None:
+            return self.materialised.key_at(position)
+        state = self.states[position]
+        if state == EMPTY_SLOT:
+            return None
+        if state == DELETED_SLOT:
+            return TOMBSTONE
+        return str(self._key_bytes(position), "utf-8")
+
+    def value_at(self, position: int) -> V:
+        """ :complexity: O(decode) the first time a slot is read, O(1) after. """
+        if self.materialised is not None:
+            return self.materialised.value_at(position)
+        try:
+            return self.decoded[position]
+        except KeyError:
+            start = 3 * position
+            value = self.decode_value(self.view[self.spans[start + 1]:self.spans[start + 2]])
+            self.decoded[position] = value
+            return value
+
+    def hash_at(self, position: int) -> int | None:
+        if self.materialised is not None:
+            return self.materialised.hash_at(position)
+        return self.hashes[position] if self.cache_hashes else None
+
+    def items(self) -> Iterator[tuple[K, V, int | None]]:
+        """
+        Yields (key, value, key_hash) for every occupied slot, decoding as it goes.
+        :complexity: See occupied_positions.
+        """
+        if self.materialised is not None:
+            yield from self.materialised.items()
+            return
+        for position in self.occupied_positions():
+            yield self.key_at(position), self.value_at(position), self.hash_at(position)
+
+    def keys(self) -> list[K]:
+        """ :complexity: See occupied_positions. """
+        return [key for key, _, _ in self.items()]
+
+    def values(self) -> list[V]:
+        """ :complexity: See occupied_positions. """
+        return [value for _, value, _ in self.items()]
+
+    def materialise(self) -> SlotStorage[K, V]:
+        """
+        Copies every slot into the table's own storage layout and points the
+        table at the copy. Returns the copy.
+        :complexity: O(N) plus decoding every value not read yet, where N is the table size.
+        """
+        if self.materialised is None:
+            storage = self.table.storage_type(self.size, self.cache_hashes)
+            for position in range(self.size):
+                state = self.states[position]
+                if state == LIVE_SLOT:
+                    storage.put(position, self.key_at(position), self.value_at(position), self.hash_at(position))
+                elif state == DELETED_SLOT:
+                    storage.mark_deleted(position)
+            self.materialised = storage
+            if self.table.storage is self:
+                self.table.storage = storage
+            self.decoded = {}
+        return self.materialised
+
+    def release(self) -> None:
+        """
+        Copies every slot out of the file (see materialise) and releases the views
+        into it, so the file can be unmapped. Later calls go to the copy.
+        :complexity: See materialise.
+        """
+        self.materialise()
+        for view in (self.spans, self.hashes, self.states, self.view):
+            if view is not None:
+                view.release()
+        self.view = self.states = self.hashes = self.spans = None
+
+    def put(self, position: int, key: K, value: V, key_hash: int | None) -> None:
+        self.materialise().put(position, key, value, key_hash)
+
+    def clear(self, position: int) -> None:
+        self.materialise().clear(position)
+
+    def mark_deleted(self, position: int) -> None:
+        self.materialise().mark_deleted(position)
+
+    def take(self, position: int) -> tuple[K, V, int | None]:
+        return self.materialise().take(position)
+
+    def place(self, key: K, value: V, key_hash: int | None, position: int) -> None:
+        self.materialise().place(key, value, key_hash, position)
+
+    def occupied_positions(self, start: int = 0) -> Iterator[int]:
+        if self.materialised is not None:
+            return self.materialised.occupied_positions(start)
+        return SlotStorage.occupied_positions(self, start)
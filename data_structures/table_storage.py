@@ -0,0 +1,435 @@
+""" Slot storage for LinearProbeTable.
+
+A LinearProbeTable decides where keys go (hashing, probing, deletion and
+resizing). The storage classes here only hold the slots and scan them.
+
+Two layouts are provided:
+    - TupleStorage:     one ArrayR holding a (key, value) tuple per slot, or
+                        (key, value, key_hash) when hashes are cached.
+    - ColumnarStorage:  parallel key and value columns plus a machine-integer
+                        array of hashes. Probes only read the hash array until
+                        a hash matches, and no tuple is allocated per insert.
+
+Positions are plain ints. Both layouts report empty slots as None and
+deleted slots as TOMBSTONE through `key_at`.
+
+Both layouts also keep an occupancy map: a bytearray holding 1 for every
+slot with a live entry. Iteration jumps between occupied slots with
+bytearray.find rather than testing every slot in Python.
+
+The Robin Hood methods keep every cluster ordered by home position, where
+an entry's home is key_hash % table size. They need cached hashes and a
+table without tombstones.
+"""
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from typing import TypeVar, Generic, Iterator
+
+from data_structures.referential_array import ArrayR
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class FullError(Exception):
+    pass
+
+
+# Marker left in a slot by tombstone deletion. It keeps probe chains intact
+# and is reused by the next insert that passes over it.
+TOMBSTONE = object()
+
+
+class SlotStorage(Generic[K, V]):
+    """
+    Occupancy map shared by the storage layouts.
+    Subclasses keep `occupied[position]` at 1 exactly when the slot holds a live entry.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.occupied = bytearray(size)
+
+    def occupied_positions(self, start: int = 0) -> Iterator[int]:
+        """
+        Yields the position of every live entry from start onwards, in order.
+        The map is read as the iteration goes.
+
+        :complexity: O(N/W + M) where N is the table size, M the number of
+                     entries and W the bytes bytearray.find scans per step.
+        """
+        find = self.occupied.find
+        position = find(1, start)
+        while position != -1:
+            yield position
+            position = find(1, position + 1)
+
+
+class TupleStorage(SlotStorage[K, V]):
+    """
+    Slots are tuples inside a single ArrayR.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, size: int, cache_hashes: bool = False) -> None:
+        SlotStorage.__init__(self, size)
+        self.array: ArrayR[tuple] = ArrayR(size)
+        self.cache_hashes = cache_hashes
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def find(self, key: K, key_hash: int | None, position: int, is_insert: bool) -> int:
+        """
+        Linear probe from position.
+        Returns the slot holding key. Otherwise returns the first free slot
+        when inserting, or -1 when retrieving or when no slot is free.
+
+        :complexity best: O(comp(K)) first position is empty or the key.
+        :complexity worst: O(N*comp(K)) where N is the table size.
+        """
+        slots = self.array
+        size = len(slots)
+        # First tombstone passed, reused if the key turns out to be absent.
+        first_free = -1
+        for _ in range(size):
+            entry = slots[position]
+            if entry is None:
+                # Empty spot. Am I upserting or retrieving?
+                if is_insert and first_free == -1:
+                    return position
+                return first_free if is_insert else -1
+            elif entry is TOMBSTONE:
+                if first_free == -1:
+                    first_free = position
+            elif (key_hash is None or entry[2] == key_hash) and entry[0] == key:
+                return position
+            # Taken by something else. Time to linear probe.
+            position += 1
+            if position == size:
+                position = 0
+        return first_free if is_insert else -1
+
+    def key_at(self, position: int) -> K | None:
+        entry = self.array[position]
+        if entry is None or entry is TOMBSTONE:
+            return entry
+        return entry[0]
+
+    def value_at(self, position: int) -> V:
+        return self.array[position][1]
+
+    def hash_at(self, position: int) -> int | None:
+        return self.array[position][2] if self.cache_hashes else None
+
+    def put(self, position: int, key: K, value: V, key_hash: int | None) -> None:
+        self.array[position] = (key, value) if key_hash is None else (key, value, key_hash)
+        self.occupied[position] = 1
+
+    def clear(self, position: int) -> None:
+        self.array[position] = None
+        self.occupied[position] = 0
+
+    def mark_deleted(self, position: int) -> None:
+        self.array[position] = TOMBSTONE
+        self.occupied[position] = 0
+
+    def take(self, position: int) -> tuple[K, V, int | None]:
+        """ Empties a slot, returning its (key, value, key_hash). """
+        entry = self.array[position]
+        self.clear(position)
+        return entry[0], entry[1], entry[2] if self.cache_hashes else None
+
+    def place(self, key: K, value: V, key_hash: int | None, position: int) -> None:
+        """
+        Store a key known to be absent in the first empty slot from position.
+        :complexity: O(N) worst case, where N is the table size.
+        """
+        slots = self.array
+        size = len(slots)
+        while slots[position] is not None:
+            position += 1
+            if position == size:
+                position = 0
+        slots[position] = (key, value) if key_hash is None else (key, value, key_hash)
+        self.occupied[position] = 1
+
+    def find_robin_hood(self, key: K, key_hash: int, position: int, is_insert: bool) -> int:
+        """
+        Robin Hood probe from the key's home position.
+        Returns the slot holding key. Otherwise returns the slot the key should
+        be inserted at when inserting, or -1 when retrieving. The search stops
+        at the first entry closer to its home than the key would be.
+
+        :complexity best: O(comp(K)) first position is empty or the key.
+        :complexity worst: O(N*comp(K)) where N is the table size.
+        """
+        slots = self.array
+        size = len(slots)
+        distance = 0
+        for _ in range(size):
+            entry = slots[position]
+            if entry is None:
+                return position if is_insert else -1
+            elif entry[2] == key_hash and entry[0] == key:
+                return position
+            elif (position - entry[2]) % size < distance:
+                # A richer entry: the key would have displaced it.
+                return position if is_insert else -1
+            distance += 1
+            position += 1
+            if position == size:
+                position = 0
+        return -1
+
+    def shift_right(self, position: int) -> None:
+        """
+        Moves the entries from position up to the next empty slot along by one,
+        leaving position empty.
+        :complexity: O(N) worst case, where N is the table size.
+        """
+        slots = self.array
+        size = len(slots)
+        end = position
+        while slots[end] is not None:
+            end = (end + 1) % size
+        while end != position:
+            previous = end - 1 if end else size - 1
+            slots[end] = slots[previous]
+            self.occupied[end] = 1
+            end = previous
+        self.clear(position)
+
+    def backward_shift(self, position: int) -> None:
+        """
+        Fills the empty slot at position by moving the following entries back
+        by one, until an empty slot or an entry already at its home.
+        :complexity: O(N) worst case, where N is the table size.
+        """
+        slots = self.array
+        size = len(slots)
+        following = (position + 1) % size
+        entry = slots[following]
+        while entry is not None and (following - entry[2]) % size != 0:
+            slots[position] = entry
+            self.occupied[position] = 1
+            self.clear(following)
+            position = following
+            following = (following + 1) % size
+            entry = slots[following]
+
+    def items(self) -> Iterator[tuple[K, V, int | None]]:
+        """
+        Yields (key, value, key_hash) for every occupied slot.
+        :complexity: See occupied_positions.
+        """
+        slots = self.array
+        cache_hashes = self.cache_hashes
+        for position in self.occupied_positions():
+            entry = slots[position]
+            yield entry[0], entry[1], entry[2] if cache_hashes else None
+
+    def keys(self) -> list[K]:
+        """ :complexity: See occupied_positions. """
+        slots = self.array
+        return [slots[position][0] for position in self.occupied_positions()]
+
+    def values(self) -> list[V]:
+        """ :complexity: See occupied_positions. """
+        slots = self.array
+        return [slots[position][1] for position in self.occupied_positions()]
+
+
+class ColumnarStorage(SlotStorage[K, V]):
+    """
+    Slots are split over parallel key, value and hash arrays.
+    Hashes always have to be cached, as the hash array also marks free slots.
+
+    The key and value columns are fixed-size Python lists rather than ArrayRs:
+    a ctypes py_object array keeps every stored reference alive in a dict on
+    the side, which costs around 90 bytes per slot written.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    # Hash array markers. Real hashes are never negative.
+    EMPTY = -1
+    DELETED = -2
+
+    def __init__(self, size: int, cache_hashes: bool = True) -> None:
+        if not cache_hashes:
+            raise ValueError("Columnar storage needs cached hashes.")
+        SlotStorage.__init__(self, size)
+        self.key_array: list[K | None] = [None] * size
+        self.value_array: list[V | None] = [None] * size
+        self.hashes = array('q', [self.EMPTY]) * size
+        self.cache_hashes = True
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def find(self, key: K, key_hash: int, position: int, is_insert: bool) -> int:
+        """
+        Linear probe from position. See TupleStorage.find.
+        Keys are only compared once their hashes match.
+
+        :complexity best: O(1) first position is empty.
+        :complexity worst: O(N + M*comp(K)) where N is the table size
+                           and M the number of matching hashes.
+        """
+        hashes = self.hashes
+        size = len(hashes)
+        first_free = -1
+        for _ in range(size):
+            slot_hash = hashes[position]
+            if slot_hash == key_hash:
+                if self.key_array[position] == key:
+                    return position
+            elif slot_hash == self.EMPTY:
+                if is_insert and first_free == -1:
+                    return position
+                return first_free if is_insert else -1
+            elif slot_hash == self.DELETED and first_free == -1:
+                first_free = position
+            position += 1
+            if position == size:
+                position = 0
+        return first_free if is_insert else -1
+
+    def key_at(self, position: int) -> K | None:
+        slot_hash = self.hashes[position]
+        if slot_hash == self.EMPTY:
+            return None
+        if slot_hash == self.DELETED:
+            return TOMBSTONE
+        return self.key_array[position]
+
+    def value_at(self, position: int) -> V:
+        return self.value_array[position]
+
+    def hash_at(self, position: int) -> int:
+        return self.hashes[position]
+
+    def put(self, position: int, key: K, value: V, key_hash: int) -> None:
+        self.key_array[position] = key
+        self.value_array[position] = value
+        self.hashes[position] = key_hash
+        self.occupied[position] = 1
+
+    def clear(self, position: int) -> None:
+        self.key_array[position] = None
+        self.value_array[position] = None
+        self.hashes[position] = self.EMPTY
+        self.occupied[position] = 0
+
+    def mark_deleted(self, position: int) -> None:
+        self.clear(position)
+        self.hashes[position] = self.DELETED
+
+    def take(self, position: int) -> tuple[K, V, int]:
+        """ Empties a slot, returning its (key, value, key_hash). """
+        entry = self.key_array[position], self.value_array[position], self.hashes[position]
+        self.clear(position)
+        return entry
+
+    def place(self, key: K, value: V, key_hash: int, position: int) -> None:
+        """
+        Store a key known to be absent in the first empty slot from position.
+        :complexity: O(N) worst case, where N is the table size.
+        """
+        hashes = self.hashes
+        size = len(hashes)
+        while hashes[position] != self.EMPTY:
+            position += 1
+            if position == size:
+                position = 0
+        self.put(position, key, value, key_hash)
+
+    def find_robin_hood(self, key: K, key_hash: int, position: int, is_insert: bool) -> int:
+        """
+        Robin Hood probe from the key's home position. See TupleStorage.find_robin_hood.
+        :complexity best: O(1) first position is empty.
+        :complexity worst: O(N + M*comp(K)) where N is the table size
+                           and M the number of matching hashes.
+        """
+        hashes = self.hashes
+        size = len(hashes)
+        distance = 0
+        for _ in range(size):
+            slot_hash = hashes[position]
+            if slot_hash == self.EMPTY:
+                return position if is_insert else -1
+            elif slot_hash == key_hash and self.key_array[position] == key:
+                return position
+            elif (position - slot_hash) % size < distance:
+                return position if is_insert else -1
+            distance += 1
+            position += 1
+            if position == size:
+                position = 0
+        return -1
+
+    def shift_right(self, position: int) -> None:
+        """
+        Moves the entries from position up to the next empty slot along by one,
+        leaving position empty.
+        :complexity: O(N) worst case, where N is the table size.
+        """
+        hashes, keys, values = self.hashes, self.key_array, self.value_array
+        size = len(hashes)
+        end = position
+        while hashes[end] != self.EMPTY:
+            end = (end + 1) % size
+        while end != position:
+            previous = end - 1 if end else size - 1
+            hashes[end], keys[end], values[end] = hashes[previous], keys[previous], values[previous]
+            self.occupied[end] = 1
+            end = previous
+        self.clear(position)
+
+    def backward_shift(self, position: int) -> None:
+        """
+        Fills the empty slot at position by moving the following entries back
+        by one, until an empty slot or an entry already at its home.
+        :complexity: O(N) worst case, where N is the table size.
+        """
+        hashes, keys, values = self.hashes, self.key_array, self.value_array
+        size = len(hashes)
+        following = (position + 1) % size
+        slot_hash = hashes[following]
+        while slot_hash != self.EMPTY and (following - slot_hash) % size != 0:
+            hashes[position], keys[position], values[position] = slot_hash, keys[following], values[following]
+            self.occupied[position] = 1
+            self.clear(following)
+            position = following
+            following = (following + 1) % size
+            slot_hash = hashes[following]
+
+    def items(self) -> Iterator[tuple[K, V, int]]:
+        """
+        Iterates over (key, value, key_hash) for every occupied slot.
+        Sparse tables jump between occupied slots. Denser ones filter the
+        columns by the occupancy map inside itertools.compress, which beats a
+        Python-level jump per entry once more than about one slot in eight is used.
+        Either way the columns are read lazily.
+        :complexity: O(N) where N is the table size.
+        """
+        if self.occupied.count(1) * 8 < len(self.occupied):
+            return self._sparse_items()
+        return compress(zip(self.key_array, self.value_array, self.hashes), self.occupied)
+
+    def _sparse_items(self) -> Iterator[tuple[K, V, int]]:
+        """ :complexity: See occupied_positions. """
+        keys, values, hashes = self.key_array, self.value_array, self.hashes
+        for position in self.occupied_positions():
+            yield keys[position], values[position], hashes[position]
+
+    def keys(self) -> list[K]:
+        """ :complexity: O(N) where N is the table size, run inside itertools.compress. """
+        return list(compress(self.key_array, self.occupied))
+
+    def values(self) -> list[V]:
+        """ :complexity: O(N) where N is the table size, run inside itertools.compress. """
+        return list(compress(self.value_array, self.occupied))
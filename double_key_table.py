@@ -1,13 +1,127 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar, Iterator
+import os
+import pickle
+import sys
+import tempfile
+from collections.abc import Collection, Set
+from mmap import mmap, ACCESS_READ
+from operator import mul
+from typing import Generic, TypeVar, Iterable, Iterator
 from data_structures.hash_table import LinearProbeTable, FullError
+from data_structures.hashers import Hasher
+from data_structures.table_snapshot import MappedStorage, write_table, map_table
 from data_structures.referential_array import ArrayR
 
 K1 = TypeVar('K1')
 K2 = TypeVar('K2')
 V = TypeVar('V')
 
+# First bytes of a DoubleKeyTable snapshot file.
+SNAPSHOT_MAGIC = b"DKTSNAP1"
+
+# Marks a missing pair. As get_many's default, missing pairs raise KeyError.
+_MISSING = object()
+
+
+# Weights of DoubleKeyTable's own hash, by (HASH_BASE, table size, key length).
+_HASH_WEIGHTS: dict[tuple[int, int, int], list[int]] = {}
+
+
+def _hash_weights(base: int, size: int, length: int) -> list[int]:
+    """
+    DoubleKeyTable's own hash of a key of this length, unrolled: the hash is the sum
+    of ord(key[i]) * weights[i], modulo size. weights[i] is the product, modulo size,
+    of the multipliers the loop in hash1 applies after character i.
+    :complexity: O(length) the first time, O(1) after.
+    """
+    try:
+        return _HASH_WEIGHTS[base, size, length]
+    except KeyError:
+        pass
+    multipliers = [31415]
+    for _ in range(length - 1):
+        multipliers.append(multipliers[-1] * base % (size - 1))
+    weights = [0] * length
+    product = 1
+    for position in range(length - 1, -1, -1):
+        weights[position] = product
+        product = product * multipliers[position] % size
+    _HASH_WEIGHTS[base, size, length] = weights
+    return weights
+
+
+class LevelTable(LinearProbeTable[K1, V]):
+    """
+    A table of a DoubleKeyTable. Its hash is looked up once, by bind_hash,
+    when it is made and whenever its owner's hash1 or hash2 is replaced.
+    """
+
+    def __init__(self, owner: DoubleKeyTable, sizes: list | None = None, **kwargs) -> None:
+        LinearProbeTable.__init__(self, sizes, **kwargs)
+        self.owner = owner
+        # polynomial_hash's weights by key length, for the storage they were worked out for.
+        self.weights: dict[int, list[int]] = {}
+        self.weights_storage = None
+        self.weights_size = 0
+        self.bind_hash()
+
+    def bind_hash(self) -> None:
+        """
+        Sets the hash this table probes with.
+        """
+        raise NotImplementedError()
+
+    def polynomial_hash(self, key: K1) -> int:
+        """
+        The owner's default hash1 or hash2 of key for this table, as one weighted
+        sum over the characters (see _hash_weights) instead of a Python loop.
+        :complexity: O(len(key))
+        """
+        storage = self.storage
+        if storage is not self.weights_storage:
+            # New storage, maybe of a new size.
+            self.weights_storage = storage
+            self.weights_size = len(storage)
+            self.weights = {}
+        try:
+            weights = self.weights[len(key)]
+        except KeyError:
+            weights = self.weights[len(key)] = _hash_weights(self.owner.HASH_BASE, self.weights_size, len(key))
+        return sum(map(mul, map(ord, key), weights)) % self.weights_size
+
+
+class TopLevelTable(LevelTable[K1, LinearProbeTable[K2, V]]):
+    """
+    Top-level table of a DoubleKeyTable, hashed by the owner's hash1.
+    """
+
+    def bind_hash(self) -> None:
+        """
+        Probe with the owner's hash1, or the same hash computed by polynomial_hash
+        when hash1 is DoubleKeyTable's own.
+        """
+        self.hash = self.polynomial_hash if self.owner._default_hash("hash1") else self.owner.hash1
+
+
+class BottomLevelTable(LevelTable[K2, V]):
+    """
+    Bottom-level table of a DoubleKeyTable, hashed by the owner's hash2.
+    """
+
+    def bind_hash(self) -> None:
+        """
+        Probe with the owner's hash2, or the same hash computed by polynomial_hash
+        when hash2 is DoubleKeyTable's own.
+        """
+        self.hash = self.polynomial_hash if self.owner._default_hash("hash2") else self.owner_hash
+
+    def owner_hash(self, key: K2) -> int:
+        """
+        :complexity: See DoubleKeyTable.hash2.
+        """
+        return self.owner.hash2(key, self)
+
 
 class DoubleKeyTable(Generic[K1, K2, V]):
     """
@@ -20,6 +134,19 @@ class DoubleKeyTable(Generic[K1, K2, V]):
                 Otherwise `hash2` should be overwritten.
         - V:    Value Type.
 
+    hasher1 and hasher2 pick a hasher (see data_structures/hashers.py) for the
+    top-level and the inner tables. A table with a hasher places keys at their
+    cached full-width hash modulo its size, so `hash1` or `hash2` is not used.
+
+    With incremental_resize=True the top-level and inner tables resize
+    incrementally (see LinearProbeTable). This caches hashes too, using the
+    default polynomial hasher when no hasher is given.
+
+    The top-level and bottom-level tables are TopLevelTable and BottomLevelTable.
+    Each looks up hash1 or hash2 once when it is made, and again when hash1 or
+    hash2 is replaced on this instance. While they are this class's own, the
+    tables compute them as a weighted sum instead of calling them.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
@@ -29,7 +156,9 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None) -> None:
+    def __init__(self, sizes: list | None = None, internal_sizes: list | None = None,
+                 incremental_resize: bool = False, hasher1: Hasher[K1] | None = None,
+                 hasher2: Hasher[K2] | None = None) -> None:
 
         """
         O(n)
@@ -37,13 +166,40 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         the first element in the "size" list is the starting point of the table size, represented the initial size of
         the main table, same as the self.internal_sizes[0].
         self.table is used to create an empty hash table with a predefined size.
-        parameter: sizes, internal_sizes
+        parameter: sizes, internal_sizes, incremental_resize, hasher1, hasher2
         """
         if sizes is not None:
             self.TABLE_SIZES = sizes
         self.internal_sizes = internal_sizes
-        self.top_level_table = LinearProbeTable[K1, LinearProbeTable[K2, V]](self.TABLE_SIZES)
+        self.incremental_resize = incremental_resize
+        self.hasher1 = hasher1
+        self.hasher2 = hasher2
+        self.top_level_table = self._new_top_level_table()
         self.count = 0
+        # Snapshot file mapped by load(), and every storage reading from it, top-level first.
+        self._mapped: mmap | None = None
+        self._mapped_storages: list[MappedStorage] = []
+
+    def __setattr__(self, name: str, value) -> None:
+        """
+        Sets an attribute. Replacing hash1 or hash2 makes the tables look their hash up again.
+        :complexity: O(1), O(m) for hash2 where m is the top-level table size.
+        """
+        object.__setattr__(self, name, value)
+        if name in ("hash1", "hash2") and "top_level_table" in self.__dict__:
+            self.top_level_table.bind_hash()
+            if name == "hash2":
+                for _, inner_hash_table in self.top_level_table.iter_items():
+                    inner_hash_table.bind_hash()
+
+    def _default_hash(self, name: str) -> bool:
+        """
+        Whether hash1 or hash2, by name, is this class's own polynomial hash: not
+        replaced on this instance or overridden by a subclass, and with no hasher.
+        """
+        hasher = self.hasher1 if name == "hash1" else self.hasher2
+        return (hasher is None and name not in self.__dict__
+                and getattr(type(self), name) is getattr(DoubleKeyTable, name))
 
     def hash1(self, key: K1) -> int:
         """
@@ -51,12 +207,15 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
         :complexity: O(len(key))
         """
+        if self.hasher1 is not None:
+            return self.hasher1(key) % self.table_size
 
         value = 0
         a = 31415
+        size = self.table_size
         for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = a * self.HASH_BASE % (self.table_size - 1)
+            value = (ord(char) + a * value) % size
+            a = a * self.HASH_BASE % (size - 1)
         return value
 
     def hash2(self, key: K2, sub_table: LinearProbeTable[K2, V]) -> int:
@@ -65,14 +224,30 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
         :complexity: O(len(key))
         """
+        if self.hasher2 is not None:
+            return self.hasher2(key) % sub_table.table_size
 
         value = 0
         a = 31415
+        size = sub_table.table_size
         for char in key:
-            value = (ord(char) + a * value) % sub_table.table_size
-            a = a * self.HASH_BASE % (sub_table.table_size - 1)
+            value = (ord(char) + a * value) % size
+            a = a * self.HASH_BASE % (size - 1)
         return value
 
+    def _new_top_level_table(self) -> TopLevelTable[K1, K2, V]:
+        """
+        Create an empty top-level table hashed with hash1.
+        """
+        return TopLevelTable(self, self.TABLE_SIZES, incremental_resize=self.incremental_resize, hasher=self.hasher1)
+
+    def _new_inner_table(self) -> BottomLevelTable[K1, K2, V]:
+        """
+        Create an empty bottom-level table hashed with hash2.
+        """
+        return BottomLevelTable(self, self.internal_sizes, incremental_resize=self.incremental_resize,
+                                hasher=self.hasher2)
+
     def _linear_probe(self, key1: K1, key2: K2, is_insert: bool) -> tuple[int, int]:
         """
 
@@ -89,16 +264,12 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :return: tuple[int, int]
         :complexity: O(m + n)
         """
-        self.top_level_table.hash = self.hash1
-
         outer_pos = self.top_level_table._linear_probe(key1, is_insert)
         if is_insert:
             try:
                 inner_pos = self.top_level_table[key1]._linear_probe(key2, is_insert)
             except KeyError:
-                temp = LinearProbeTable(self.internal_sizes)
-                temp.hash = lambda k: self.hash2(k, temp)
-                inner_pos = temp._linear_probe(key2, is_insert)
+                inner_pos = self._new_inner_table()._linear_probe(key2, is_insert)
         else:
             inner_pos = self.top_level_table[key1]._linear_probe(key2, is_insert)
 
@@ -118,32 +289,25 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :return: Iterator[K1|K2]
         :complexity: O(m + n)
         """
-        self.top_level_table.hash = self.hash1
         if key is None:
-            for start in self.top_level_table.array:
-                if start is not None:
-                    yield start[0]
+            for key1, _ in self.top_level_table.iter_items():
+                yield key1
         else:
-            outer_pos = self.top_level_table._linear_probe(key, False)
-            bottom_level_table = self.top_level_table.array[outer_pos][1]
+            bottom_level_table = self.top_level_table[key]
 
-            for start in bottom_level_table.array:
-                if start is not None:
-                    yield start[0]
+            for key2, _ in bottom_level_table.iter_items():
+                yield key2
 
-    def keys(self, key: K1 | None = None) -> list[K1]:
+    def keys(self, key: K1 | None = None) -> KeysView[K1, K2, V]:
         """
-        key = None: returns all top-level keys in the table.
-        key = x: returns all bottom-level keys for top-level key x.
+        key = None: returns a live view of all top-level keys in the table.
+        key = x: returns a live view of all bottom-level keys for top-level key x.
         :param key: The top-level key or None
-        :return: A list of keys (either top-level or bottom-level)
-        :complexity: O(m+n)
+        :return: A KeysView (either top-level or bottom-level)
+        :raises KeyError: when key is not a top-level key.
+        :complexity: O(m) to check key, the view itself is built lazily.
         """
-        self.top_level_table.hash = self.hash1
-        if key is None:
-            return list(self.iter_keys())
-        else:
-            return list(self.iter_keys(key))
+        return KeysView(self, key)
 
     def iter_values(self, key: K1 | None = None) -> Iterator[V]:
         """
@@ -156,32 +320,39 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :return: Iterator[V]
         :complexity: O(m*n)
         """
-        self.top_level_table.hash = self.hash1
         if key is None:
-            for start in self.top_level_table.array:
-                if start is not None:
-                    bottom_level_table = start[1]
-                    for inner_start in bottom_level_table.array:
-                        if inner_start is not None:
-                            yield inner_start[1]
+            for _, bottom_level_table in self.top_level_table.iter_items():
+                for _, value in bottom_level_table.iter_items():
+                    yield value
         else:
-            outer_pos = self.top_level_table._linear_probe(key, False)
-            bottom_level_table = self.top_level_table.array[outer_pos][1]
+            bottom_level_table = self.top_level_table[key]
 
-            for start in bottom_level_table.array:
-                if start is not None:
-                    yield start[1]
+            for _, value in bottom_level_table.iter_items():
+                yield value
 
-    def values(self, key: K1 | None = None) -> list[V]:
+    def values(self, key: K1 | None = None) -> ValuesView[K1, K2, V]:
         """
-        key = None: returns all values in the table.
-        key = x: returns all values for top-level key x.
+        key = None: returns a live view of all values in the table.
+        key = x: returns a live view of all values for top-level key x.
 
         :param key: The top-level key or None
-        :return: A list of values (either top-level or bottom-level)
-        :complexity: O(m*n)
+        :return: A ValuesView (either top-level or bottom-level)
+        :raises KeyError: when key is not a top-level key.
+        :complexity: O(m) to check key, the view itself is built lazily.
+        """
+        return ValuesView(self, key)
+
+    def items(self, key: K1 | None = None) -> ItemsView[K1, K2, V]:
+        """
+        key = None: returns a live view of ((key1, key2), value) for every pair in the table.
+        key = x: returns a live view of (key2, value) for top-level key x.
+
+        :param key: The top-level key or None
+        :return: An ItemsView
+        :raises KeyError: when key is not a top-level key.
+        :complexity: O(m) to check key, the view itself is built lazily.
         """
-        return list(self.iter_values(key))
+        return ItemsView(self, key)
 
     def __contains__(self, key: tuple[K1, K2]) -> bool:
         """
@@ -189,13 +360,9 @@ class DoubleKeyTable(Generic[K1, K2, V]):
 
         :complexity: See linear probe.
         """
-        self.top_level_table.hash = self.hash1
-        try:
-            _ = self[key]
-        except KeyError:
-            return False
-        else:
-            return True
+        k1, k2 = key
+        inner_hash_table = self.top_level_table.get(k1)
+        return inner_hash_table is not None and inner_hash_table._find(k2) != -1
 
     def __getitem__(self, key: tuple[K1, K2]) -> V:
         """
@@ -208,46 +375,94 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :return: value
         :complexity: O(m+n)
         """
-        self.top_level_table.hash = self.hash1
         k1, k2 = key
-        outer_pos = self.top_level_table._linear_probe(k1, False)
-
-        if self.top_level_table.array[outer_pos] is None:
-            raise KeyError
-
-        inner_hash_table = self.top_level_table.array[outer_pos][1]
-        inner_pos = inner_hash_table._linear_probe(k2, False)
+        inner_hash_table = self.top_level_table[k1]
+        return inner_hash_table[k2]
 
-        if inner_hash_table.array[inner_pos] is None:
-            raise KeyError
+    def get(self, key1: K1, key2: K2, default: V | None = None) -> V | None:
+        """
+        Returns the value at (key1, key2), or default when the pair doesn't exist.
 
-        return inner_hash_table.array[inner_pos][1]
-        # raise NotImplementedError()
+        :complexity: See linear probe.
+        """
+        inner_hash_table = self.top_level_table.get(key1)
+        if inner_hash_table is None:
+            return default
+        return inner_hash_table.get(key2, default)
 
     def __setitem__(self, key: tuple[K1, K2], data: V) -> None:
         """
         Set an (key, value) pair in our hash table.
-        method: Check if the inner hash table exists for the given outer_key
-        If it doesn't exist, create a new inner hash table and insert it into the outer hash table
-        Insert the inner_key into the inner hash table
+        method: Find the inner hash table for the given outer_key, creating and
+        inserting a new one if it doesn't exist, then upsert the inner_key into it.
+        Each level is probed exactly once.
         :parameter: key: tuple[K1, K2], data: V
         :complexity: O(m+n)
         """
         k1, k2 = key
-        self.top_level_table.hash = self.hash1
-        try:
-            self.top_level_table[k1]
-        except KeyError:
-            inner_hash_table = LinearProbeTable[K2, V](self.internal_sizes)
-            inner_hash_table.hash = lambda k: self.hash2(k, inner_hash_table)
-            self.top_level_table[k1] = inner_hash_table
-
-        inner_hash_table = self.top_level_table[k1]
-        try:
-            inner_hash_table[k2]
-        except KeyError:
+        inner_hash_table = self.top_level_table._get_or_insert(k1, self._new_inner_table)
+        if inner_hash_table._upsert(k2, data):
             self.count += 1
-        inner_hash_table[k2] = data
+
+    def _group_by_top_level(self, pairs: list[tuple[K1, K2]]) -> dict[K1, list[int]]:
+        """
+        Positions in pairs of each pair, grouped by top-level key.
+        :complexity: O(P) where P is the number of pairs.
+        """
+        groups = {}
+        for index, (key1, _) in enumerate(pairs):
+            group = groups.get(key1)
+            if group is None:
+                groups[key1] = [index]
+            else:
+                group.append(index)
+        return groups
+
+    def get_many(self, pairs: Iterable[tuple[K1, K2]], default: V = _MISSING) -> list[V]:
+        """
+        Get the values at many (key1, key2) pairs, in the order given.
+        Each top-level key is probed once, however many pairs share it.
+
+        :raises KeyError: when a pair doesn't exist and no default is given.
+        :parameter: pairs: (key1, key2) pairs, default: value for missing pairs
+        :return: list[V]
+        :complexity: O(P*n + G*m) for P pairs over G top-level keys.
+        """
+        pairs = list(pairs)
+        results = [default] * len(pairs)
+        for key1, indices in self._group_by_top_level(pairs).items():
+            inner_hash_table = self.top_level_table.get(key1)
+            if inner_hash_table is None:
+                if default is _MISSING:
+                    raise KeyError(key1)
+                continue
+            for index in indices:
+                position = inner_hash_table._find(pairs[index][1])
+                if position != -1:
+                    results[index] = inner_hash_table.storage.value_at(position)
+                elif default is _MISSING:
+                    raise KeyError(pairs[index])
+        return results
+
+    def set_many(self, pairs: Iterable[tuple[K1, K2]], values: Iterable[V]) -> None:
+        """
+        Set many (key1, key2) pairs to the matching values.
+        Each top-level key is probed once, however many pairs share it.
+        A pair given more than once keeps its last value.
+
+        :raises ValueError: when pairs and values differ in length.
+        :parameter: pairs: (key1, key2) pairs, values: one value per pair
+        :complexity: O(P*n + G*m) for P pairs over G top-level keys.
+        """
+        pairs = list(pairs)
+        values = list(values)
+        if len(pairs) != len(values):
+            raise ValueError("set_many needs exactly one value per pair.")
+        for key1, indices in self._group_by_top_level(pairs).items():
+            inner_hash_table = self.top_level_table._get_or_insert(key1, self._new_inner_table)
+            for index in indices:
+                if inner_hash_table._upsert(pairs[index][1], values[index]):
+                    self.count += 1
 
     def __delitem__(self, key: tuple[K1, K2]) -> None:
         """
@@ -258,7 +473,6 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         :parameter: key: tuple[K1, K2]
         :complexity: O(m+n)
         """
-        self.top_level_table.hash = self.hash1
         k1, k2 = key
         del self.top_level_table[k1][k2]
         if len(self.top_level_table[k1]) == 0:
@@ -276,24 +490,22 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         method:
         Create a new top-level hash table with increased size
         Reinsert all values into the new hash table
+        The new table is installed before it is filled: hash1 (and any override of it)
+        reads self.table_size, which has to be the size of the table being filled.
         """
-        self.top_level_table.hash = self.hash1
-        new_top_level_table = LinearProbeTable[K1, LinearProbeTable[K2, V]](sizes=self.TABLE_SIZES)
-
-        for start in self.top_level_table.array:
-            if start is not None:
-                key1, inner_hash_table = start
-                new_inner_hash_table = LinearProbeTable[K2, V](sizes=self.internal_sizes)
-                new_inner_hash_table.hash = lambda k: self.hash2(k, new_inner_hash_table)
-
-                for inner_start in inner_hash_table.array:
-                    if inner_start is not None:
-                        key2, value = inner_start
-                        new_inner_hash_table[key2] = value
+        old_top_level_table = self.top_level_table
+        self.top_level_table = self._new_top_level_table()
+        try:
+            for key1, inner_hash_table in old_top_level_table.iter_items():
+                new_inner_hash_table = self._new_inner_table()
 
-                new_top_level_table[key1] = new_inner_hash_table
+                for key2, value in inner_hash_table.iter_items():
+                    new_inner_hash_table[key2] = value
 
-        self.top_level_table = new_top_level_table
+                self.top_level_table[key1] = new_inner_hash_table
+        except BaseException:
+            self.top_level_table = old_top_level_table
+            raise
         # raise NotImplementedError()
 
     @property
@@ -309,6 +521,111 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         """
         return self.count
 
+    def save(self, path: str) -> None:
+        """
+        Writes the table to a snapshot file that load() maps back in without rehashing.
+        Every top-level and bottom-level table keeps its size and slot positions.
+        Values are pickled.
+
+        The snapshot is written to a temporary file in the same directory, which then
+        replaces path. So a table loaded from path, and still reading from it, can be
+        saved back to path.
+
+        The file holds the bottom-level table sections, then the top-level
+        section (whose values are the offsets of the bottom-level sections),
+        then a pickled header with the constructor arguments.
+
+        :raises ValueError: when a key is not a string, a hasher is not stable
+                            across runs, or hash1 or hash2 was replaced on this instance.
+        :complexity: O(m + N + total pickled size) where N is the total size of the bottom-level tables.
+        """
+        if "hash1" in self.__dict__ or "hash2" in self.__dict__:
+            raise ValueError("Snapshots need the class's own hash1 and hash2.")
+        for hasher in (self.hasher1, self.hasher2):
+            if hasher is not None and not hasher.stable:
+                raise ValueError(f"{hasher!r} does not hash the same way in every process.")
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                                      prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with open(descriptor, "wb") as file:
+                file.write(SNAPSHOT_MAGIC + bytes(8))
+                inner_offsets = {}
+                for _, inner_hash_table in self.top_level_table.iter_items():
+                    inner_offsets[id(inner_hash_table)] = write_table(file, inner_hash_table, pickle.dumps)
+                top_offset = write_table(file, self.top_level_table,
+                                         lambda inner: inner_offsets[id(inner)].to_bytes(8, sys.byteorder))
+                header_offset = file.tell()
+                pickle.dump(dict(
+                    cls=type(self).__qualname__, byteorder=sys.byteorder, top=top_offset, count=self.count,
+                    sizes=self.TABLE_SIZES, internal_sizes=self.internal_sizes,
+                    incremental_resize=self.incremental_resize, hasher1=self.hasher1, hasher2=self.hasher2,
+                ), file)
+                file.seek(len(SNAPSHOT_MAGIC))
+                file.write(header_offset.to_bytes(8, sys.byteorder))
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> DoubleKeyTable[K1, K2, V]:
+        """
+        Maps a snapshot written by save() into a new table.
+        Nothing is rehashed: lookups probe the mapped file directly. A bottom-level
+        table is mapped the first time its top-level key is read, and a value is
+        unpickled the first time it is read. A table is copied out of the file
+        the first time it is written to. close() copies what is left out of the
+        file and unmaps it.
+
+        Only load snapshots from trusted files, as values are unpickled.
+
+        :raises ValueError: when the file is not a snapshot of this class, or was
+                            written on a machine of a different byte order.
+        :complexity: O(m) where m is the top-level table size.
+        """
+        with open(path, "rb") as file:
+            mapped = mmap(file.fileno(), 0, access=ACCESS_READ)
+        if mapped[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a DoubleKeyTable snapshot.")
+        header_offset = int.from_bytes(mapped[len(SNAPSHOT_MAGIC):len(SNAPSHOT_MAGIC) + 8], sys.byteorder)
+        header = pickle.loads(mapped[header_offset:])
+        if header["cls"] != cls.__qualname__:
+            raise ValueError(f"{path} holds a {header['cls']}, not a {cls.__qualname__}.")
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {header['byteorder']} endian machine.")
+        table = cls(header["sizes"], header["internal_sizes"], header["incremental_resize"],
+                    header["hasher1"], header["hasher2"])
+        table.count = header["count"]
+        table._mapped = mapped
+
+        def map_inner(offset: memoryview) -> LinearProbeTable[K2, V]:
+            inner_hash_table = table._new_inner_table()
+            map_table(inner_hash_table, mapped, int.from_bytes(offset, sys.byteorder), pickle.loads)
+            table._mapped_storages.append(inner_hash_table.storage)
+            return inner_hash_table
+
+        map_table(table.top_level_table, mapped, header["top"], map_inner)
+        table._mapped_storages.append(table.top_level_table.storage)
+        return table
+
+    def close(self) -> None:
+        """
+        Copies every table still read from the snapshot file loaded into memory, then
+        unmaps the file. The table stays usable. Does nothing for a table not made by
+        load(), or already closed.
+        :complexity: O(m + N + total pickled size) for the tables still mapped,
+                     where N is the total size of the bottom-level tables.
+        """
+        if self._mapped is None:
+            return
+        # The top-level storage is first. Releasing it maps every bottom-level table
+        # not mapped yet, which adds their storages to the list being walked.
+        for storage in self._mapped_storages:
+            storage.release()
+        self._mapped_storages = []
+        self._mapped.close()
+        self._mapped = None
+
     def __str__(self) -> str:
         """
         String representation.
@@ -316,8 +633,141 @@ class DoubleKeyTable(Generic[K1, K2, V]):
         Not required but may be a good testing tool.
         """
         result = ""
-        for item in self.top_level_table:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
-        return result
\ No newline at end of file
+        for key, value in self.top_level_table.iter_items():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
+
+class DoubleKeyView(Generic[K1, K2, V]):
+    """
+    Live view over a DoubleKeyTable, like the views returned by dict.keys().
+
+    With key = None the view covers the whole table, otherwise only the
+    bottom-level table of top-level key `key`. The view reads the table
+    on every use, so it reflects later inserts and deletes. Nothing is
+    copied, and iteration goes through the tables' iter_items, which stops
+    once every entry has been seen.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, table: DoubleKeyTable[K1, K2, V], key: K1 | None = None) -> None:
+        """
+        :raises KeyError: when key is not a top-level key of table.
+        :complexity: O(m) to check key, see linear probe.
+        """
+        if key is not None and key not in table.top_level_table:
+            raise KeyError(key)
+        self.table = table
+        self.key = key
+
+    def _inner(self) -> LinearProbeTable[K2, V] | None:
+        """
+        The bottom-level table viewed, or None once its last pair is deleted.
+        :complexity: See linear probe.
+        """
+        return self.table.top_level_table.get(self.key)
+
+    def _pairs(self) -> Iterator[tuple[tuple[K1, K2] | K2, V]]:
+        """
+        ((key1, key2), value) for every pair, or (key2, value) for one top-level key.
+        :complexity: O(N) where N is the size of the tables viewed.
+        """
+        if self.key is None:
+            for key1, inner_hash_table in self.table.top_level_table.iter_items():
+                for key2, value in inner_hash_table.iter_items():
+                    yield (key1, key2), value
+            return
+        inner_hash_table = self._inner()
+        if inner_hash_table is not None:
+            yield from inner_hash_table.iter_items()
+
+    def __len__(self) -> int:
+        if self.key is None:
+            return len(self.table)
+        inner_hash_table = self._inner()
+        return 0 if inner_hash_table is None else len(inner_hash_table)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)})"
+
+
+class KeysView(DoubleKeyView[K1, K2, V], Set):
+    """
+    Top-level keys, or the bottom-level keys of one top-level key.
+    """
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable) -> set:
+        """ Result type of the set operators, which cannot build a view. """
+        return set(it)
+
+    def __len__(self) -> int:
+        if self.key is None:
+            return len(self.table.top_level_table)
+        return DoubleKeyView.__len__(self)
+
+    def __iter__(self) -> Iterator[K1 | K2]:
+        """ :complexity: O(N) where N is the size of the table viewed. """
+        if self.key is None:
+            for key1, _ in self.table.top_level_table.iter_items():
+                yield key1
+            return
+        inner_hash_table = self._inner()
+        if inner_hash_table is not None:
+            for key2, _ in inner_hash_table.iter_items():
+                yield key2
+
+    def __contains__(self, key: K1 | K2) -> bool:
+        """ :complexity: See linear probe. """
+        if self.key is None:
+            return key in self.table.top_level_table
+        inner_hash_table = self._inner()
+        return inner_hash_table is not None and key in inner_hash_table
+
+
+class ValuesView(DoubleKeyView[K1, K2, V], Collection):
+    """
+    All values, or the values of one top-level key.
+    """
+
+    def __iter__(self) -> Iterator[V]:
+        """ :complexity: O(N) where N is the size of the tables viewed. """
+        for _, value in self._pairs():
+            yield value
+
+    def __contains__(self, value: V) -> bool:
+        """ :complexity: O(N) where N is the size of the tables viewed. """
+        for other in self:
+            if other is value or other == value:
+                return True
+        return False
+
+
+class ItemsView(DoubleKeyView[K1, K2, V], Set):
+    """
+    ((key1, key2), value) for every pair, or (key2, value) for one top-level key.
+    """
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable) -> set:
+        """ Result type of the set operators, which cannot build a view. """
+        return set(it)
+
+    def __iter__(self) -> Iterator[tuple[tuple[K1, K2] | K2, V]]:
+        """ :complexity: O(N) where N is the size of the tables viewed. """
+        return self._pairs()
+
+    def __contains__(self, item: tuple[tuple[K1, K2] | K2, V]) -> bool:
+        """ :complexity: See linear probe. """
+        # Set operators test membership of anything in the other operand.
+        if not isinstance(item, tuple) or len(item) != 2:
+            return False
+        key, value = item
+        if self.key is None:
+            if not isinstance(key, tuple) or len(key) != 2:
+                return False
+            found = self.table.get(key[0], key[1], _MISSING)
+        else:
+            inner_hash_table = self._inner()
+            found = _MISSING if inner_hash_table is None else inner_hash_table.get(key, _MISSING)
+        return found is not _MISSING and (found is value or found == value)
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import Generic, TypeVar
+from operator import itemgetter
+from os.path import commonprefix
+from typing import Generic, Iterable, Iterator, TypeVar
 
 from data_structures.hash_table import LinearProbeTable
 from data_structures.referential_array import ArrayR
@@ -17,105 +19,388 @@ class InfiniteHashTable(Generic[K, V]):
                 Otherwise `hash` should be overwritten.
         - V:    Value Type.
 
+    Bit i of `occupied` is set exactly when slot i holds a pair or a sub-table.
+
+    Node layout:
+        - Sparse nodes keep only their used slots, packed into the `entries` list
+          in slot order. Slot i is at entries[number of occupied bits below i].
+          `table` is None.
+        - Once a node uses more than SPARSE_LIMIT slots it moves into a full
+          TABLE_SIZE `table` ArrayR, and `entries` is None.
+
+    Path compression: a level where every key in a subtree would take the same
+    slot is not stored. A sub-table sits directly in its parent's slot with its
+    own `level`, and the slots of the levels skipped in between are worked out
+    from its `prefix_key`, any key that was stored in it. get_location still
+    reports a position for every level.
+
+    Key order: different characters can take the same slot, so slot order is not
+    key order. A sub-table's `same_prefix` is True while every key stored in it
+    has the same first `level` characters as its prefix_key. Below such tables,
+    each slot holds a single character, and sorting a table's slots by that
+    character puts its pairs in key order without sorting them.
+
+    Sub-tables are always plain InfiniteHashTables, so below the top table the
+    slot index is computed inline, exactly as InfiniteHashTable.hash does.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
     TABLE_SIZE = 27
 
-    def __init__(self, level: int = 0) -> None:
+    SPARSE_LIMIT = 8
+
+    SORT_LIMIT = 64
+
+    def __init__(self, level: int = 0, prefix_key: K | None = None) -> None:
         self.level = level
         self.table_size = self.TABLE_SIZE
-        self.table: ArrayR[tuple[K, V] | InfiniteHashTable[K, V]] = ArrayR(self.table_size)
+        self.table: ArrayR[tuple[K, V] | InfiniteHashTable[K, V]] | None = None
+        self.entries: list[tuple[K, V] | InfiniteHashTable[K, V]] | None = []
+        self.prefix_key = prefix_key
+        # Cleared for good once a key sharing slots but not characters with prefix_key is stored.
+        self.same_prefix = True
+        self.occupied = 0
         self.count = 0
 
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]]) -> InfiniteHashTable[K, V]:
+        """
+        Build a table from (key, value) pairs, creating every table once with its final layout.
+        A key given more than once keeps its last value. The pairs do not need to be sorted.
+
+        Each group of keys sharing a slot is bucketed by slot at the first level
+        where they differ, which is where its sub-table goes.
+
+        :raises KeyError: when a key is empty, or two keys take the same slot at every level.
+        :complexity: O(C) where C is the total length of the keys, no recursion.
+                     Bucketing inlines InfiniteHashTable.hash, as every table below the top one is plain.
+        """
+        pairs = dict(items)
+        table = cls()
+        if "" in pairs:
+            raise KeyError("Key cannot be empty")
+        buckets = {}
+        for pair in pairs.items():
+            buckets.setdefault(table.hash(pair[0]), []).append(pair)
+        table.count = len(pairs)
+        last = cls.TABLE_SIZE - 1
+        stack = [(table, buckets)]
+        while stack:
+            node, buckets = stack.pop()
+            slots = {}
+            for index, bucket in buckets.items():
+                if len(bucket) == 1:
+                    slots[index] = bucket[0]
+                    continue
+                keys = [key for key, _ in bucket]
+                level = node._group_level(keys, node.level + 1)
+                child = InfiniteHashTable(level, keys[0])
+                child.same_prefix = len(commonprefix(keys)) >= level
+                child.count = len(bucket)
+                child_buckets = {}
+                for pair in bucket:
+                    key = pair[0]
+                    slot = ord(key[level]) % last if level < len(key) else last
+                    child_buckets.setdefault(slot, []).append(pair)
+                slots[index] = child
+                stack.append((child, child_buckets))
+            node._fill(slots)
+        return table
+
     def hash(self, key: K) -> int:
         if self.level < len(key):
             return ord(key[self.level]) % (self.TABLE_SIZE - 1)
         return self.TABLE_SIZE - 1
 
+    def _index(self, key: K, level: int) -> int:
+        """ Slot of key in a sub-table at level. """
+        if level < len(key):
+            return ord(key[level]) % (self.TABLE_SIZE - 1)
+        return self.TABLE_SIZE - 1
+
+    def _slot(self, index: int) -> tuple[K, V] | InfiniteHashTable[K, V] | None:
+        """ Contents of slot index. """
+        bit = 1 << index
+        if not self.occupied & bit:
+            return None
+        if self.table is not None:
+            return self.table[index]
+        return self.entries[(self.occupied & (bit - 1)).bit_count()]
+
+    def _set_slot(self, index: int, entry: tuple[K, V] | InfiniteHashTable[K, V] | None) -> None:
+        """
+        Stores entry in slot index, or empties the slot when entry is None.
+        A sparse node past SPARSE_LIMIT slots moves into a full table.
+        :Complexity: O(SPARSE_LIMIT) in a sparse node, O(TABLE_SIZE) when it moves.
+        """
+        bit = 1 << index
+        if self.table is not None:
+            self.table[index] = entry
+        else:
+            position = (self.occupied & (bit - 1)).bit_count()
+            if entry is None:
+                if self.occupied & bit:
+                    self.entries.pop(position)
+            elif self.occupied & bit:
+                self.entries[position] = entry
+            else:
+                self.entries.insert(position, entry)
+                if len(self.entries) > self.SPARSE_LIMIT:
+                    self._grow(self.occupied | bit)
+        if entry is None:
+            self.occupied &= ~bit
+        else:
+            self.occupied |= bit
+
+    def _fill(self, slots: dict[int, tuple[K, V] | InfiniteHashTable[K, V]]) -> None:
+        """
+        Lays out an empty table holding slots, a map from index to contents.
+        :Complexity: O(TABLE_SIZE)
+        """
+        for index in slots:
+            self.occupied |= 1 << index
+        if len(slots) > self.SPARSE_LIMIT:
+            self.table = ArrayR(self.table_size)
+            for index, entry in slots.items():
+                self.table[index] = entry
+            self.entries = None
+        else:
+            self.entries = [slots[index] for index in sorted(slots)]
+
+    def _grow(self, occupied: int) -> None:
+        """
+        Moves a sparse node into a full table. occupied has a bit per entry.
+        :Complexity: O(TABLE_SIZE)
+        """
+        self.table = ArrayR(self.table_size)
+        entries = iter(self.entries)
+        for index in range(self.table_size):
+            if occupied >> index & 1:
+                self.table[index] = next(entries)
+        self.entries = None
+
+    def _follows(self, key: K, child: InfiniteHashTable[K, V]) -> bool:
+        """
+        Whether key takes the same slots as child's keys in the levels
+        compressed away between this table and child.
+        :Complexity: O(L) where L is the number of levels skipped, mostly in one
+                     slice comparison.
+        """
+        start, stop = self.level + 1, child.level
+        # The same characters take the same slots, and so does running out at the same level.
+        if key[start:stop] == child.prefix_key[start:stop]:
+            return True
+        for level in range(start, stop):
+            if self._index(key, level) != self._index(child.prefix_key, level):
+                return False
+        return True
+
+    def _descend(self, key: K) -> tuple[InfiniteHashTable[K, V], int, tuple[K, V] | None]:
+        """
+        Follows key down through the sub-tables to the slot it belongs in.
+        Returns (table, index, entry) where entry is the pair in that slot or None.
+        Compressed levels are not checked, as the pair found is compared with key anyway.
+        :Complexity: O(D) where D is the number of tables on the way, no recursion.
+        """
+        node = self
+        index = self.hash(key)
+        length = len(key)
+        last = self.TABLE_SIZE - 1
+        while True:
+            bit = 1 << index
+            occupied = node.occupied
+            if not occupied & bit:
+                return node, index, None
+            if node.table is not None:
+                entry = node.table[index]
+            else:
+                entry = node.entries[(occupied & (bit - 1)).bit_count()]
+            if not isinstance(entry, InfiniteHashTable):
+                return node, index, entry
+            node = entry
+            index = ord(key[node.level]) % last if node.level < length else last
+
+    def _path(self, key: K) -> list[tuple[InfiniteHashTable[K, V], int]] | None:
+        """
+        (table, index) for every table key passes through, down to the slot it belongs in.
+        Returns None when key leaves a compressed path, so it cannot be in the table.
+        :Complexity: O(D) where D is the depth of the slot, no recursion.
+        """
+        path = []
+        node = self
+        index = self.hash(key)
+        while True:
+            path.append((node, index))
+            entry = node._slot(index)
+            if not isinstance(entry, InfiniteHashTable):
+                return path
+            if not node._follows(key, entry):
+                return None
+            node = entry
+            index = node._index(key, node.level)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Get the value at a certain key, or default when the key doesn't exist.
+        :Parameter: key, default
+        :Complexity: O(D) where D is the depth of the key
+        """
+        if len(key) == 0:
+            return default
+        _, _, entry = self._descend(key)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return default
+
     def __getitem__(self, key: K) -> V:
         """
         Get the value at a certain key
         :Parameter: key
-        :Complexity: O(1)
+        :Complexity: O(D) where D is the depth of the key
         :raises KeyError: when the key doesn't exist.
         """
         if len(key) == 0:
             raise KeyError("Key cannot be empty")
-        index = self.hash(key)
+        _, _, entry = self._descend(key)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        raise KeyError(key)
 
-        if self.table[index] is None:
-            raise KeyError("Key does not exist")
+    def _split_level(self, key: K, other: K, level: int) -> int:
+        """
+        First level from `level` where key and other take different slots.
+        :Complexity: O(L) where L is the number of levels passed.
+        :raises KeyError: when the keys take the same slot at every level.
+        """
+        while self._index(key, level) == self._index(other, level):
+            if level >= len(key) and level >= len(other):
+                raise KeyError(f"{key!r} and {other!r} take the same slot at every level")
+            level += 1
+        return level
 
-        if isinstance(self.table[index], InfiniteHashTable):
-            return self.table[index][key]
-        elif self.table[index][0] == key:
-            return self.table[index][1]
-        else:
-            raise KeyError("Key does not exist")
+    def _group_level(self, keys: list[K], level: int) -> int:
+        """
+        First level from `level` where keys do not all take the same slot.
+        :Complexity: O(N*L) where N is the number of keys and L the number of levels passed.
+        :raises KeyError: when two keys take the same slot at every level.
+        """
+        # Keys take the same slots for as long as they share characters.
+        level = max(level, len(commonprefix(keys)))
+        while True:
+            index = self._index(keys[0], level)
+            for key in keys:
+                if self._index(key, level) != index:
+                    return level
+            if all(level >= len(key) for key in keys):
+                raise KeyError(f"{keys[0]!r} and {keys[1]!r} take the same slot at every level")
+            level += 1
 
     def __setitem__(self, key: K, value: V) -> None:
         """
         Set an (key, value) pair in our hash table.
+        When the slot holds another key, or key leaves a compressed path, one
+        sub-table is added at the first level where the keys take different slots.
         :Parameter: key, value
-        :Complexity: O(1)
-        :raises KeyError: when the key is empty.
+        :Complexity: O(D) where D is the depth of the key
+        :raises KeyError: when the key is empty, or takes the same slot as another
+                          key at every level.
         """
         if len(key) == 0:
             raise KeyError("Key cannot be empty")
 
+        # One descent, inlined as in _descend, keeping every (table, index) on the way.
+        path = []
+        node = self
         index = self.hash(key)
-        if self.table[index] is None:
-            self.table[index] = (key, value)
-            self.count += 1
-        elif isinstance(self.table[index], InfiniteHashTable):
-            self.table[index][key] = value
-            self.count += 1
-        elif self.table[index][0] == key:
-            self.table[index] = (key, value)
+        length = len(key)
+        last = self.TABLE_SIZE - 1
+        while True:
+            path.append((node, index))
+            bit = 1 << index
+            occupied = node.occupied
+            if not occupied & bit:
+                entry = None
+                break
+            if node.table is not None:
+                entry = node.table[index]
+            else:
+                entry = node.entries[(occupied & (bit - 1)).bit_count()]
+            if not isinstance(entry, InfiniteHashTable):
+                break
+            node = entry
+            index = ord(key[node.level]) % last if node.level < length else last
+        if entry is not None and entry[0] == key:
+            node._set_slot(index, (key, value))
+            return
+
+        # A new key. The descent did not check the compressed levels, so find where key leaves them, if it does.
+        for depth in range(1, len(path)):
+            parent, parent_index = path[depth - 1]
+            child = path[depth][0]
+            if child.level != parent.level + 1 and not parent._follows(key, child):
+                # Split the compressed path there.
+                del path[depth:]
+                node, index, entry = parent, parent_index, child
+                break
+        if entry is None:
+            node._set_slot(index, (key, value))
         else:
-            temp_pair = self.table[index]
-            self.table[index] = InfiniteHashTable(self.level + 1)
-            self.table[index][temp_pair[0]] = temp_pair[1]
-            self.table[index][key] = value
-            self.count += 1
+            other = entry.prefix_key if isinstance(entry, InfiniteHashTable) else entry[0]
+            level = self._split_level(key, other, node.level + 1)
+            branch = InfiniteHashTable(level, key)
+            branch.same_prefix = (key[:level] == other[:level]
+                                  and (not isinstance(entry, InfiniteHashTable) or entry.same_prefix))
+            branch._set_slot(branch._index(other, branch.level), entry)
+            branch.count = len(entry) if isinstance(entry, InfiniteHashTable) else 1
+            branch._set_slot(branch._index(key, branch.level), (key, value))
+            branch.count += 1
+            node._set_slot(index, branch)
+        # Every table on the way down counts the new key.
+        for node, _ in path:
+            node.count += 1
+            if node.same_prefix and node.level and key[:node.level] != node.prefix_key[:node.level]:
+                node.same_prefix = False
 
     def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
+        A sub-table left holding a single pair is replaced by that pair, and one
+        left holding a single sub-table by that sub-table, all the way up.
         :Parameter: key
-        :Complexity: O(1)
+        :Complexity: O(D) where D is the depth of the key
         :raises KeyError: when the key doesn't exist.
         """
         if len(key) == 0:
             raise KeyError("Key cannot be empty")
 
-        index = self.hash(key)
+        path = self._path(key)
+        if path is None:
+            raise KeyError(key)
+        node, index = path[-1]
+        entry = node._slot(index)
+        if entry is None or entry[0] != key:
+            raise KeyError(key)
 
-        if self.table[index] is None:
-            raise KeyError("Key does not exist")
-
-        if isinstance(self.table[index], InfiniteHashTable):
-            del self.table[index][key]
-            self.count -= 1
-            if len(self.table[index]) == 1:
-                inner_pair = self.table[index].get_first_pair()
-                self.table[index] = inner_pair
-
-        elif self.table[index][0] == key:
-            self.table[index] = None
-            self.count -= 1
-        else:
-            raise KeyError("Key does not exist")
+        node._set_slot(index, None)
+        for node, _ in path:
+            node.count -= 1
+        for depth in range(len(path) - 1, 0, -1):
+            child = path[depth][0]
+            parent, index = path[depth - 1]
+            if child.occupied & (child.occupied - 1) == 0:
+                parent._set_slot(index, child.get_first_pair())
 
     def get_first_pair(self):
         """
-        Get the first pair
-        :Complexity: O(N)
+        Get the first pair, from the lowest set bit of the occupancy mask.
+        With a single slot in use this may be a sub-table.
+        :Complexity: O(1)
         """
-        for i in self.table:
-            if i:
-                return i
+        if self.occupied:
+            if self.table is None:
+                return self.entries[0]
+            return self.table[(self.occupied & -self.occupied).bit_length() - 1]
 
     def __len__(self):
         """
@@ -128,39 +413,159 @@ class InfiniteHashTable(Generic[K, V]):
         """
         String representation.
         Not required but may be a good testing tool.
-        :Complexity: O(1)
+        :Complexity: O(TABLE_SIZE)
         """
-        return str(self.table)
+        return str({index: self._slot(index) for index in range(self.table_size) if self.occupied >> index & 1})
 
     def get_location(self, key) -> list[int]:
         """
         Get the sequence of positions required to access this key.
+        Compressed levels are included.
         :Parameter: key
-        :Complexity: O(N)
+        :Complexity: O(len(key))
         :raises KeyError: when the key doesn't exist.
         """
         if len(key) == 0:
             raise KeyError("Key does not exist")
 
-        index = self.hash(key)
-        if self.table[index] is None:
-            raise KeyError("Key does not exist")
+        node, _, entry = self._descend(key)
+        if entry is None or entry[0] != key:
+            raise KeyError(key)
+        # The key was found, so it takes its own slot at every level down to node's.
+        return [self.hash(key)] + [self._index(key, level) for level in range(1, node.level + 1)]
 
-        if isinstance(self.table[index], InfiniteHashTable):
-            return [index] + self.table[index].get_location(key)
-        elif self.table[index][0] == key:
-            return [index]
-        else:
-            raise KeyError("Key does not exist")
+    def _slots(self) -> list[tuple[K, V] | InfiniteHashTable[K, V]]:
+        """
+        Contents of every used slot, in slot order.
+        :Complexity: O(TABLE_SIZE)
+        """
+        if self.table is None:
+            return self.entries
+        return [self.table[index] for index in range(self.table_size) if self.occupied >> index & 1]
+
+    def iter_items(self) -> Iterator[tuple[K, V]]:
+        """
+        Iterates over every (key, value) pair, in slot order rather than key order.
+        :Complexity: O(N) where N is the number of tables and pairs, no recursion.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            # Reversed, so the stack hands sub-tables back in slot order.
+            for entry in reversed(node._slots()):
+                if isinstance(entry, InfiniteHashTable):
+                    stack.append(entry)
+                else:
+                    yield entry
+
+    def _ordered_slots(
+        self, slots: list[tuple[K, V] | InfiniteHashTable[K, V]]
+    ) -> list[tuple[K, V] | InfiniteHashTable[K, V]]:
+        """
+        slots, the contents of every used slot of this table, in key order, for a
+        table holding sub-tables (see _iter_sorted).
+        When this table's keys share their first `level` characters, and so do each
+        sub-table's, every slot holds a single character at this level, so its pairs
+        and sub-tables go in the order of their keys and prefix_keys. Otherwise the
+        pairs of the whole table are collected and sorted instead.
+        :Complexity: O(T*log(T)) where T is the number of slots used.
+                     O(S*log(S)) for the S pairs of a table that is sorted whole.
+        """
+        if self.same_prefix and all(entry.same_prefix for entry in slots if isinstance(entry, InfiniteHashTable)):
+            return sorted(
+                slots, key=lambda entry: entry.prefix_key if isinstance(entry, InfiniteHashTable) else entry[0]
+            )
+        return sorted(self.iter_items(), key=itemgetter(0))
+
+    def _iter_sorted(self) -> Iterator[tuple[K, V]]:
+        """
+        Iterates over every (key, value) pair in key order, a table at a time.
+        A sub-table holding at most SORT_LIMIT pairs has them collected and sorted
+        in one go instead, which is cheaper than walking its tables.
+        :Complexity: O(N) where N is the number of tables and pairs, no recursion, plus
+                     O(S*log(S)) for the S pairs of every table that has to be sorted
+                     whole (see _ordered_slots).
+        """
+        stack = [iter((self,))]
+        while stack:
+            for entry in stack[-1]:
+                if isinstance(entry, InfiniteHashTable):
+                    if entry.count <= self.SORT_LIMIT:
+                        stack.append(iter(sorted(entry.iter_items(), key=itemgetter(0))))
+                        break
+                    slots = entry.entries if entry.table is None else entry._slots()
+                    if len(slots) == entry.count:
+                        # Only pairs. Their keys are all different, so sorting them never compares values.
+                        slots = sorted(slots)
+                    else:
+                        slots = entry._ordered_slots(slots)
+                    stack.append(iter(slots))
+                    break
+                yield entry
+            else:
+                stack.pop()
+
+    def _sorted_items(self) -> list[tuple[K, V]]:
+        """
+        Pairs in key order.
+        :Complexity: See _iter_sorted.
+        """
+        return list(self._iter_sorted())
+
+    def sort_keys(self) -> list[K]:
+        """
+        Returns every key in sorted order.
+        :Complexity: See _iter_sorted.
+        """
+        return [key for key, _ in self._iter_sorted()]
+
+    def items_with_prefix(self, prefix: K) -> Iterator[tuple[K, V]]:
+        """
+        Iterates over the (key, value) pairs whose key starts with prefix, in key order.
+        Only the subtree the prefix leads to is visited. That subtree may hold
+        keys whose characters fall in the same slots as the prefix without
+        matching it, and those are filtered out.
+        :Complexity: O(len(prefix) + K) where K is the number of pairs yielded, while no
+                     characters of different keys in the subtree share a slot. Otherwise
+                     see _iter_sorted: the subtree is walked whole, and the parts of it
+                     holding such keys are sorted, up to O(len(prefix) + S*log(S)) where
+                     S is the size of the subtree.
+        """
+        if len(prefix) == 0:
+            yield from self._iter_sorted()
+            return
+        node = self
+        index = self.hash(prefix)
+        while True:
+            entry = node._slot(index)
+            if entry is None:
+                return
+            if not isinstance(entry, InfiniteHashTable):
+                if entry[0].startswith(prefix):
+                    yield entry
+                return
+            for level in range(node.level + 1, min(entry.level, len(prefix))):
+                if node._index(prefix, level) != node._index(entry.prefix_key, level):
+                    return
+            node = entry
+            if node.level >= len(prefix):
+                break
+            index = node._index(prefix, node.level)
+        if node.same_prefix:
+            # Every key below has the same first node.level characters, which cover the prefix.
+            if node.prefix_key.startswith(prefix):
+                yield from node._iter_sorted()
+            return
+        for pair in node._iter_sorted():
+            if pair[0].startswith(prefix):
+                yield pair
 
     def __contains__(self, key: K) -> bool:
         """
         Checks to see if the given key is in the Hash Table
-        :complexity: See linear probe.
+        :Complexity: O(D) where D is the depth of the key
         """
-        try:
-            _ = self[key]
-        except KeyError:
+        if len(key) == 0:
             return False
-        else:
-            return True
+        _, _, entry = self._descend(key)
+        return entry is not None and entry[0] == key
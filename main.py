@@ -396,19 +396,27 @@ class MyWindow(arcade.Window):
         all_mountains = []
         for i, group in enumerate(groups):
             to.add_mountains(group)
-            for mountain in group:
-                positions[mountain.difficulty_level, mountain.name] = []
+            positions.set_many(
+                [(mountain.difficulty_level, mountain.name) for mountain in group],
+                [[] for _ in group]
+            )
             all_mountains.extend(group)
-            for mountain in all_mountains:
-                positions[mountain.difficulty_level, mountain.name].append(to.cur_position(mountain))
+            all_positions = positions.get_many(
+                (mountain.difficulty_level, mountain.name) for mountain in all_mountains
+            )
+            for mountain, mountain_positions in zip(all_mountains, all_positions):
+                mountain_positions.append(to.cur_position(mountain))
+        all_positions = positions.get_many(
+            (mountain.difficulty_level, mountain.name) for mountain in all_mountains
+        )
         self.graph_data = [
             [
                 get_col(i, len(all_mountains)),
-                len(groups) - len(positions[mountain.difficulty_level, mountain.name]),
+                len(groups) - len(mountain_positions),
                 mountain.name,
-                positions[mountain.difficulty_level, mountain.name]
+                mountain_positions
             ]
-            for i, mountain in enumerate(all_mountains)
+            for i, (mountain, mountain_positions) in enumerate(zip(all_mountains, all_positions))
         ]
 
     def on_save_file_clicked(self):
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import List
 
+from algorithms.binary_search import bisect_left
 from mountain import Mountain
 
 class MountainOrganiser:
@@ -21,44 +22,21 @@ class MountainOrganiser:
 
         self.mountains.sort()
 
-    def _binary_search(self, mountains, target):
-        """
-        comparing the target value with the middle element of the list
-        If they are not equal:
-        the half in which the target cannot lie is eliminated
-        the search continues on the remaining half
-        again taking the middle element to compare to the target
-        and repeating this until the target is found or the search space is reduced to zero
-
-        :parameter: mountains, target
-        :complexity: O(logN), where N is the length of the list mountains.
-        """
-        start, end = 0, len(mountains) - 1
-        while start <= end:
-            mid = (start + end) // 2
-            if mountains[mid] == target:
-                return mid
-            elif mountains[mid] < target:
-                start = mid + 1
-            else:
-                end = mid - 1
-        return -1
-
     def cur_position(self, mountain: Mountain) -> int:
         """
-        The binary search is to divides the search space in half until the target is found
-        or the search space is exhausted
-        and then If i != -1, the mountain was found in the list, and the method returns i.
+        Binary search for the mountain's (length, name).
+        That pair sorts just before the mountain's own (length, name, mountain) entry,
+        so the search stops at the entry without ever comparing two Mountains.
+        If the entry at the returned index is the mountain, that index is its position.
         Otherwise, it raises a KeyError indicating that the mountain was not found in the list.
 
         :parameter: mountain
         :complexity: O(logN), where N is the total number of mountains included so far.
         """
-        i = self._binary_search(self.mountains, (mountain.length, mountain.name, mountain))
-        if i != -1:
-            return i
-        else:
-            raise KeyError
-
-
-
+        i = bisect_left(self.mountains, (mountain.length, mountain.name))
+        if i < len(self.mountains):
+            found = self.mountains[i][2]
+            # Identity first, the dataclass __eq__ builds a tuple of each side's fields.
+            if found is mountain or found == mountain:
+                return i
+        raise KeyError(mountain.name)
@@ -26,7 +26,9 @@ class EnhancedJSONEncoder(json.JSONEncoder):
 def serialize(trail):
     return json.dumps(trail, cls=EnhancedJSONEncoder)
 
-def deserialize(obj):
+def deserialize(obj, interner=None):
+    if interner is not None:
+        return _deserialize_interned(obj, interner)
     if obj["store"] is None:
         return Trail(None)
     if "mountain" in obj["store"]:
@@ -41,3 +43,18 @@ def deserialize(obj):
             deserialize(obj["store"]["path_follow"])
         )
     return Trail(inside)
+
+def _deserialize_interned(obj, interner):
+    # Builds the canonical trail straight away, so repeated sub-trails are never built twice.
+    if obj["store"] is None:
+        return interner.empty()
+    if "mountain" in obj["store"]:
+        return interner.series(
+            Mountain(**obj["store"]["mountain"]),
+            _deserialize_interned(obj["store"]["following"], interner)
+        )
+    return interner.split(
+        _deserialize_interned(obj["store"]["path_top"], interner),
+        _deserialize_interned(obj["store"]["path_bottom"], interner),
+        _deserialize_interned(obj["store"]["path_follow"], interner)
+    )
@@ -123,3 +123,243 @@ class TestDoubleHash(unittest.TestCase):
         # with an iterator.
         self.assertRaises(BaseException, lambda: next(key_iterator))
         self.assertRaises(BaseException, lambda: next(value_iterator))
+
+    @number("3.6")
+    def test_incremental_resize(self):
+        dt = DoubleKeyTable(incremental_resize=True)
+        for i in range(300):
+            dt[f"Range {i % 40}", f"Peak {i}"] = i
+        self.assertEqual(len(dt), 300)
+        self.assertEqual(dt["Range 7", "Peak 247"], 247)
+        self.assertIn(("Range 39", "Peak 39"), dt)
+        self.assertNotIn(("Range 39", "Peak 40"), dt)
+        for i in range(0, 300, 2):
+            del dt[f"Range {i % 40}", f"Peak {i}"]
+        self.assertEqual(len(dt), 150)
+        self.assertEqual(set(dt.keys("Range 1")), {f"Peak {i}" for i in range(1, 300, 40)})
+        self.assertEqual(sorted(dt.values()), list(range(1, 300, 2)))
+        self.assertEqual(set(dt.keys()), {f"Range {i}" for i in range(1, 40, 2)})
+
+    @number("3.7")
+    def test_hashers(self):
+        from data_structures.hashers import BytesHasher, Crc32Hasher
+        dt = DoubleKeyTable(hasher1=BytesHasher(), hasher2=Crc32Hasher())
+        for i in range(200):
+            dt[f"Range {i % 13}", f"Peak {i}"] = i
+        self.assertEqual(dt.hash1("Range 1"), BytesHasher()("Range 1") % dt.table_size)
+        outer_pos, inner_pos = dt._linear_probe("Range 1", "Peak 14", False)
+        self.assertEqual(dt.top_level_table.storage.key_at(outer_pos), "Range 1")
+        self.assertEqual(dt["Range 1", "Peak 14"], 14)
+        self.assertEqual(len(dt), 200)
+        self.assertEqual(sorted(dt.values()), list(range(200)))
+
+    @number("3.8")
+    def test_get(self):
+        dt = DoubleKeyTable()
+        dt["Tim", "Jen"] = 1
+        dt["Tim", "Amy"] = 2
+        dt["Amy", "Tim"] = 3
+        dt["Tim", "Jen"] = 4
+        self.assertEqual(len(dt), 3)
+        self.assertEqual(dt.get("Tim", "Jen"), 4)
+        self.assertIsNone(dt.get("Tim", "Bob"))
+        self.assertEqual(dt.get("Bob", "Tim", 0), 0)
+        self.assertIn(("Amy", "Tim"), dt)
+        self.assertNotIn(("Amy", "Jen"), dt)
+        self.assertNotIn(("Bob", "Tim"), dt)
+
+    @number("3.9")
+    def test_batch(self):
+        dt = DoubleKeyTable()
+        pairs = [(f"Range {i % 5}", f"Peak {i}") for i in range(60)]
+        dt.set_many(pairs, range(60))
+        self.assertEqual(len(dt), 60)
+        self.assertEqual(dt.get_many(reversed(pairs)), list(range(59, -1, -1)))
+        dt.set_many([("Range 0", "Peak 0"), ("Range 9", "Peak 0"), ("Range 0", "Peak 0")], [7, 8, 9])
+        self.assertEqual(len(dt), 61)
+        self.assertEqual(dt.get_many([("Range 0", "Peak 0"), ("Range 9", "Peak 0")]), [9, 8])
+        self.assertEqual(dt.get_many([("Range 1", "Peak 1"), ("Range 1", "Peak 0"), ("Bob", "Tim")], None),
+                         [1, None, None])
+        self.assertRaises(KeyError, lambda: dt.get_many([("Range 1", "Peak 0")]))
+        self.assertRaises(KeyError, lambda: dt.get_many([("Bob", "Tim")]))
+        self.assertRaises(ValueError, lambda: dt.set_many(pairs, [1]))
+
+    @number("3.10")
+    def test_views(self):
+        dt = DoubleKeyTable()
+        keys, values, items = dt.keys(), dt.values(), dt.items()
+        self.assertEqual((len(keys), len(values), len(items)), (0, 0, 0))
+        dt["May", "Jim"] = 1
+        dt["May", "Tom"] = 2
+        dt["Kim", "Tim"] = 3
+        may_keys = dt.keys("May")
+        self.assertEqual((len(keys), len(values), len(items), len(may_keys)), (2, 3, 3, 2))
+        self.assertEqual(set(keys), {"May", "Kim"})
+        self.assertEqual(set(may_keys), {"Jim", "Tom"})
+        self.assertEqual(sorted(values), [1, 2, 3])
+        self.assertEqual(set(items), {(("May", "Jim"), 1), (("May", "Tom"), 2), (("Kim", "Tim"), 3)})
+        self.assertEqual(set(dt.items("Kim")), {("Tim", 3)})
+        self.assertIn("Kim", keys)
+        self.assertIn("Tom", may_keys)
+        self.assertNotIn("Kim", may_keys)
+        self.assertIn(2, values)
+        self.assertIn((("May", "Tom"), 2), items)
+        self.assertNotIn((("May", "Tom"), 1), items)
+        del dt["May", "Jim"]
+        del dt["May", "Tom"]
+        self.assertEqual((len(keys), len(values), len(may_keys)), (1, 1, 0))
+        self.assertEqual(list(may_keys), [])
+        self.assertRaises(KeyError, lambda: dt.keys("May"))
+
+    @number("3.11")
+    def test_snapshot(self):
+        import os
+        import tempfile
+        from data_structures.hashers import BuiltinHasher, BytesHasher
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "table.snap")
+        for options in (dict(), dict(hasher1=BytesHasher(), hasher2=BytesHasher())):
+            dt = DoubleKeyTable(**options)
+            for i in range(200):
+                dt[f"Range {i % 7}", f"Peak {i}"] = [i]
+            dt.save(path)
+            loaded = DoubleKeyTable.load(path)
+            self.assertEqual(len(loaded), 200)
+            self.assertEqual(loaded.table_size, dt.table_size)
+            self.assertEqual(loaded._linear_probe("Range 3", "Peak 10", False),
+                             dt._linear_probe("Range 3", "Peak 10", False))
+            self.assertEqual(loaded["Range 3", "Peak 10"], [10])
+            self.assertNotIn(("Range 3", "Peak 11"), loaded)
+            self.assertEqual(dict(loaded.items()), dict(dt.items()))
+            # Writes copy the tables out of the file, keeping values already read.
+            loaded["Range 3", "Peak 10"].append(0)
+            loaded["Range 3", "Peak 11"] = [11]
+            del loaded["Range 4", "Peak 4"]
+            self.assertEqual(loaded["Range 3", "Peak 10"], [10, 0])
+            self.assertEqual(loaded["Range 3", "Peak 11"], [11])
+            self.assertEqual(len(loaded), 200)
+            self.assertEqual(dt["Range 3", "Peak 10"], [10])
+        dt = DoubleKeyTable(hasher1=BuiltinHasher())
+        self.assertRaises(ValueError, lambda: dt.save(path))
+        dt = DoubleKeyTable()
+        dt.hash1 = lambda k: 0
+        self.assertRaises(ValueError, lambda: dt.save(path))
+
+    @number("3.12")
+    def test_top_level_rehash(self):
+        default = DoubleKeyTable(sizes=[5, 13, 29])
+        overridden = DoubleKeyTable(sizes=[5, 13, 29])
+        # As in main.py, with integer top-level keys.
+        overridden.hash1 = lambda k: k % overridden.table_size
+        for dt, key in ((default, lambda i: f"Range {i}"), (overridden, lambda i: i)):
+            # Enough top-level keys to grow the top-level table past its first size.
+            for i in range(12):
+                dt[key(i), "Peak"] = i
+            self.assertGreater(dt.table_size, 5)
+            dt._rehash()
+            self.assertEqual(len(dt), 12)
+            for i in range(12):
+                self.assertEqual(dt[key(i), "Peak"], i)
+            self.assertEqual(sorted(dt.keys()), sorted(key(i) for i in range(12)))
+
+    @number("3.13")
+    def test_view_set_operators(self):
+        dt = DoubleKeyTable()
+        dt["May", "Jim"] = 1
+        dt["May", "Tom"] = 2
+        dt["Kim", "Tim"] = 3
+        keys, may_keys, items = dt.keys(), dt.keys("May"), dt.items()
+
+        self.assertEqual(keys & {"May", "Bob"}, {"May"})
+        self.assertEqual(keys | {"Bob"}, {"May", "Kim", "Bob"})
+        self.assertEqual(keys - {"Kim"}, {"May"})
+        self.assertEqual(keys ^ {"Kim", "Bob"}, {"May", "Bob"})
+        self.assertEqual({"Tom", "Bob"} & may_keys, {"Tom"})
+        self.assertEqual({"Tom", "Bob"} - may_keys, {"Bob"})
+
+        self.assertEqual(items & {(("Kim", "Tim"), 3), (("Kim", "Tim"), 4), "junk"}, {(("Kim", "Tim"), 3)})
+        self.assertEqual(items - {(("May", "Jim"), 1)}, {(("May", "Tom"), 2), (("Kim", "Tim"), 3)})
+        self.assertEqual(len(items | {"junk"}), 4)
+        self.assertEqual(dt.items("May") ^ {("Jim", 1), ("Bob", 5)}, {("Tom", 2), ("Bob", 5)})
+
+        # Views are live, so later operations see later changes.
+        dt["Bob", "Ann"] = 4
+        self.assertEqual(keys & {"Bob"}, {"Bob"})
+        self.assertTrue(keys.isdisjoint({"Ann"}))
+
+    @number("3.14")
+    def test_snapshot_save_in_place(self):
+        import os
+        import tempfile
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "table.snap")
+        dt = DoubleKeyTable()
+        for i in range(200):
+            dt[f"Range {i % 7}", f"Peak {i}"] = [i]
+        dt.save(path)
+        loaded = DoubleKeyTable.load(path)
+        # One bottom-level table copied out by a write, the others still mapped or not read yet.
+        self.assertEqual(loaded["Range 1", "Peak 1"], [1])
+        loaded["Range 3", "Peak 3"] = [0]
+        expected = dict(dt.items())
+        expected["Range 3", "Peak 3"] = [0]
+        loaded.save(path)
+        self.assertEqual(os.listdir(directory.name), ["table.snap"])
+        # The loaded table still reads the file it was loaded from.
+        self.assertEqual(dict(loaded.items()), expected)
+        reloaded = DoubleKeyTable.load(path)
+        self.assertEqual(dict(reloaded.items()), expected)
+
+        reloaded.close()
+        self.assertIsNone(reloaded._mapped)
+        self.assertEqual(dict(reloaded.items()), expected)
+        reloaded["Range 2", "Peak 2"] = [2, 2]
+        self.assertEqual(reloaded["Range 2", "Peak 2"], [2, 2])
+        reloaded.close()
+        loaded.close()
+        self.assertEqual(dict(loaded.items()), expected)
+        dt.close()
+
+        # A failed save leaves the old snapshot and no temporary file.
+        bad = DoubleKeyTable()
+        bad[("R",), "Peak"] = 1
+        self.assertRaises(ValueError, lambda: bad.save(path))
+        self.assertEqual(os.listdir(directory.name), ["table.snap"])
+        self.assertEqual(dict(DoubleKeyTable.load(path).items()), expected)
+
+    @number("3.15")
+    def test_bound_hashes(self):
+        import random
+        rng = random.Random(15)
+        dt = DoubleKeyTable()
+        for i in range(400):
+            dt[f"Range {i % 37}", f"Peak {i}"] = i
+        self.assertGreater(dt.table_size, 5)
+        keys = ["", "a", "Mount Feathertop", "Great Dividing Range Spire 12"]
+        keys += ["".join(chr(rng.randrange(32, 3000)) for _ in range(rng.randrange(60))) for _ in range(50)]
+        inner_hash_table = dt.top_level_table["Range 3"]
+        # The tables' weighted sums agree with hash1 and hash2 at every size.
+        for key in keys:
+            self.assertEqual(dt.top_level_table.hash(key), dt.hash1(key))
+            self.assertEqual(inner_hash_table.hash(key), dt.hash2(key, inner_hash_table))
+            for size in DoubleKeyTable.TABLE_SIZES[:6]:
+                table = DoubleKeyTable(sizes=[size], internal_sizes=[size])
+                self.assertEqual(table.top_level_table.hash(key), table.hash1(key))
+
+        # Replacing hash1 and hash2 rebinds the tables already made.
+        dt.hash1 = lambda k: 0
+        dt.hash2 = lambda k, sub_table: 1
+        self.assertEqual(dt.top_level_table.hash("Range 3"), 0)
+        self.assertEqual(inner_hash_table.hash("Peak 3"), 1)
+        self.assertEqual(dt._new_inner_table().hash("Peak 3"), 1)
+
+        class Overridden(DoubleKeyTable):
+            def hash2(self, key, sub_table):
+                return len(key) % sub_table.table_size
+
+        overridden = Overridden(internal_sizes=[13])
+        overridden["Range", "Peak"] = 1
+        self.assertEqual(overridden.top_level_table["Range"].hash("Peak"), 4)
+        self.assertEqual(overridden.top_level_table.hash("Range"), DoubleKeyTable().hash1("Range"))
@@ -0,0 +1,287 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.hash_table import LinearProbeTable, TOMBSTONE, FullError
+
+class TestLinearProbeTable(unittest.TestCase):
+
+    def make_table(self, **kwargs) -> LinearProbeTable:
+        # Disable resizing, and hash on the first letter so clusters are easy to build.
+        table = LinearProbeTable(sizes=[13], **kwargs)
+        table.hash = lambda k: ord(k[0]) % 13
+        return table
+
+    @number("8.1")
+    def test_tombstone_delete(self):
+        table = self.make_table(deletion="tombstone")
+        table["Amy"] = 1
+        table["Ann"] = 2
+        table["Ava"] = 3
+
+        del table["Ann"]
+        self.assertIs(table.array[ord("A") % 13 + 1], TOMBSTONE)
+        self.assertEqual(table.tombstones, 1)
+        self.assertEqual(len(table), 2)
+        # Still reachable past the tombstone.
+        self.assertEqual(table["Ava"], 3)
+        self.assertNotIn("Ann", table)
+        self.assertRaises(KeyError, lambda: table["Ann"])
+
+        # The tombstone is reused by the next insert passing over it.
+        table["Abe"] = 4
+        self.assertEqual(table._linear_probe("Abe", False), ord("A") % 13 + 1)
+        self.assertEqual(table.tombstones, 0)
+        self.assertEqual(set(table.keys()), {"Amy", "Abe", "Ava"})
+        self.assertEqual(set(table.values()), {1, 3, 4})
+
+    @number("8.2")
+    def test_tombstone_cleanup(self):
+        table = LinearProbeTable(deletion="tombstone", tombstone_fraction=0.1)
+        keys = [f"key{i}" for i in range(200)]
+        for i, key in enumerate(keys):
+            table[key] = i
+        for key in keys[::2]:
+            del table[key]
+            self.assertLessEqual(table.tombstones, 0.1 * table.table_size)
+        self.assertEqual(len(table), 100)
+        for i, key in enumerate(keys):
+            if i % 2:
+                self.assertEqual(table[key], i)
+            else:
+                self.assertNotIn(key, table)
+
+    @number("8.3")
+    def test_modes_agree(self):
+        tables = [LinearProbeTable(deletion=mode) for mode in LinearProbeTable.DELETION_MODES]
+        for table in tables:
+            for i in range(300):
+                table[f"m{i}"] = i
+            for i in range(0, 300, 3):
+                del table[f"m{i}"]
+            for i in range(0, 300, 6):
+                table[f"m{i}"] = -i
+        self.assertEqual(sorted(tables[0].keys()), sorted(tables[1].keys()))
+        self.assertEqual(sorted(tables[0].values()), sorted(tables[1].values()))
+        self.assertRaises(ValueError, lambda: LinearProbeTable(deletion="lazy"))
+        self.assertRaises(ValueError, lambda: LinearProbeTable(deletion="tombstone", tombstone_fraction=0.5))
+
+    @number("8.4")
+    def test_cached_hashes(self):
+        table = LinearProbeTable(cache_hashes=True)
+        for i in range(100):
+            table[f"Mount {i}"] = i
+        self.assertGreater(table.table_size, 100)
+        for x in range(table.table_size):
+            entry = table.array[x]
+            if entry is not None:
+                key, _, key_hash = entry
+                self.assertEqual(key_hash, table.key_hash(key))
+                self.assertEqual(table.hash(key), key_hash % table.table_size)
+        for i in range(0, 100, 2):
+            del table[f"Mount {i}"]
+        self.assertEqual(sorted(table.values()), list(range(1, 100, 2)))
+        self.assertEqual(table["Mount 51"], 51)
+        self.assertNotIn("Mount 50", table)
+        table["Mount 51"] = -1
+        self.assertEqual(table["Mount 51"], -1)
+        self.assertEqual(len(table), 50)
+
+    @number("8.5")
+    def test_columnar_storage(self):
+        for deletion in LinearProbeTable.DELETION_MODES:
+            tuples = LinearProbeTable(deletion=deletion, cache_hashes=True)
+            columns = LinearProbeTable(deletion=deletion, storage="columnar")
+            self.assertTrue(columns.cache_hashes)
+            for table in (tuples, columns):
+                for i in range(500):
+                    table[f"Peak {i}"] = i
+                for i in range(0, 500, 4):
+                    del table[f"Peak {i}"]
+                table["Peak 1"] = None
+            # Same hashes and probing, so the same layout.
+            self.assertEqual(tuples.keys(), columns.keys())
+            self.assertEqual(tuples.values(), columns.values())
+            self.assertEqual(list(tuples), list(columns))
+            self.assertEqual(len(columns), 375)
+            self.assertIsNone(columns["Peak 1"])
+            self.assertNotIn("Peak 4", columns)
+            self.assertRaises(KeyError, lambda: columns["Peak 8"])
+        self.assertRaises(ValueError, lambda: LinearProbeTable(storage="rows"))
+
+    @number("8.6")
+    def test_incremental_resize(self):
+        for deletion in LinearProbeTable.DELETION_MODES:
+            table = LinearProbeTable(deletion=deletion, incremental_resize=True, migrate_batch=2)
+            saw_migration = False
+            expected = {}
+            for i in range(1000):
+                table[f"Ridge {i}"] = i
+                expected[f"Ridge {i}"] = i
+                saw_migration = saw_migration or table.old_storage is not None
+                if i % 3 == 0:
+                    del table[f"Ridge {i // 3}"]
+                    del expected[f"Ridge {i // 3}"]
+                # Entries still waiting in the old array are found.
+                if f"Ridge {i // 2}" in expected:
+                    self.assertEqual(table[f"Ridge {i // 2}"], i // 2)
+            self.assertTrue(saw_migration)
+            self.assertEqual(len(table), len(expected))
+            self.assertEqual(sorted(table.keys()), sorted(expected))
+            self.assertEqual(dict(table.iter_items()), expected)
+            self.assertNotIn("Ridge 3", table)
+            self.assertRaises(KeyError, lambda: table["Ridge 3"])
+
+    @number("8.7")
+    def test_bulk_load(self):
+        pairs = [(f"Summit {i}", i) for i in range(1000)]
+        table = LinearProbeTable.from_items(iter(pairs), cache_hashes=True)
+        # Smallest size holding 1000 entries at half load.
+        self.assertEqual(table.table_size, 3079)
+        self.assertEqual(len(table), 1000)
+        self.assertEqual(table["Summit 999"], 999)
+
+        table.update((f"Summit {i}", -i) for i in range(500, 2000))
+        self.assertEqual(table.table_size, 6151)
+        self.assertEqual(len(table), 2000)
+        self.assertEqual(table["Summit 499"], 499)
+        self.assertEqual(table["Summit 500"], -500)
+
+        hinted = LinearProbeTable(size_hint=100)
+        self.assertEqual(hinted.table_size, 389)
+        self.assertEqual(LinearProbeTable(sizes=[5, 13], size_hint=100).table_size, 13)
+
+    @number("8.8")
+    def test_robin_hood(self):
+        import random
+        rng = random.Random(8)
+        for options in (dict(), dict(storage="columnar"), dict(incremental_resize=True)):
+            table = LinearProbeTable(probing="robin_hood", **options)
+            expected = {}
+            for _ in range(3000):
+                key = f"Col {rng.randrange(800)}"
+                if key in expected and rng.random() < 0.4:
+                    del table[key]
+                    del expected[key]
+                else:
+                    table[key] = expected[key] = rng.random()
+            self.assertEqual(len(table), len(expected))
+            self.assertEqual(dict(table.iter_items()), expected)
+            for i in range(800):
+                self.assertEqual(f"Col {i}" in table, f"Col {i}" in expected)
+
+            # Every slot between an entry's home and its position is taken
+            # by an entry whose home is no later.
+            storage = table.storage
+            size = table.table_size
+            for position in range(size):
+                if storage.key_at(position) is not None:
+                    distance = (position - storage.hash_at(position)) % size
+                    for back in range(1, distance + 1):
+                        before = (position - back) % size
+                        self.assertIsNotNone(storage.key_at(before))
+                        self.assertGreaterEqual((before - storage.hash_at(before)) % size, distance - back)
+        self.assertRaises(ValueError, lambda: LinearProbeTable(probing="robin_hood", deletion="tombstone"))
+
+    @number("8.9")
+    def test_probe_stats(self):
+        table = self.make_table()
+        self.assertEqual(table.probe_stats(), (0.0, 0))
+        table["Amy"] = 1
+        table["Ann"] = 2
+        table["Ava"] = 3
+        table["Bob"] = 4
+        # Lengths 1, 2, 3 and 3.
+        self.assertEqual(table.probe_stats(), (2.25, 3))
+
+    @number("8.10")
+    def test_hashers(self):
+        from data_structures.hashers import HASHERS, HASH_MODULUS, BytesHasher
+        keys = [f"Spur {i}" for i in range(300)]
+        for name, hasher_type in HASHERS.items():
+            hasher = hasher_type()
+            self.assertEqual(hasher.name, name)
+            for key in keys[:20]:
+                self.assertTrue(0 <= hasher(key) <= HASH_MODULUS)
+                self.assertEqual(hasher(key), hasher(key))
+            table = LinearProbeTable(hasher=hasher)
+            self.assertTrue(table.cache_hashes)
+            for i, key in enumerate(keys):
+                table[key] = i
+            self.assertEqual(table.hash("Spur 7"), hasher("Spur 7") % table.table_size)
+            self.assertEqual(sorted(table.values()), list(range(300)))
+        self.assertEqual(BytesHasher()("ab"), ord("a") + 256 * ord("b"))
+
+    @number("8.11")
+    def test_single_probe_api(self):
+        for kwargs in (dict(), dict(deletion="tombstone"), dict(probing="robin_hood"), dict(storage="columnar")):
+            table = self.make_table(**kwargs)
+            self.assertTrue(table._upsert("Amy", 1))
+            self.assertFalse(table._upsert("Amy", 2))
+            self.assertEqual(table["Amy"], 2)
+            made = []
+            factory = lambda: made.append(1) or len(made)
+            self.assertEqual(table._get_or_insert("Ann", factory), 1)
+            self.assertEqual(table._get_or_insert("Ann", factory), 1)
+            self.assertEqual(len(made), 1)
+            self.assertEqual(len(table), 2)
+            self.assertEqual(table._find("Ava"), -1)
+            self.assertEqual(table._find("Ann"), table._linear_probe("Ann", False))
+            self.assertEqual(table.get("Ann"), 1)
+            self.assertIsNone(table.get("Ava"))
+            self.assertEqual(table.get("Ava", 0), 0)
+
+    @number("8.12")
+    def test_occupancy_map(self):
+        import random
+        rng = random.Random(3)
+        for kwargs in (dict(), dict(deletion="tombstone"), dict(probing="robin_hood"),
+                       dict(storage="columnar"), dict(incremental_resize=True)):
+            table = LinearProbeTable(**kwargs)
+            expected = {}
+            for i in range(600):
+                key = f"Col {rng.randrange(150)}"
+                if key in expected and rng.random() < 0.4:
+                    del table[key]
+                    del expected[key]
+                else:
+                    table[key] = i
+                    expected[key] = i
+            storage = table.storage
+            for position in range(table.table_size):
+                key = storage.key_at(position)
+                self.assertEqual(storage.occupied[position], int(key is not None and key is not TOMBSTONE))
+            self.assertEqual(dict(table.iter_items()), expected)
+            table._finish_migration()
+            self.assertEqual(sorted(table.keys()), sorted(expected))
+            self.assertEqual(sorted(table.values()), sorted(expected.values()))
+
+    @number("8.13")
+    def test_tombstone_delete_at_largest_size(self):
+        table = LinearProbeTable(sizes=[5, 7], deletion="tombstone")
+        # Fills the largest size, so the last insert tries to grow past it.
+        for i in range(7):
+            table[f"k{i}"] = i
+        self.assertEqual(table.table_size, 7)
+        self.assertEqual(table.size_index, 1)
+        # Enough deletes to trigger a same-size cleanup of the tombstones.
+        for i in range(6):
+            del table[f"k{i}"]
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.table_size, 7)
+        self.assertEqual(table["k6"], 6)
+        table["k0"] = 0
+        self.assertEqual(table["k0"], 0)
+
+    @number("8.14")
+    def test_robin_hood_full(self):
+        for storage in ("tuple", "columnar"):
+            table = LinearProbeTable(sizes=[5], probing="robin_hood", storage=storage)
+            for i in range(5):
+                table[f"k{i}"] = i
+            self.assertEqual(len(table), 5)
+            self.assertRaises(FullError, lambda: table.__setitem__("zz", 1))
+            self.assertEqual(len(table), 5)
+            self.assertNotIn("zz", table)
+            # Existing keys can still be updated.
+            table["k3"] = 30
+            self.assertEqual(dict(table.iter_items()), {"k0": 0, "k1": 1, "k2": 2, "k3": 30, "k4": 4})
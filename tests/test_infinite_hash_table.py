@@ -67,3 +67,153 @@ class TestInfiniteHash(unittest.TestCase):
         ih["lin"] = 10
         self.assertEqual(ih.get_location("lin"), [4])
         self.assertEqual(len(ih), 1)
+
+    @number("4.3")
+    def test_get(self):
+        ih = InfiniteHashTable()
+        ih["lin"] = 1
+        ih["linked"] = 2
+        self.assertEqual(ih.get("lin"), 1)
+        self.assertEqual(ih.get("linked"), 2)
+        self.assertIsNone(ih.get("link"))
+        self.assertEqual(ih.get("leg", 0), 0)
+        self.assertEqual(ih.get("", 0), 0)
+        self.assertNotIn("link", ih)
+        # Updating a nested key does not change any count.
+        ih["linked"] = 3
+        self.assertEqual(len(ih), 2)
+        self.assertEqual(len(ih._slot(4)), 2)
+        self.assertEqual(ih["linked"], 3)
+        self.assertRaises(KeyError, lambda: ih["link"])
+        self.assertRaises(KeyError, lambda: ih.__delitem__("link"))
+        self.assertEqual(len(ih), 2)
+
+    @number("4.4")
+    def test_ordered_iteration(self):
+        ih = InfiniteHashTable()
+        keys = ["lin", "leg", "mine", "linked", "limp", "mining", "jake", "linger", "li", "l", "lun"]
+        for i, key in enumerate(keys):
+            ih[key] = i
+        self.assertEqual(sorted(ih.iter_items()), sorted((key, i) for i, key in enumerate(keys)))
+        self.assertEqual(ih.sort_keys(), sorted(keys))
+        # "l" and " " share a slot, as do "i" and "u".
+        self.assertEqual([key for key, _ in ih.items_with_prefix("li")], ["li", "limp", "lin", "linger", "linked"])
+        self.assertEqual(list(ih.items_with_prefix("lin")), [("lin", 0), ("linger", 7), ("linked", 3)])
+        self.assertEqual(list(ih.items_with_prefix("mine")), [("mine", 2)])
+        self.assertEqual(list(ih.items_with_prefix("linking")), [])
+        self.assertEqual(list(ih.items_with_prefix("q")), [])
+        self.assertEqual([key for key, _ in ih.items_with_prefix("")], sorted(keys))
+
+    @number("4.5")
+    def test_from_items(self):
+        keys = ["lin", "leg", "mine", "linked", "limp", "mining", "jake", "linger"]
+        built = InfiniteHashTable.from_items((key, i) for i, key in enumerate(keys))
+        inserted = InfiniteHashTable()
+        for i, key in enumerate(keys):
+            inserted[key] = i
+        self.assertEqual(len(built), 8)
+        for key in keys:
+            self.assertEqual(built.get_location(key), inserted.get_location(key))
+            self.assertEqual(built[key], inserted[key])
+        self.assertEqual(built.get_location("lin"), [4, 1, 6, 26])
+        self.assertEqual(InfiniteHashTable.from_items([("lin", 1), ("lin", 2)])["lin"], 2)
+        # Still a normal table afterwards.
+        del built["mine"]
+        self.assertEqual(built.get_location("mining"), [5])
+        built["line"] = 9
+        self.assertEqual(built.get_location("line"), [4, 1, 6, 23])
+        self.assertRaises(KeyError, lambda: InfiniteHashTable.from_items([("", 1)]))
+
+    @number("4.6")
+    def test_sparse_to_full(self):
+        ih = InfiniteHashTable()
+        # "x" takes slot 16, and the second characters slots 19 to 25, then 0 and 1.
+        keys = ["x" + chr(ord("a") + i) for i in range(InfiniteHashTable.SPARSE_LIMIT + 1)]
+        for i, key in enumerate(keys[:-1]):
+            ih[key] = i
+        sub_table = ih._slot(16)
+        self.assertIsNone(sub_table.table)
+        self.assertEqual(len(sub_table.entries), InfiniteHashTable.SPARSE_LIMIT)
+        self.assertEqual(ih.get_location("xh"), [16, 0])
+        ih[keys[-1]] = 8
+        self.assertIs(ih._slot(16), sub_table)
+        self.assertIsNone(sub_table.entries)
+        self.assertIsNotNone(sub_table.table)
+        for i, key in enumerate(keys):
+            self.assertEqual(ih.get_location(key), [16, ord(key[1]) % 26])
+            self.assertEqual(ih[key], i)
+        self.assertEqual(ih.sort_keys(), keys)
+        # Deleting down to one pair replaces the full table by that pair.
+        for key in keys[:-1]:
+            del ih[key]
+            self.assertEqual(ih.sort_keys(), keys[keys.index(key) + 1:])
+            self.assertEqual(ih.get_location("xi"), [16, 1] if len(ih) > 1 else [16])
+        self.assertEqual(ih._slot(16), ("xi", 8))
+        self.assertEqual(len(ih), 1)
+
+    @number("4.7")
+    def test_compressed_paths(self):
+        ih = InfiniteHashTable()
+        ih["abcdq"] = 1
+        ih["abcdr"] = 2
+        # One sub-table at level 4, straight in the top slot of "a".
+        compressed = ih._slot(19)
+        self.assertEqual(compressed.level, 4)
+        self.assertEqual(ih.get_location("abcdq"), [19, 20, 21, 22, 9])
+        self.assertEqual(ih.get_location("abcdr"), [19, 20, 21, 22, 10])
+        self.assertNotIn("abxdq", ih)
+        self.assertRaises(KeyError, lambda: ih.__delitem__("abxdq"))
+
+        # "abx" leaves the compressed path at level 2, which splits it there.
+        ih["abx"] = 3
+        branch = ih._slot(19)
+        self.assertEqual(branch.level, 2)
+        self.assertIs(branch._slot(21), compressed)
+        self.assertEqual(len(branch), 3)
+        self.assertEqual(ih.get_location("abx"), [19, 20, 16])
+        self.assertEqual(ih.get_location("abcdq"), [19, 20, 21, 22, 9])
+        self.assertEqual(ih.sort_keys(), ["abcdq", "abcdr", "abx"])
+
+        # A branch left with a single sub-table is replaced by that sub-table.
+        del ih["abx"]
+        self.assertIs(ih._slot(19), compressed)
+        self.assertEqual(ih.get_location("abcdr"), [19, 20, 21, 22, 10])
+        self.assertEqual(ih.sort_keys(), ["abcdq", "abcdr"])
+
+        # Split again, then collapse from the bottom up.
+        ih["abx"] = 3
+        del ih["abcdq"]
+        self.assertEqual(ih._slot(19)._slot(21), ("abcdr", 2))
+        self.assertEqual(ih.get_location("abcdr"), [19, 20, 21])
+        self.assertEqual(ih.sort_keys(), ["abcdr", "abx"])
+        del ih["abx"]
+        self.assertEqual(ih._slot(19), ("abcdr", 2))
+        self.assertEqual(ih.get_location("abcdr"), [19])
+        self.assertEqual(ih.sort_keys(), ["abcdr"])
+        self.assertEqual(len(ih), 1)
+
+    @number("4.8")
+    def test_colliding_characters(self):
+        ih = InfiniteHashTable()
+        # Walk every table rather than sorting small subtrees whole.
+        ih.SORT_LIMIT = 0
+        ih["abx"] = 1
+        ih["aby"] = 2
+        branch = ih._slot(19)
+        self.assertTrue(branch.same_prefix)
+        self.assertEqual(list(ih.items_with_prefix("ab")), [("abx", 1), ("aby", 2)])
+
+        # "G" takes the same slot as "a", so "Gbz" is stored below "ab".
+        ih["Gbz"] = 3
+        self.assertIs(ih._slot(19), branch)
+        self.assertFalse(branch.same_prefix)
+        self.assertEqual(ih.sort_keys(), ["Gbz", "abx", "aby"])
+        self.assertEqual(list(ih.items_with_prefix("a")), [("abx", 1), ("aby", 2)])
+        self.assertEqual(list(ih.items_with_prefix("G")), [("Gbz", 3)])
+        self.assertEqual(list(ih.items_with_prefix("-")), [])
+
+        built = InfiniteHashTable.from_items([("Gbz", 3), ("aby", 2), ("abx", 1)])
+        built.SORT_LIMIT = 0
+        self.assertFalse(built._slot(19).same_prefix)
+        self.assertEqual(built.sort_keys(), ["Gbz", "abx", "aby"])
+        self.assertEqual(list(built.items_with_prefix("ab")), [("abx", 1), ("aby", 2)])
@@ -32,4 +32,23 @@ class TestInfiniteHash(unittest.TestCase):
 
         self.assertRaises(KeyError, lambda: mo.cur_position(m10))
 
-
+    @number("6.2")
+    def test_equal_rank(self):
+        mo = MountainOrganiser()
+        mo.add_mountains([Mountain("m1", 1, 5), Mountain("m2", 2, 5), Mountain("m0", 3, 5)])
+        # Found by equality, not only identity, but an equal (length, name) is not enough.
+        self.assertEqual(mo.cur_position(Mountain("m1", 1, 5)), 1)
+        self.assertRaises(KeyError, lambda: mo.cur_position(Mountain("m1", 9, 5)))
+        self.assertRaises(KeyError, lambda: mo.cur_position(Mountain("m3", 1, 5)))
+
+    @number("6.3")
+    def test_search(self):
+        from algorithms.binary_search import bisect_left, bisect_right, search_many
+        l = [1, 3, 3, 3, 7, 9]
+        self.assertEqual(bisect_left(l, 3), 1)
+        self.assertEqual(bisect_right(l, 3), 4)
+        self.assertEqual(bisect_left(l, 10), 6)
+        self.assertEqual(bisect_left(l[::-1], -3, key=lambda x: -x), 2)
+        queries = [0, 3, 3, 4, 9, 12]
+        self.assertEqual(search_many(l, queries), [bisect_left(l, q) for q in queries])
+        self.assertEqual(search_many(l[::-1], [-9, -4, -3], key=lambda x: -x), [0, 2, 2])
@@ -0,0 +1,81 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.referential_array import ArrayR, ITER_CHUNK
+
+class TestReferentialArray(unittest.TestCase):
+
+    @number("11.1")
+    def test_fill(self):
+        array = ArrayR(5)
+        self.assertEqual(array.to_list(), [None] * 5)
+        item = ["shared"]
+        array.fill(item)
+        self.assertEqual(array.to_list(), [item] * 5)
+        self.assertIs(array[4], item)
+        array.fill(None)
+        self.assertEqual([array[i] for i in range(5)], [None] * 5)
+        array[2] = "x"
+        self.assertEqual(array.to_list(), [None, None, "x", None, None])
+
+    @number("11.2")
+    def test_copy_from(self):
+        source = ArrayR(3)
+        for i in range(3):
+            source[i] = i
+        target = ArrayR(6)
+        target.copy_from(source, 2)
+        self.assertEqual(target.to_list(), [None, None, 0, 1, 2, None])
+        target.copy_from(source)
+        self.assertEqual(target.to_list(), [0, 1, 2, 1, 2, None])
+        target.copy_from(source.view(1, 3), 4)
+        self.assertEqual(target.to_list(), [0, 1, 2, 1, 1, 2])
+        # From a view of the target itself.
+        target.copy_from(target.view(0, 2), 4)
+        self.assertEqual(target.to_list(), [0, 1, 2, 1, 0, 1])
+        self.assertRaises(IndexError, lambda: target.copy_from(source, 4))
+        self.assertRaises(IndexError, lambda: ArrayR(2).copy_from(source))
+        # A failed copy leaves the target alone.
+        self.assertEqual(target.to_list(), [0, 1, 2, 1, 0, 1])
+
+    @number("11.3")
+    def test_view(self):
+        array = ArrayR(6)
+        for i in range(6):
+            array[i] = i
+        view = array.view(1, 5)
+        self.assertEqual(len(view), 4)
+        self.assertEqual(view.to_list(), [1, 2, 3, 4])
+        self.assertEqual(view[0], 1)
+        view[3] = "v"
+        self.assertEqual(array[4], "v")
+        array[1] = "a"
+        self.assertEqual(list(view), ["a", 2, 3, "v"])
+
+        inner = view.view(1, 3)
+        self.assertEqual(inner.to_list(), [2, 3])
+        self.assertEqual(len(array.view(3, 3)), 0)
+        self.assertRaises(IndexError, lambda: view[4])
+        self.assertRaises(IndexError, lambda: view[-1])
+        self.assertRaises(IndexError, lambda: array.view(4, 7))
+        self.assertRaises(IndexError, lambda: array.view(3, 2))
+        self.assertRaises(IndexError, lambda: view.view(0, 5))
+
+    @number("11.4")
+    def test_iteration(self):
+        array = ArrayR(2 * ITER_CHUNK + 3)
+        self.assertEqual(list(array), [None] * len(array))
+        array[0] = "first"
+        array[len(array) - 1] = "last"
+        items = list(array)
+        self.assertEqual((items[0], items[-1], items.count(None)), ("first", "last", len(array) - 2))
+        self.assertEqual(list(array.view(ITER_CHUNK - 1, ITER_CHUNK + 2)), [None] * 3)
+
+        # Writes ahead of the current chunk are seen, writes inside it are not.
+        iterator = iter(array)
+        next(iterator)
+        array[1] = "same chunk"
+        array[ITER_CHUNK] = "next chunk"
+        rest = list(iterator)
+        self.assertEqual(rest[0], None)
+        self.assertEqual(rest[ITER_CHUNK - 1], "next chunk")
@@ -0,0 +1,29 @@
+import random
+import unittest
+from ed_utils.decorators import number
+
+from algorithms.mergesort import mergesort, natural_mergesort
+
+class TestSorting(unittest.TestCase):
+
+    @number("10.1")
+    def test_natural_mergesort(self):
+        rng = random.Random(1)
+        for n in (0, 1, 2, 31, 33, 500):
+            shuffled = [rng.randrange(20) for _ in range(n)]
+            for l in (shuffled, sorted(shuffled), sorted(shuffled, reverse=True)):
+                self.assertEqual(natural_mergesort(l), sorted(l))
+                self.assertEqual(natural_mergesort(l), mergesort(l))
+
+    @number("10.2")
+    def test_natural_mergesort_key(self):
+        pairs = [(i % 7, i) for i in range(300)][::-1]
+        calls = []
+        def key(pair):
+            calls.append(pair)
+            return pair[0]
+        result = natural_mergesort(pairs, key=key)
+        # Stable, each key computed once, and the input left alone.
+        self.assertEqual(result, sorted(pairs, key=lambda pair: pair[0]))
+        self.assertEqual(len(calls), len(pairs))
+        self.assertEqual(pairs[0], (5, 299))
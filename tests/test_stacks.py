@@ -0,0 +1,38 @@
+import unittest
+from ed_utils.decorators import number
+
+from data_structures.array_stack import ArrayStack
+from data_structures.linked_stack import LinkedStack
+
+class TestStacks(unittest.TestCase):
+
+    @number("9.1")
+    def test_same_behaviour(self):
+        for stack_type in (LinkedStack, ArrayStack):
+            stack = stack_type()
+            self.assertTrue(stack.is_empty())
+            self.assertFalse(stack.is_full())
+            self.assertRaises(Exception, stack.pop)
+            self.assertRaises(Exception, stack.peek)
+
+            # Past ArrayStack's starting capacity, so it has to grow.
+            for item in range(100):
+                stack.push(item)
+            self.assertEqual(len(stack), 100)
+            self.assertEqual(stack.peek(), 99)
+            self.assertEqual([stack.pop() for _ in range(60)], list(range(99, 39, -1)))
+            self.assertEqual(len(stack), 40)
+
+            stack.clear()
+            self.assertTrue(stack.is_empty())
+            stack.push("a")
+            self.assertEqual(stack.pop(), "a")
+
+    @number("9.2")
+    def test_array_stack_releases_popped(self):
+        stack = ArrayStack(4)
+        stack.push([1])
+        stack.push([2])
+        stack.pop()
+        self.assertIsNone(stack.array[1])
+        self.assertEqual(stack.peek(), [1])
@@ -3,6 +3,8 @@ from ed_utils.decorators import number
 
 from mountain import Mountain
 from trail import Trail, TrailSeries, TrailSplit, TrailStore
+from trail_analytics import TrailAnalytics
+from trail_interner import TrailInterner
 
 class TestTrailMethods(unittest.TestCase):
 
@@ -56,4 +58,159 @@ class TestTrailMethods(unittest.TestCase):
         self.assertSetEqual(set(map(hash_mountain, res)), set(map(hash_mountain, [
             self.top_bot, self.top_top, self.top_mid,
             self.bot_one, self.bot_two, self.final
-        ])))
\ No newline at end of file
+        ])))
+
+    @number("7.2")
+    def test_length_k_paths_streaming(self):
+        self.load_example()
+
+        for k in range(-1, 6):
+            expected = [path for path in self.trail.get_all_paths() if len(path) == k]
+            self.assertEqual(self.trail.length_k_paths(k), expected)
+            self.assertEqual(self.trail.count_length_k_paths(k), len(expected))
+
+        paths = self.trail.iter_length_k_paths(2)
+        self.assertEqual(next(paths), [self.bot_one, self.final])
+        self.assertRaises(StopIteration, lambda: next(paths))
+        self.assertEqual(self.trail.count_length_k_paths(3), 3)
+
+    @number("7.3")
+    def test_iter_paths(self):
+        self.load_example()
+
+        names = [[m.name for m in path] for path in self.trail.iter_paths()]
+        self.assertEqual(names, [
+            ["top-top", "top-mid", "final"],
+            ["top-bot", "top-mid", "final"],
+            ["bot-one", "bot-two", "final"],
+            ["bot-one", "final"],
+        ])
+        self.assertEqual(self.trail.get_all_paths()[3], [self.bot_one, self.final])
+
+        difficulties = self.trail.iter_paths(lambda total, m: total + m.difficulty_level, 0)
+        self.assertEqual(list(difficulties), [13, 11, 6, 6])
+        self.assertEqual(list(Trail().iter_paths()), [[]])
+
+    @number("7.4")
+    def test_analytics(self):
+        self.load_example()
+        analytics = TrailAnalytics()
+
+        stats = analytics.stats(self.trail)
+        self.assertEqual(stats.count, 4)
+        # Difficulties 13, 11, 6 and 6. Lengths 14, 16, 9 and 9.
+        self.assertEqual((stats.min_difficulty, stats.max_difficulty, stats.total_difficulty), (6, 13, 36))
+        self.assertEqual((stats.min_length, stats.max_length, stats.mean_length), (9, 16, 12))
+        self.assertEqual(analytics.length_histogram(self.trail), [0, 0, 1, 3])
+        self.assertIs(analytics.stats(self.trail), stats)
+
+        # Replacing a store is picked up.
+        self.trail.store = TrailSeries(self.final, Trail(self.trail.store))
+        self.assertEqual(analytics.path_count(self.trail), 4)
+        self.assertEqual(analytics.length_histogram(self.trail), [0, 0, 0, 1, 3])
+        self.assertEqual(analytics.stats(Trail()).count, 1)
+
+    @number("7.5")
+    def test_interning(self):
+        import json
+        from serialize import serialize, deserialize
+        self.load_example()
+        interner = TrailInterner()
+
+        trail = interner.intern(self.trail)
+        self.assertEqual(trail, self.trail)
+        self.assertIs(interner.intern(trail), trail)
+        # Every empty trail is the same one.
+        self.assertIs(trail.store.path_bottom.store.following.store.path_top.store.following, interner.empty())
+
+        loaded = deserialize(json.loads(serialize(self.trail)), interner)
+        self.assertIs(loaded, trail)
+        self.assertEqual(interner.structural_hash(self.trail), TrailInterner().structural_hash(loaded))
+
+        copy = deserialize(json.loads(serialize(self.trail)))
+        self.assertIsNot(copy, self.trail)
+        self.assertIs(interner.intern(copy), trail)
+        self.assertTrue(interner.is_canonical(trail))
+        self.assertFalse(interner.is_canonical(copy))
+
+    @number("7.6")
+    def test_analytics_nested_edits(self):
+        self.load_example()
+        analytics = TrailAnalytics()
+        self.assertEqual(analytics.path_count(self.trail), 4)
+        histogram = analytics.length_histogram(self.trail)
+        histogram.append(100)
+        self.assertEqual(analytics.length_histogram(self.trail), [0, 0, 1, 3])
+
+        # Replace a store deep inside, the way draw_trails edits do: bot-two's empty following.
+        bot_two = self.trail.store.path_bottom.store.following.store.path_top
+        bot_two.store.following.store = TrailSplit(Trail(), Trail(TrailSeries(self.top_mid, Trail())), Trail())
+        self.assertEqual(analytics.path_count(self.trail), 5)
+        self.assertEqual(analytics.length_histogram(self.trail), [0, 0, 1, 3, 1])
+        self.assertEqual(analytics.stats(self.trail).max_length, 16)
+
+        # Assigning to a part of a store is seen too.
+        self.trail.store.path_follow = Trail()
+        self.assertEqual(analytics.length_histogram(self.trail), [0, 1, 3, 1])
+
+    @number("7.7")
+    def test_interning_keeps_no_input_nodes(self):
+        interner = TrailInterner()
+        leaf = Trail()
+        mountain = Mountain("peak", 1, 2)
+        first = Trail(TrailSeries(mountain, leaf))
+        second = Trail(TrailSplit(leaf, leaf, Trail()))
+        interned_first = interner.intern(first)
+        interned_second = interner.intern(second)
+        self.assertIsNot(interned_first, first)
+        self.assertIsNot(interned_first.store.following, leaf)
+        self.assertIsNot(interned_first.store.mountain, mountain)
+
+        # Editing the inputs afterwards, including the leaf they shared, leaves the interned trails alone.
+        leaf.store = TrailSeries(Mountain("edit", 0, 0), Trail())
+        mountain.length = 9
+        first.store = None
+        self.assertEqual(interned_first, Trail(TrailSeries(Mountain("peak", 1, 2), Trail())))
+        self.assertEqual(interned_second, Trail(TrailSplit(Trail(), Trail(), Trail())))
+        self.assertIs(interner.intern(Trail()), interned_second.store.path_top)
+        self.assertTrue(interner.is_canonical(interned_first))
+
+    @number("7.8")
+    def test_analytics_repeat_and_pruning(self):
+        import gc
+        self.load_example()
+        analytics = TrailAnalytics()
+        stats = analytics.stats(self.trail)
+        self.assertEqual(analytics.length_histogram(self.trail), [0, 0, 1, 3])
+
+        # Without edits, repeated queries do not walk the trail again.
+        walk = Trail.sub_trails
+        Trail.sub_trails = None
+        try:
+            self.assertIs(analytics.stats(self.trail), stats)
+            self.assertEqual(analytics.length_histogram(self.trail), [0, 0, 1, 3])
+            # Building new trails is not an edit.
+            Trail(TrailSeries(self.final, Trail()))
+            self.assertIs(analytics.stats(self.trail), stats)
+        finally:
+            Trail.sub_trails = walk
+
+        # Any edit makes the next query check the trail again.
+        self.trail.store.path_top.store.path_follow.store.mountain = self.bot_two
+        # Top paths lose top-mid's length 7: lengths 7, 9, 9 and 9.
+        self.assertEqual((analytics.stats(self.trail).min_length, analytics.stats(self.trail).max_length), (7, 9))
+        self.assertEqual(analytics.length_histogram(self.trail), [0, 0, 1, 3])
+
+        # Entries go with their sub-trails, so ids of freed trails are never mistaken for them.
+        entries = len(analytics._stats.entries)
+        self.assertEqual(entries, 16)
+        self.trail.store.path_bottom = Trail()
+        self.assertEqual(analytics.path_count(self.trail), 3)
+        gc.collect()
+        # Six sub-trails freed, one new empty trail.
+        self.assertEqual(len(analytics._stats.entries), entries - 5)
+        del self.trail
+        gc.collect()
+        self.assertEqual(analytics._stats.entries, {})
+        self.assertEqual(analytics._stats.fresh, set())
+        self.assertEqual(analytics._histograms.entries, {})
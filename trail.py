@@ -3,12 +3,66 @@ from dataclasses import dataclass
 
 from mountain import Mountain
 
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Callable, Iterator, TypeVar, Union
 
 # Avoid circular imports for typing.
 if TYPE_CHECKING:
     from personality import WalkerPersonality
 
+R = TypeVar("R")
+S = TypeVar("S")
+
+
+def _add_lengths(lengths: int, others: int, limit: int) -> int:
+    """
+    Given two sets of path lengths as bitmasks (bit i set when i is possible),
+    returns the bitmask of every sum of one from each, cut to the bits of limit.
+    :complexity: O(number of lengths set in lengths)
+    """
+    total = 0
+    while lengths:
+        lowest = lengths & -lengths
+        total |= others * lowest
+        lengths ^= lowest
+    return total & limit
+
+
+def sum_counts(counts: list[int], others: list[int]) -> list[int]:
+    """
+    Given two lists counting paths by length (counts[i] paths of i mountains),
+    returns the counts for the paths of both together.
+    :complexity: O(len(counts) + len(others))
+    """
+    return [a + b for a, b in zip(counts, others)] + counts[len(others):] + others[len(counts):]
+
+
+def chain_counts(counts: list[int], others: list[int], k: int | None = None) -> list[int]:
+    """
+    Given two lists counting paths by length (counts[i] paths of i mountains),
+    returns the counts for one path of each in sequence, up to k mountains if k is given.
+    :complexity: O(len(counts) * len(others))
+    """
+    total = [0] * (len(counts) + len(others) - 1)
+    if k is not None:
+        del total[k + 1:]
+    for i, count in enumerate(counts):
+        if count:
+            for j, other in enumerate(others[:len(total) - i]):
+                total[i + j] += count * other
+    return total
+
+
+def _set_field(self, name: str, value) -> None:
+    """
+    __setattr__ of Trail, TrailSeries and TrailSplit.
+    Replacing a field that is already set, as the edits in draw_trails.py do,
+    counts as an edit in Trail.edit_count. Setting fields in __init__ does not.
+    :complexity: O(1)
+    """
+    if name in self.__dict__ and name in self.__dataclass_fields__:
+        Trail.edit_count += 1
+    object.__setattr__(self, name, value)
+
 
 @dataclass
 class TrailSplit:
@@ -24,6 +78,8 @@ class TrailSplit:
     path_bottom: Trail
     path_follow: Trail
 
+    __setattr__ = _set_field
+
     def remove_branch(self) -> TrailStore:
         """
         O(1)
@@ -45,6 +101,8 @@ class TrailSeries:
     mountain: Mountain
     following: Trail
 
+    __setattr__ = _set_field
+
     def remove_mountain(self) -> TrailStore:
         """
         O(1)
@@ -95,6 +153,12 @@ TrailStore = Union[TrailSplit, TrailSeries, None]
 class Trail:
     store: TrailStore = None
 
+    # Number of times a field of any Trail, TrailSeries or TrailSplit has been replaced.
+    # While it is unchanged, no trail has changed shape.
+    edit_count = 0
+
+    __setattr__ = _set_field
+
     def add_mountain_before(self, mountain: Mountain) -> Trail:
         """
         Adds a mountain before everything currently in the trail.
@@ -171,25 +235,180 @@ class Trail:
         """
         Returns a list of all paths of containing exactly k mountains.
         Paths are represented as lists of mountains.
-        : Complexity:O(1)
+        : Complexity: see iter_length_k_paths
         Paths are unique if they take a different branch, even if this results in the same set of mountains.
         """
-        return [i for i in self.get_all_paths() if len(i) == k]
+        return list(self.iter_length_k_paths(k))
+
+    def iter_length_k_paths(self, k: int) -> Iterator[list[Mountain]]:
+        """
+        Yields every path containing exactly k mountains, in the same order as get_all_paths.
+
+        Walks the trail with a stack, keeping the mountain count of the partial path.
+        First works out which path lengths each sub-trail can produce, so a branch is only
+        taken when the rest of the walk can still bring the path to exactly k mountains.
+        Nothing is built for paths that end up shorter or longer.
+
+        : Complexity: O(N * k) to work out the lengths, where N is the number of sub-trails,
+                      then O(k * B) per path yielded, where B is the number of branches.
+        """
+        if k < 0:
+            return
+        limit = (1 << (k + 1)) - 1
+        lengths = self._fold(
+            1,
+            lambda mountain, following: (following << 1) & limit,
+            lambda top, bottom, follow: _add_lengths(top | bottom, follow, limit),
+        )
+        if not lengths[id(self)] >> k & 1:
+            return
+
+        path = []
+        # (trail, mountains on the path before it, what comes after it, lengths of what comes after it)
+        # What comes after is a linked list of (trail, lengths after that trail, rest).
+        stack = [(self, 0, None, 1)]
+        while stack:
+            trail, count, after, after_lengths = stack.pop()
+            del path[count:]
+            while True:
+                store = trail.store
+                if isinstance(store, TrailSeries):
+                    path.append(store.mountain)
+                    count += 1
+                    trail = store.following
+                elif isinstance(store, TrailSplit):
+                    follow_lengths = _add_lengths(lengths[id(store.path_follow)], after_lengths, limit)
+                    after = (store.path_follow, after_lengths, after)
+                    # Bottom first, so top comes off the stack first.
+                    for branch in (store.path_bottom, store.path_top):
+                        if _add_lengths(lengths[id(branch)], follow_lengths, limit) >> (k - count) & 1:
+                            stack.append((branch, count, after, follow_lengths))
+                    break
+                elif after is not None:
+                    trail, after_lengths, after = after
+                else:
+                    yield path[:]
+                    break
+
+    def count_length_k_paths(self, k: int) -> int:
+        """
+        Returns the number of paths containing exactly k mountains, without building any.
+
+        Counts, for every sub-trail, its paths of each length up to k. A series shifts
+        the counts of what follows it by one, a split adds its two branches' counts and
+        combines the sum with the counts of its following path.
+
+        : Complexity: O(N * k^2), where N is the number of sub-trails.
+        """
+        if k < 0:
+            return 0
+        counts = self._fold(
+            [1],
+            lambda mountain, following: ([0] + following)[:k + 1],
+            lambda top, bottom, follow: chain_counts(sum_counts(top, bottom), follow, k),
+        )[id(self)]
+        return counts[k] if k < len(counts) else 0
+
+    def sub_trails(self) -> Iterator[tuple[Trail, tuple[Trail, ...]]]:
+        """
+        Yields (sub-trail, its parts) for every sub-trail, this trail included, each after its parts.
+        The parts are (following,) for a series, (path_top, path_bottom, path_follow) for a split
+        and () for an empty trail. A sub-trail reachable more than once is yielded once.
+        Walks with a stack, without recursion.
+
+        : Complexity: O(N), where N is the number of sub-trails.
+        """
+        done = set()
+        stack = [self]
+        while stack:
+            trail = stack[-1]
+            if id(trail) in done:
+                stack.pop()
+                continue
+            store = trail.store
+            if isinstance(store, TrailSeries):
+                parts = (store.following,)
+            elif isinstance(store, TrailSplit):
+                parts = (store.path_top, store.path_bottom, store.path_follow)
+            else:
+                parts = ()
+            pending = [part for part in parts if id(part) not in done]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            done.add(id(trail))
+            yield trail, parts
+
+    def _fold(self, empty: R, series: Callable[[Mountain, R], R], split: Callable[[R, R, R], R]) -> dict[int, R]:
+        """
+        Summarises every sub-trail from its parts, in the order of sub_trails.
+        An empty trail is summarised as empty, a series as series(mountain, following's summary),
+        and a split as split(top's, bottom's, follow's summary).
+        Returns the summaries by id of the sub-trail.
+
+        : Complexity: O(N) calls of series and split, where N is the number of sub-trails.
+        """
+        summaries = {}
+        for trail, parts in self.sub_trails():
+            if not parts:
+                summaries[id(trail)] = empty
+            elif len(parts) == 1:
+                summaries[id(trail)] = series(trail.store.mountain, summaries[id(parts[0])])
+            else:
+                summaries[id(trail)] = split(*(summaries[id(part)] for part in parts))
+        return summaries
 
     def get_all_paths(self) -> list[list[Mountain]]:
         """
         Get a list of mountains by traversing all parts
-        : Complexity:O(N)
+        : Complexity: see iter_paths
         """
-        if self.store is None:
-            return [[]]
+        return list(self.iter_paths())
 
-        if isinstance(self.store, TrailSplit):
-            retval = []
-            for i in self.store.path_top.get_all_paths() + self.store.path_bottom.get_all_paths():
-                for j in self.store.path_follow.get_all_paths():
-                    retval.append(i + j)
-            return retval
+    def iter_paths(self, visit: Callable[[S, Mountain], S] = None, start: S = None) -> Iterator:
+        """
+        Yields every path through the trail, one at a time: top branches before bottom ones,
+        each followed by every way through the rest.
+
+        Without visit, each path is yielded as a new list of mountains.
+        With visit, no lists are built: every path yields visit(...visit(visit(start, m1), m2)..., mn)
+        for its mountains m1 to mn, e.g. visit=lambda total, m: total + m.length, start=0
+        yields the length of every path. visit is called once per mountain per prefix, so paths
+        sharing a prefix share the calls for it.
+
+        The walk keeps the path so far as a linked list of (mountain, rest of the prefix) pairs,
+        which branches share instead of copying, so memory stays O(depth) besides the path yielded.
 
-        if isinstance(self.store, TrailSeries):
-            return [[self.store.mountain] + i for i in self.store.following.get_all_paths()]
+        : Complexity: O(N + P * L), where N is the number of mountains visited over all prefixes,
+                      P the number of paths and L their length (O(N) with visit).
+        """
+        build = visit is None
+        if build:
+            start = None
+        stack = [(self, start, None)]
+        while stack:
+            # (trail, state of the path before it, what comes after it as a linked list of (trail, rest))
+            trail, state, after = stack.pop()
+            while True:
+                store = trail.store
+                if isinstance(store, TrailSeries):
+                    state = (store.mountain, state) if build else visit(state, store.mountain)
+                    trail = store.following
+                elif isinstance(store, TrailSplit):
+                    after = (store.path_follow, after)
+                    stack.append((store.path_bottom, state, after))
+                    trail = store.path_top
+                elif after is not None:
+                    trail, after = after
+                elif build:
+                    path = []
+                    while state is not None:
+                        mountain, state = state
+                        path.append(mountain)
+                    path.reverse()
+                    yield path
+                    break
+                else:
+                    yield state
+                    break
@@ -0,0 +1,221 @@
+""" Statistics over every path through a trail, without enumerating the paths.
+
+Each sub-trail is summarised from the summaries of its parts, once:
+    - an empty trail has one path, with no mountains.
+    - a series puts its mountain in front of every path of what follows it.
+    - a split takes every path of its top and bottom branches, each followed by
+      every path of its following trail.
+
+A sub-trail reachable along more than one route is also summarised only once.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Generic, TypeVar
+from weakref import ref
+
+from mountain import Mountain
+from trail import Trail, TrailStore, chain_counts, sum_counts
+
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class PathStats:
+    """
+    Totals over every path through a trail.
+    A path's difficulty is the sum of its mountains' difficulty_level, and its length the sum of their length.
+    """
+
+    count: int
+    min_difficulty: int
+    max_difficulty: int
+    total_difficulty: int
+    min_length: int
+    max_length: int
+    total_length: int
+
+    @property
+    def mean_difficulty(self) -> float:
+        """ Average difficulty of a path. """
+        return self.total_difficulty / self.count
+
+    @property
+    def mean_length(self) -> float:
+        """ Average length of a path. """
+        return self.total_length / self.count
+
+    def after_mountain(self, mountain: Mountain) -> PathStats:
+        """
+        Stats of these paths with mountain put in front of each.
+        :complexity: O(1)
+        """
+        difficulty, length = mountain.difficulty_level, mountain.length
+        return PathStats(
+            self.count,
+            self.min_difficulty + difficulty, self.max_difficulty + difficulty,
+            self.total_difficulty + difficulty * self.count,
+            self.min_length + length, self.max_length + length,
+            self.total_length + length * self.count,
+        )
+
+    def either(self, other: PathStats) -> PathStats:
+        """
+        Stats of these paths and the other paths together.
+        :complexity: O(1)
+        """
+        return PathStats(
+            self.count + other.count,
+            min(self.min_difficulty, other.min_difficulty), max(self.max_difficulty, other.max_difficulty),
+            self.total_difficulty + other.total_difficulty,
+            min(self.min_length, other.min_length), max(self.max_length, other.max_length),
+            self.total_length + other.total_length,
+        )
+
+    def then(self, other: PathStats) -> PathStats:
+        """
+        Stats of every one of these paths followed by every one of the other paths.
+        :complexity: O(1)
+        """
+        return PathStats(
+            self.count * other.count,
+            self.min_difficulty + other.min_difficulty, self.max_difficulty + other.max_difficulty,
+            self.total_difficulty * other.count + other.total_difficulty * self.count,
+            self.min_length + other.min_length, self.max_length + other.max_length,
+            self.total_length * other.count + other.total_length * self.count,
+        )
+
+
+# The one path through an empty trail.
+EMPTY_PATH_STATS = PathStats(1, 0, 0, 0, 0, 0, 0)
+
+
+class _TrailRef(ref):
+    """ Weak reference to a sub-trail, which remembers the sub-trail's id. """
+
+    __slots__ = ("key",)
+
+    def __init__(self, trail: Trail, callback: Callable[[_TrailRef], None]) -> None:
+        super().__init__(trail, callback)
+        self.key = id(trail)
+
+
+class _Memo(Generic[R]):
+    """
+    One kind of summary of every sub-trail summarised, by id.
+    An entry is (weak reference to the sub-trail, its store, its mountain, its parts'
+    summaries, its summary). The entry goes when its sub-trail is freed.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[int, tuple[_TrailRef, TrailStore, Mountain | None, tuple, R]] = {}
+        # Ids of the trails queried since Trail.edit_count was edit_count.
+        self.fresh: set[int] = set()
+        self.edit_count = Trail.edit_count
+
+    def forget(self, reference: _TrailRef) -> None:
+        """
+        Drops the entry of a freed sub-trail, before its id can be reused.
+        :complexity: O(1)
+        """
+        entry = self.entries.get(reference.key)
+        if entry is not None and entry[0] is reference:
+            del self.entries[reference.key]
+        self.fresh.discard(reference.key)
+
+
+class TrailAnalytics:
+    """
+    Memoised path statistics. Every sub-trail's result is kept, by id, together with
+    the store and mountain it had and the results of its parts it was worked out from.
+    Results are dropped when their sub-trail is freed, so the memo only holds live trails.
+
+    A query for a trail already queried since the last edit (see Trail.edit_count) is
+    answered from the memo straight away. After an edit to any trail, the next query
+    walks its trail and checks each sub-trail against its entry, parts first. An entry
+    is reused only if the sub-trail still has the same store and mountain, and its parts'
+    results are still the same objects. So any edit that replaces a store, a mountain, or
+    a part (as the edits in draw_trails.py do), however deep in the trail, is recomputed
+    along with what contains it, and nothing else is.
+    Mountains are compared by identity: changing a Mountain's fields in place is not seen.
+    """
+
+    def __init__(self) -> None:
+        self._stats: _Memo[PathStats] = _Memo()
+        self._histograms: _Memo[list[int]] = _Memo()
+
+    def clear(self) -> None:
+        """
+        Forgets every result.
+        :complexity: O(1)
+        """
+        self._stats = _Memo()
+        self._histograms = _Memo()
+
+    def stats(self, trail: Trail) -> PathStats:
+        """
+        Path count, and min, max and total difficulty and length over every path through trail.
+        :complexity: O(1) when no trail was edited since trail was last queried. Otherwise O(N),
+                     where N is the number of sub-trails, with O(1) work per sub-trail.
+        """
+        return self._summarise(trail, self._stats, EMPTY_PATH_STATS,
+                               lambda mountain, following: following.after_mountain(mountain),
+                               lambda top, bottom, follow: top.either(bottom).then(follow))
+
+    def path_count(self, trail: Trail) -> int:
+        """
+        Number of paths through trail.
+        :complexity: See stats.
+        """
+        return self.stats(trail).count
+
+    def length_histogram(self, trail: Trail) -> list[int]:
+        """
+        Returns a new list whose item i is the number of paths through trail with i mountains.
+        :complexity: O(N * M^2) for the first query, where N is the number of sub-trails and
+                     M the number of mountains on the longest path. After an edit, O(N) plus
+                     O(M^2) per sub-trail that changed. O(M) for a trail queried since the
+                     last edit.
+        """
+        return list(self._summarise(trail, self._histograms, [1],
+                                    lambda mountain, following: [0] + following,
+                                    lambda top, bottom, follow: chain_counts(sum_counts(top, bottom), follow)))
+
+    @staticmethod
+    def _summarise(trail: Trail, memo: _Memo[R], empty: R,
+                   series: Callable[[Mountain, R], R], split: Callable[[R, R, R], R]) -> R:
+        """
+        Summary of trail as in Trail._fold, from memo when trail was queried since the
+        last edit. Otherwise reuses the entries of memo that are still valid (see the
+        class docstring) and replaces the others.
+        :complexity: O(1) from memo. Otherwise O(N) checks, where N is the number of
+                     sub-trails, plus one call of series or split per sub-trail that changed.
+        """
+        entries = memo.entries
+        if memo.edit_count != Trail.edit_count:
+            memo.fresh = set()
+            memo.edit_count = Trail.edit_count
+        elif id(trail) in memo.fresh:
+            return entries[id(trail)][4]
+
+        summaries = {}
+        for current, parts in trail.sub_trails():
+            store = current.store
+            mountain = store.mountain if len(parts) == 1 else None
+            part_summaries = tuple(summaries[id(part)] for part in parts)
+            # Entries of freed sub-trails are gone, so an entry under this id is current's.
+            entry = entries.get(id(current))
+            if (entry is not None and entry[1] is store and entry[2] is mountain
+                    and all(old is new for old, new in zip(entry[3], part_summaries))):
+                summary = entry[4]
+            else:
+                if not parts:
+                    summary = empty
+                elif mountain is not None:
+                    summary = series(mountain, part_summaries[0])
+                else:
+                    summary = split(*part_summaries)
+                entries[id(current)] = (_TrailRef(current, memo.forget), store, mountain, part_summaries, summary)
+            summaries[id(current)] = summary
+        memo.fresh.add(id(trail))
+        return summaries[id(trail)]
@@ -0,0 +1,130 @@
+""" Hash-consing for trails: one shared instance per distinct sub-trail.
+
+An interner keeps a table of canonical sub-trails. A sub-trail is looked up
+by its own contents (its mountain's fields, for a series) and the identities
+of its parts, which are canonical already. So structurally equal sub-trails
+come out as the same object, found in O(1) per sub-trail, and identity is
+enough to compare interned trails.
+
+Every canonical sub-trail also has a structural hash, worked out once from its
+contents and its parts' hashes. Equal sub-trails have equal hashes in every
+interner of the same process.
+
+Canonical sub-trails and their mountains are always built by the interner,
+never taken from the trails passed in, so later edits to those trails do not
+reach the table. Interned trails themselves are shared: editing one in place
+(as the edit actions in draw_trails.py do) edits it everywhere it appears.
+Intern trails that are only read, such as route libraries and trails being
+analysed. Results memoised by sub-trail, as in TrailAnalytics, are then reused
+across equal sub-trails.
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Callable
+
+from mountain import Mountain
+from trail import Trail, TrailSeries, TrailSplit
+
+_EMPTY = "empty"
+_SERIES = "series"
+_SPLIT = "split"
+
+
+class TrailInterner:
+    """
+    Table of canonical sub-trails.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self) -> None:
+        # Canonical sub-trail by its key: contents, and ids of its canonical parts.
+        self._table: dict[tuple, Trail] = {}
+        # Structural hash of every canonical sub-trail, by id. The table keeps them alive.
+        self._hashes: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """ Number of distinct sub-trails interned. """
+        return len(self._table)
+
+    def is_canonical(self, trail: Trail) -> bool:
+        """ Whether trail is the shared instance of its structure. """
+        return id(trail) in self._hashes and self._table.get(self._key(trail)) is trail
+
+    def _key(self, trail: Trail) -> tuple:
+        """ Table key of a trail whose parts are canonical. """
+        store = trail.store
+        if isinstance(store, TrailSeries):
+            mountain = store.mountain
+            return _SERIES, mountain.name, mountain.difficulty_level, mountain.length, id(store.following)
+        if isinstance(store, TrailSplit):
+            return _SPLIT, id(store.path_top), id(store.path_bottom), id(store.path_follow)
+        return (_EMPTY,)
+
+    def _canonical(self, key: tuple, build: Callable[[], Trail]) -> Trail:
+        """ The canonical trail for key, made by build() the first time. """
+        trail = self._table.get(key)
+        if trail is None:
+            trail = build()
+            self._table[key] = trail
+            # The key with the parts' ids replaced by their structural hashes.
+            hashes = self._hashes
+            if key[0] == _SERIES:
+                structural_hash = hash(key[:-1] + (hashes[key[-1]],))
+            elif key[0] == _SPLIT:
+                structural_hash = hash((_SPLIT, hashes[key[1]], hashes[key[2]], hashes[key[3]]))
+            else:
+                structural_hash = hash(key)
+            hashes[id(trail)] = structural_hash
+        return trail
+
+    def empty(self) -> Trail:
+        """ The canonical empty trail. """
+        return self._canonical((_EMPTY,), Trail)
+
+    def series(self, mountain: Mountain, following: Trail) -> Trail:
+        """
+        The canonical trail of mountain then following. The trail holds a copy of mountain.
+        :pre: following is canonical, not checked.
+        """
+        return self._canonical(
+            (_SERIES, mountain.name, mountain.difficulty_level, mountain.length, id(following)),
+            lambda: Trail(TrailSeries(replace(mountain), following)),
+        )
+
+    def split(self, path_top: Trail, path_bottom: Trail, path_follow: Trail) -> Trail:
+        """
+        The canonical trail splitting into path_top and path_bottom, then path_follow.
+        :pre: the three paths are canonical, not checked.
+        """
+        return self._canonical(
+            (_SPLIT, id(path_top), id(path_bottom), id(path_follow)),
+            lambda: Trail(TrailSplit(path_top, path_bottom, path_follow)),
+        )
+
+    def intern(self, trail: Trail) -> Trail:
+        """
+        Returns the canonical trail structurally equal to trail. trail is not changed,
+        and none of its sub-trails or mountains become part of the table.
+        :complexity: O(N), where N is the number of sub-trails of trail. O(1) if trail is canonical.
+        """
+        if self.is_canonical(trail):
+            return trail
+        canonical = {}
+        for current, parts in trail.sub_trails():
+            parts = [canonical[id(part)] for part in parts]
+            if not parts:
+                canonical[id(current)] = self.empty()
+            elif len(parts) == 1:
+                canonical[id(current)] = self.series(current.store.mountain, parts[0])
+            else:
+                canonical[id(current)] = self.split(*parts)
+        return canonical[id(trail)]
+
+    def structural_hash(self, trail: Trail) -> int:
+        """
+        Hash of trail's structure, equal for structurally equal trails.
+        :complexity: O(1) if trail is canonical, see intern otherwise.
+        """
+        return self._hashes[id(self.intern(trail))]